@@ -10,9 +10,16 @@ Analyzes companies' LinkedIn presence as a whole to extract:
 
 import os
 import json
+import hashlib
+import functools
+import threading
 import requests
-from typing import Dict, List, Optional
+import http_client
+from typing import Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from api_cache import cache_get, cache_set, make_cache_key, is_cache_enabled, MISS
+from engagement_metrics import compute_engagement_metrics, format_engagement_summary
 
 
 def get_credential(key: str, default=None):
@@ -35,6 +42,32 @@ def get_credential(key: str, default=None):
         return os.environ.get(key, default)
 
 
+DEFAULT_OPENROUTER_MAX_CONCURRENCY = 8
+
+_openrouter_slots = None
+_openrouter_slots_lock = threading.Lock()
+
+
+def _openrouter_semaphore() -> threading.BoundedSemaphore:
+    """
+    Process-wide limit on in-flight OpenRouter requests (created on first use).
+
+    Analyses fan out at several levels (research sources, the three company
+    analyses, map batches), so the limit is applied here rather than per pool.
+    Set OPENROUTER_MAX_CONCURRENCY to change it (default: 8).
+    """
+    global _openrouter_slots
+
+    with _openrouter_slots_lock:
+        if _openrouter_slots is None:
+            try:
+                limit = int(get_credential("OPENROUTER_MAX_CONCURRENCY", DEFAULT_OPENROUTER_MAX_CONCURRENCY))
+            except (TypeError, ValueError):
+                limit = DEFAULT_OPENROUTER_MAX_CONCURRENCY
+            _openrouter_slots = threading.BoundedSemaphore(max(1, limit))
+        return _openrouter_slots
+
+
 def get_prompt_template(prompt_name: str) -> str:
     """
     Load a prompt template from the prompts directory.
@@ -57,7 +90,10 @@ def get_prompt_template(prompt_name: str) -> str:
 def call_openrouter(
     prompt: str,
     model: str = "anthropic/claude-haiku-4.5",
-    max_tokens: int = 3000
+    max_tokens: int = 3000,
+    temperature: float = 0.3,
+    use_cache: bool = False,
+    on_field: Callable[[str, object], None] = None
 ) -> Dict:
     """
     Call OpenRouter API with specified Claude model.
@@ -66,10 +102,45 @@ def call_openrouter(
         prompt: The prompt to send to the model
         model: Model to use (default: claude-3.5-haiku)
         max_tokens: Maximum tokens in response
+        temperature: Sampling temperature (default: 0.3 for consistent analysis)
+        use_cache: Reuse a stored response for an identical (model, prompt,
+                   max_tokens, temperature) request instead of calling the API
+        on_field: Optional callback(key, value) for a JSON-object response. The
+                  response is then streamed and each top-level field is passed
+                  on as soon as it is complete; the stream stops once the
+                  object closes. Cache hits replay every field at once.
 
     Returns:
         Dict with either {"content": str} or {"error": str}
     """
+    cache_key = None
+    if use_cache and is_cache_enabled():
+        cache_key = make_cache_key("openrouter", {
+            "model": model,
+            "prompt_sha256": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        })
+        cached_response = cache_get("openrouter", cache_key)
+        if cached_response is not MISS:
+            if on_field:
+                _replay_fields(cached_response, on_field)
+            return cached_response
+
+    with _openrouter_semaphore():
+        if on_field:
+            response = _stream_openrouter(prompt, model, max_tokens, temperature, on_field)
+        else:
+            response = _post_openrouter(prompt, model, max_tokens, temperature)
+
+    if cache_key and response.get("content"):
+        cache_set("openrouter", cache_key, response)
+
+    return response
+
+
+def _post_openrouter(prompt: str, model: str, max_tokens: int, temperature: float) -> Dict:
+    """Send one chat completion request to OpenRouter (no caching)."""
     api_key = get_credential("OPENROUTER_API_KEY")
 
     if not api_key:
@@ -91,11 +162,11 @@ def call_openrouter(
             }
         ],
         "max_tokens": max_tokens,
-        "temperature": 0.3  # Lower temperature for consistent analysis
+        "temperature": temperature
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=60)
+        response = http_client.post(url, headers=headers, json=payload, timeout=60)
 
         # Get response text for error messages
         response_text = response.text
@@ -125,6 +196,190 @@ def call_openrouter(
         return {"error": f"OpenRouter error: {str(e)}"}
 
 
+class IncrementalJSONObjectParser:
+    """
+    Parse a JSON object from text that arrives in pieces.
+
+    Feed chunks as they stream in; each call returns the top-level
+    (key, value) pairs completed by that chunk. Leading prose or a ```json
+    fence before the opening brace is skipped. `done` becomes True once the
+    top-level object closes, and `text` holds the object received so far.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0            # next character to scan
+        self._start = None       # index of the opening brace
+        self._field_start = None  # index where the current top-level field begins
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.done = False
+
+    @property
+    def text(self) -> str:
+        """The JSON object text received so far (complete once done is True)."""
+        if self._start is None:
+            return ""
+        return self._buffer[self._start:self._pos]
+
+    def feed(self, chunk: str) -> List[tuple]:
+        """Add streamed text and return newly completed (key, value) pairs."""
+        if self.done:
+            return []
+
+        self._buffer += chunk
+        completed = []
+
+        while self._pos < len(self._buffer):
+            char = self._buffer[self._pos]
+            self._pos += 1
+
+            if self._start is None:
+                if char == "{":
+                    self._start = self._pos - 1
+                    self._field_start = self._pos
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._complete_field(self._pos - 1))
+                    self.done = True
+                    break
+            elif char == "," and self._depth == 1:
+                completed.extend(self._complete_field(self._pos - 1))
+                self._field_start = self._pos
+
+        return completed
+
+    def _complete_field(self, end: int) -> List[tuple]:
+        segment = self._buffer[self._field_start:end].strip()
+        if not segment:
+            return []
+        try:
+            return list(json.loads("{" + segment + "}").items())
+        except json.JSONDecodeError:
+            return []
+
+
+def _replay_fields(response: Dict, on_field: Callable) -> None:
+    """Send every top-level field of a complete response to on_field."""
+    parsed = parse_json_response(response)
+    if isinstance(parsed, dict) and not parsed.get("error"):
+        for key, value in parsed.items():
+            on_field(key, value)
+
+
+def _stream_openrouter(
+    prompt: str,
+    model: str,
+    max_tokens: int,
+    temperature: float,
+    on_field: Callable
+) -> Dict:
+    """
+    Stream a chat completion from OpenRouter (SSE), reporting JSON fields as they complete.
+
+    Stops reading, and closes the connection, as soon as the top-level JSON
+    object closes so trailing text is never generated into the response.
+
+    Returns:
+        Dict with either {"content": str} or {"error": str}, like _post_openrouter
+    """
+    api_key = get_credential("OPENROUTER_API_KEY")
+
+    if not api_key:
+        return {"error": "OPENROUTER_API_KEY not configured"}
+
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "stream": True
+    }
+
+    parser = IncrementalJSONObjectParser()
+    content = ""
+
+    try:
+        response = http_client.post(
+            "https://openrouter.ai/api/v1/chat/completions",
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json"
+            },
+            json=payload,
+            timeout=60,
+            stream=True
+        )
+
+        try:
+            if response.status_code >= 400:
+                try:
+                    error_msg = response.json().get("error", {}).get("message", response.text[:500])
+                except Exception:
+                    error_msg = response.text[:500]
+                return {"error": f"OpenRouter HTTP {response.status_code}: {error_msg}"}
+
+            # text/event-stream carries no charset, so requests would fall back to ISO-8859-1
+            response.encoding = "utf-8"
+
+            for line in response.iter_lines(decode_unicode=True):
+                # SSE: "data: {...}" events; lines starting with ":" are keep-alive comments
+                if not line or not line.startswith("data:"):
+                    continue
+
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+
+                event = json.loads(data)
+                if event.get("error"):
+                    return {"error": f"OpenRouter error: {event['error'].get('message', event['error'])}"}
+
+                choices = event.get("choices") or []
+                delta = (choices[0].get("delta") or {}).get("content") if choices else None
+                if not delta:
+                    continue
+
+                content += delta
+                for key, value in parser.feed(delta):
+                    on_field(key, value)
+
+                if parser.done:
+                    break
+        finally:
+            response.close()
+
+    except requests.exceptions.RequestException as e:
+        return {"error": f"OpenRouter API request failed: {str(e)}"}
+
+    except Exception as e:
+        return {"error": f"OpenRouter error: {str(e)}"}
+
+    if parser.done:
+        return {"content": parser.text}
+    if content:
+        return {"content": content}
+    return {"error": "No response from model"}
+
+
 def parse_json_response(response_dict: Dict) -> Dict:
     """
     Parse JSON from model response, handling markdown code blocks.
@@ -171,10 +426,185 @@ def parse_json_response(response_dict: Dict) -> Dict:
             return {"error": f"Failed to parse JSON: {str(e)}. Response: {response_text[:500]}"}
 
 
+# Map-reduce settings for post analyses. Posts are packed into batches of
+# roughly POSTS_TOKEN_BUDGET tokens; accounts that fit in one batch get a
+# single call, larger ones are analyzed per batch and merged.
+POSTS_TOKEN_BUDGET = 4000
+CHARS_PER_TOKEN = 4
+POST_BREAK = "\n\n---POST BREAK---\n\n"
+MAP_MAX_WORKERS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def chunk_posts(post_blocks: List[str], token_budget: int = POSTS_TOKEN_BUDGET) -> List[List[str]]:
+    """
+    Pack formatted posts into batches that each fit a token budget.
+
+    Posts keep their order. A single post larger than the budget is
+    truncated to fit rather than dropped.
+
+    Args:
+        post_blocks: One formatted string per post
+        token_budget: Approximate tokens of post text per batch
+
+    Returns:
+        List of batches (lists of post strings)
+    """
+    max_chars = token_budget * CHARS_PER_TOKEN
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for block in post_blocks:
+        if len(block) > max_chars:
+            block = block[:max_chars]
+        tokens = estimate_tokens(block) + estimate_tokens(POST_BREAK)
+
+        if current and current_tokens + tokens > token_budget:
+            chunks.append(current)
+            current = []
+            current_tokens = 0
+
+        current.append(block)
+        current_tokens += tokens
+
+    if current:
+        chunks.append(current)
+
+    return chunks
+
+
+def format_post_texts(posts_list: List[Dict]) -> List[str]:
+    """Format posts as the 'Post N:' blocks used by the voice and strategy prompts."""
+    return [
+        f"Post {i+1}:\n{post.get('text', '')}"
+        for i, post in enumerate(posts_list)
+        if post.get('text')
+    ]
+
+
+def format_posts_with_metrics(posts_list: List[Dict]) -> List[str]:
+    """Format posts with a one-line engagement header for the engagement prompt."""
+    return [
+        f"Post {i+1} ({post.get('num_likes', 0)} likes, {post.get('num_comments', 0)} comments, "
+        f"{post.get('num_reposts', 0)} reposts, posted {post.get('posted', 'unknown')}):\n"
+        f"{post.get('text', '')}"
+        for i, post in enumerate(posts_list)
+        if post.get('text')
+    ]
+
+
+def run_post_analysis(
+    prompt_name: str,
+    placeholder: str,
+    post_blocks: List[str],
+    company_name: str,
+    analysis_type: str,
+    model: str,
+    max_tokens: int,
+    use_cache: bool = False,
+    token_budget: int = POSTS_TOKEN_BUDGET,
+    on_field: Callable[[str, object], None] = None,
+    replacements: Dict[str, str] = None
+) -> Dict:
+    """
+    Run a post analysis prompt over every post, map-reduce style.
+
+    Posts are split into token-budgeted batches, each batch is analyzed
+    concurrently with the same prompt, and the partial JSON results are
+    merged with one reduce call. One batch means one call, as before.
+    Failed batches are left out of the merge and counted in the result.
+
+    Args:
+        prompt_name: Prompt template name (e.g. "company_voice_profile")
+        placeholder: Template placeholder for the posts (e.g. "{all_posts_text}")
+        post_blocks: Formatted posts from format_post_texts()/format_posts_with_metrics()
+        company_name: Company name
+        analysis_type: Human-readable name used in the reduce prompt
+        model: Model to use
+        max_tokens: Maximum tokens per response
+        use_cache: Reuse stored LLM responses for identical prompts
+        token_budget: Approximate tokens of post text per batch
+        on_field: Optional callback(key, value) fed by the final call (the only
+                  batch, or the reduce step) as each JSON field streams in
+        replacements: Optional extra {placeholder: text} filled into every batch prompt
+
+    Returns:
+        Parsed JSON result with "posts_analyzed" (posts in batches that
+        succeeded) and "failed_batches", or {"error": str}
+    """
+    if not post_blocks:
+        return {"error": "No post text to analyze"}
+
+    prompt_template = get_prompt_template(prompt_name)
+    for key, value in (replacements or {}).items():
+        prompt_template = prompt_template.replace(key, value)
+    chunks = chunk_posts(post_blocks, token_budget)
+
+    def analyze_chunk(chunk: List[str], on_field: Callable = None) -> Dict:
+        prompt = prompt_template.replace("{company_name}", company_name)
+        prompt = prompt.replace("{num_posts}", str(len(chunk)))
+        prompt = prompt.replace(placeholder, POST_BREAK.join(chunk))
+        return parse_json_response(
+            call_openrouter(prompt, model, max_tokens=max_tokens, use_cache=use_cache, on_field=on_field)
+        )
+
+    if len(chunks) == 1:
+        result = analyze_chunk(chunks[0], on_field)
+        if result.get("error"):
+            return result
+        return dict(result, posts_analyzed=len(chunks[0]), failed_batches=0)
+
+    print(f"Splitting {len(post_blocks)} posts into {len(chunks)} batches for {analysis_type}...")
+
+    with ThreadPoolExecutor(max_workers=min(len(chunks), MAP_MAX_WORKERS)) as executor:
+        partials = list(executor.map(analyze_chunk, chunks))
+
+    successful = [
+        {"posts_in_batch": len(chunk), "result": result}
+        for chunk, result in zip(chunks, partials)
+        if not result.get("error")
+    ]
+
+    failed_batches = len(chunks) - len(successful)
+    posts_analyzed = sum(p["posts_in_batch"] for p in successful)
+
+    if not successful:
+        return {"error": partials[0].get("error", "All batches failed")}
+    if failed_batches:
+        print(f"{failed_batches} of {len(chunks)} {analysis_type} batches failed; merging {posts_analyzed} posts")
+
+    if len(successful) == 1:
+        if on_field:
+            for key, value in successful[0]["result"].items():
+                on_field(key, value)
+        return dict(successful[0]["result"], posts_analyzed=posts_analyzed, failed_batches=failed_batches)
+
+    reduce_prompt = get_prompt_template("merge_partial_analyses")
+    reduce_prompt = reduce_prompt.replace("{analysis_type}", analysis_type)
+    reduce_prompt = reduce_prompt.replace("{company_name}", company_name)
+    reduce_prompt = reduce_prompt.replace("{num_posts}", str(posts_analyzed))
+    reduce_prompt = reduce_prompt.replace("{partial_results}", json.dumps(successful, indent=2))
+
+    result = parse_json_response(
+        call_openrouter(reduce_prompt, model, max_tokens=max_tokens, use_cache=use_cache, on_field=on_field)
+    )
+    if result.get("error"):
+        return result
+    return dict(result, posts_analyzed=posts_analyzed, failed_batches=failed_batches)
+
+
 def analyze_company_voice(
     posts_list: List[Dict],
     company_name: str,
-    model: str = "anthropic/claude-haiku-4.5"
+    model: str = "anthropic/claude-haiku-4.5",
+    use_cache: bool = False,
+    post_blocks: List[str] = None,
+    on_field: Callable[[str, object], None] = None
 ) -> Dict:
     """
     Analyze company's overall voice and tone from all posts.
@@ -183,6 +613,9 @@ def analyze_company_voice(
         posts_list: List of post dicts with 'text' key
         company_name: Company name
         model: Claude model to use
+        use_cache: Reuse stored LLM responses for identical prompts
+        post_blocks: Optional pre-formatted posts from format_post_texts()
+        on_field: Optional callback(key, value) called as each result field streams in
 
     Returns:
         Dict with voice profile analysis
@@ -190,22 +623,19 @@ def analyze_company_voice(
     if not posts_list:
         return {"error": "No posts to analyze"}
 
-    # Aggregate all post text
-    all_posts_text = "\n\n---POST BREAK---\n\n".join([
-        f"Post {i+1}:\n{post.get('text', '')}"
-        for i, post in enumerate(posts_list)
-        if post.get('text')
-    ])
-
-    prompt_template = get_prompt_template("company_voice_profile")
-    prompt = prompt_template.replace("{company_name}", company_name)
-    prompt = prompt.replace("{num_posts}", str(len(posts_list)))
-    prompt = prompt.replace("{all_posts_text}", all_posts_text[:15000])  # Limit to ~15K chars
-
     print(f"Analyzing voice profile for {company_name}...")
 
-    response = call_openrouter(prompt, model, max_tokens=2000)
-    result = parse_json_response(response)
+    result = run_post_analysis(
+        "company_voice_profile",
+        "{all_posts_text}",
+        post_blocks if post_blocks is not None else format_post_texts(posts_list),
+        company_name,
+        "voice profile",
+        model,
+        max_tokens=2000,
+        use_cache=use_cache,
+        on_field=on_field
+    )
 
     # Check if parsing returned an error
     if result.get("error"):
@@ -221,7 +651,10 @@ def analyze_company_voice(
 def analyze_content_strategy(
     posts_list: List[Dict],
     company_name: str,
-    model: str = "anthropic/claude-haiku-4.5"
+    model: str = "anthropic/claude-haiku-4.5",
+    use_cache: bool = False,
+    post_blocks: List[str] = None,
+    on_field: Callable[[str, object], None] = None
 ) -> Dict:
     """
     Analyze company's content strategy and distribution.
@@ -230,6 +663,9 @@ def analyze_content_strategy(
         posts_list: List of post dicts
         company_name: Company name
         model: Claude model to use
+        use_cache: Reuse stored LLM responses for identical prompts
+        post_blocks: Optional pre-formatted posts from format_post_texts()
+        on_field: Optional callback(key, value) called as each result field streams in
 
     Returns:
         Dict with content strategy analysis
@@ -237,22 +673,19 @@ def analyze_content_strategy(
     if not posts_list:
         return {"error": "No posts to analyze"}
 
-    # Aggregate all post text
-    all_posts_text = "\n\n---POST BREAK---\n\n".join([
-        f"Post {i+1}:\n{post.get('text', '')}"
-        for i, post in enumerate(posts_list)
-        if post.get('text')
-    ])
-
-    prompt_template = get_prompt_template("company_content_strategy")
-    prompt = prompt_template.replace("{company_name}", company_name)
-    prompt = prompt.replace("{num_posts}", str(len(posts_list)))
-    prompt = prompt.replace("{all_posts_text}", all_posts_text[:15000])
-
     print(f"Analyzing content strategy for {company_name}...")
 
-    response = call_openrouter(prompt, model, max_tokens=2000)
-    result = parse_json_response(response)
+    result = run_post_analysis(
+        "company_content_strategy",
+        "{all_posts_text}",
+        post_blocks if post_blocks is not None else format_post_texts(posts_list),
+        company_name,
+        "content strategy analysis",
+        model,
+        max_tokens=2000,
+        use_cache=use_cache,
+        on_field=on_field
+    )
 
     # Check if parsing returned an error
     if result.get("error"):
@@ -268,15 +701,26 @@ def analyze_content_strategy(
 def analyze_engagement_patterns(
     posts_list: List[Dict],
     company_name: str,
-    model: str = "anthropic/claude-haiku-4.5"
+    model: str = "anthropic/claude-haiku-4.5",
+    use_cache: bool = False,
+    on_field: Callable[[str, object], None] = None,
+    metrics: Dict = None
 ) -> Dict:
     """
     Analyze engagement patterns and what content performs best.
 
+    Averages, distributions and cadence are computed locally and given to
+    the LLM as a summary; the LLM only interprets them. The exact averages
+    are returned as "avg_engagement" and the full statistics as
+    "computed_metrics".
+
     Args:
         posts_list: List of post dicts with engagement metrics
         company_name: Company name
         model: Claude model to use
+        use_cache: Reuse stored LLM responses for identical prompts
+        on_field: Optional callback(key, value) called as each result field streams in
+        metrics: Optional precomputed compute_engagement_metrics() result
 
     Returns:
         Dict with engagement analysis
@@ -284,36 +728,41 @@ def analyze_engagement_patterns(
     if not posts_list:
         return {"error": "No posts to analyze"}
 
-    # Format posts with engagement data
-    posts_with_metrics = "\n\n---POST BREAK---\n\n".join([
-        f"Post {i+1}:\n"
-        f"Text: {post.get('text', '')}\n"
-        f"Likes: {post.get('num_likes', 0)}\n"
-        f"Comments: {post.get('num_comments', 0)}\n"
-        f"Reposts: {post.get('num_reposts', 0)}\n"
-        f"Posted: {post.get('posted', 'unknown')}"
-        for i, post in enumerate(posts_list)
-        if post.get('text')
-    ])
-
-    prompt_template = get_prompt_template("company_engagement_analysis")
-    prompt = prompt_template.replace("{company_name}", company_name)
-    prompt = prompt.replace("{num_posts}", str(len(posts_list)))
-    prompt = prompt.replace("{posts_with_metrics}", posts_with_metrics[:15000])
-
     print(f"Analyzing engagement patterns for {company_name}...")
 
-    response = call_openrouter(prompt, model, max_tokens=2500)
-    result = parse_json_response(response)
+    if metrics is None:
+        metrics = compute_engagement_metrics(posts_list)
+    computed = {k: v for k, v in metrics.items() if k not in ("top_posts", "bottom_posts")}
+
+    # Exact numbers are known up front, so show them before the LLM responds
+    if on_field:
+        on_field("avg_engagement", metrics.get("avg_engagement", {}))
+
+    result = run_post_analysis(
+        "company_engagement_analysis",
+        "{posts_with_metrics}",
+        format_posts_with_metrics(posts_list),
+        company_name,
+        "engagement analysis",
+        model,
+        max_tokens=2500,
+        use_cache=use_cache,
+        on_field=on_field,
+        replacements={"{engagement_summary}": format_engagement_summary(metrics)}
+    )
 
     # Check if parsing returned an error
     if result.get("error"):
         return {
             "error": f"Failed to analyze engagement: {result['error']}",
-            "avg_engagement": {},
+            "avg_engagement": metrics.get("avg_engagement", {}),
+            "computed_metrics": computed,
             "top_performing_content_types": []
         }
 
+    result["avg_engagement"] = metrics.get("avg_engagement", {})
+    result["computed_metrics"] = computed
+
     return result
 
 
@@ -321,7 +770,9 @@ def analyze_company_complete(
     posts_list: List[Dict],
     company_name: str,
     company_url: str,
-    model: str = "anthropic/claude-haiku-4.5"
+    model: str = "anthropic/claude-haiku-4.5",
+    use_cache: bool = False,
+    on_field: Callable[[str, str, object], None] = None
 ) -> Dict:
     """
     Run complete company-level analysis.
@@ -331,6 +782,10 @@ def analyze_company_complete(
         company_name: Company name
         company_url: LinkedIn URL
         model: Claude model to use
+        use_cache: Reuse stored LLM responses for identical prompts
+        on_field: Optional callback(analysis, key, value) for streamed fields, where
+                  analysis is "voice_profile", "content_pillars" or "engagement_metrics".
+                  Called from worker threads.
 
     Returns:
         Dict with all analysis results
@@ -339,36 +794,41 @@ def analyze_company_complete(
     print(f"Analyzing {company_name} ({len(posts_list)} posts)")
     print(f"{'='*60}\n")
 
-    # Run all analyses
-    voice_profile = analyze_company_voice(posts_list, company_name, model)
-    content_strategy = analyze_content_strategy(posts_list, company_name, model)
-    engagement_metrics = analyze_engagement_patterns(posts_list, company_name, model)
-
-    # Calculate date range
-    dates = [p.get('posted', '') for p in posts_list if p.get('posted')]
-    date_range = f"{dates[-1]} to {dates[0]}" if dates else "Unknown"
-
-    # Extract top posts (top 5 by engagement)
-    posts_with_engagement = [
-        {
-            'text': p.get('text', '')[:200],
-            'url': p.get('url', ''),
-            'engagement': p.get('num_likes', 0) + p.get('num_comments', 0) + p.get('num_reposts', 0)
-        }
-        for p in posts_list
-        if p.get('text')
-    ]
-    top_posts = sorted(posts_with_engagement, key=lambda x: x['engagement'], reverse=True)[:5]
+    # Voice and strategy use the same post text; format it once
+    post_blocks = format_post_texts(posts_list)
+
+    # Exact engagement statistics, top posts and date range in one pass
+    metrics = compute_engagement_metrics(posts_list)
+
+    # Run all analyses concurrently - each is an independent OpenRouter call
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        voice_future = executor.submit(
+            analyze_company_voice, posts_list, company_name, model, use_cache, post_blocks,
+            functools.partial(on_field, "voice_profile") if on_field else None
+        )
+        strategy_future = executor.submit(
+            analyze_content_strategy, posts_list, company_name, model, use_cache, post_blocks,
+            functools.partial(on_field, "content_pillars") if on_field else None
+        )
+        engagement_future = executor.submit(
+            analyze_engagement_patterns, posts_list, company_name, model, use_cache,
+            functools.partial(on_field, "engagement_metrics") if on_field else None,
+            metrics
+        )
+
+        voice_profile = voice_future.result()
+        content_strategy = strategy_future.result()
+        engagement_metrics = engagement_future.result()
 
     analysis = {
         "company_url": company_url,
         "company_name": company_name,
         "posts_analyzed": len(posts_list),
-        "date_range": date_range,
+        "date_range": metrics.get("date_range", "Unknown"),
         "voice_profile": voice_profile,
         "content_pillars": content_strategy,
         "engagement_metrics": engagement_metrics,
-        "top_posts": top_posts,
+        "top_posts": metrics.get("top_posts", []),
         "analysis_model": model
     }
 
@@ -377,13 +837,22 @@ def analyze_company_complete(
     return analysis
 
 
+# Style instruction per content variation
+VARIATION_INSTRUCTIONS = {
+    1: "Focus on a data-driven, analytical approach with specific metrics and frameworks.",
+    2: "Focus on storytelling and emotional resonance with relatable examples.",
+    3: "Focus on thought leadership with bold insights and industry predictions."
+}
+
+
 def generate_content(
     voice_profile: Dict,
     content_strategy: Dict,
     input_type: str,
     user_input: str,
     model: str = "anthropic/claude-haiku-4.5",
-    variation_number: int = 1
+    variation_number: int = 1,
+    use_cache: bool = False
 ) -> Dict:
     """
     Generate LinkedIn post in company's voice.
@@ -395,6 +864,7 @@ def generate_content(
         user_input: User's input (URL, topic, or content to rewrite)
         model: Claude model to use
         variation_number: Which variation to generate (1, 2, or 3)
+        use_cache: Reuse a stored generation for identical inputs
 
     Returns:
         Dict with generated post
@@ -405,24 +875,17 @@ def generate_content(
     voice_str = json.dumps(voice_profile, indent=2)
     strategy_str = json.dumps(content_strategy, indent=2)
 
-    # Add variation instructions to the prompt
-    variation_instructions = {
-        1: "Focus on a data-driven, analytical approach with specific metrics and frameworks.",
-        2: "Focus on storytelling and emotional resonance with relatable examples.",
-        3: "Focus on thought leadership with bold insights and industry predictions."
-    }
-
     prompt = prompt_template.replace("{voice_profile}", voice_str)
     prompt = prompt.replace("{content_strategy}", strategy_str)
     prompt = prompt.replace("{input_type}", input_type)
     prompt = prompt.replace("{user_input}", user_input)
 
     # Add variation instruction
-    prompt += f"\n\nVARIATION STYLE: {variation_instructions.get(variation_number, variation_instructions[1])}"
+    prompt += f"\n\nVARIATION STYLE: {VARIATION_INSTRUCTIONS.get(variation_number, VARIATION_INSTRUCTIONS[1])}"
 
     print(f"Generating content variation {variation_number} ({input_type})...")
 
-    response = call_openrouter(prompt, model, max_tokens=2000)
+    response = call_openrouter(prompt, model, max_tokens=2000, use_cache=use_cache)
     result = parse_json_response(response)
 
     # Check if parsing returned an error
@@ -433,3 +896,94 @@ def generate_content(
         }
 
     return result
+
+
+def generate_content_variations(
+    voice_profile: Dict,
+    content_strategy: Dict,
+    input_type: str,
+    user_input: str,
+    model: str = "anthropic/claude-haiku-4.5",
+    num_variations: int = 3,
+    use_cache: bool = False
+) -> Dict:
+    """
+    Generate several LinkedIn post variations in one call.
+
+    The voice profile, strategy and input are sent once and the model returns
+    every variation in a single JSON response. Any variation missing from
+    that response is generated separately with generate_content(), concurrently.
+
+    Args:
+        voice_profile: Company voice profile from analysis
+        content_strategy: Company content strategy from analysis
+        input_type: "article", "topic", "rewrite"
+        user_input: User's input (URL, topic, or content to rewrite)
+        model: Claude model to use
+        num_variations: Number of variations (styles from VARIATION_INSTRUCTIONS)
+        use_cache: Reuse a stored generation for identical inputs
+
+    Returns:
+        Dict with "variations" (list of generate_content-style dicts, in
+        variation order) and "error" (None, or a message if none succeeded)
+    """
+    numbers = [((i % len(VARIATION_INSTRUCTIONS)) + 1) for i in range(num_variations)]
+
+    prompt_template = get_prompt_template("content_generation")
+
+    prompt = prompt_template.replace("{voice_profile}", json.dumps(voice_profile, indent=2))
+    prompt = prompt.replace("{content_strategy}", json.dumps(content_strategy, indent=2))
+    prompt = prompt.replace("{input_type}", input_type)
+    prompt = prompt.replace("{user_input}", user_input)
+
+    styles = "\n".join(
+        f"Variation {i}: {VARIATION_INSTRUCTIONS[number]}"
+        for i, number in enumerate(numbers, 1)
+    )
+    prompt += (
+        f"\n\nGENERATE {num_variations} DISTINCT VARIATIONS, one per style:\n{styles}\n\n"
+        "Return ONLY a valid JSON object (no markdown, no code blocks) of the form "
+        '{"variations": [...]}, where the list holds one object per variation, in order, '
+        "each with exactly the fields described above."
+    )
+
+    print(f"Generating {num_variations} content variations in one call ({input_type})...")
+
+    response = call_openrouter(prompt, model, max_tokens=min(2000 * num_variations, 8000), use_cache=use_cache)
+    result = parse_json_response(response)
+
+    # Models sometimes return the bare list; anything else falls back per variation
+    batch = result if isinstance(result, list) else []
+    if isinstance(result, dict) and not result.get("error"):
+        batch = result.get("variations") or []
+
+    variations = {}
+    if isinstance(batch, list):
+        for i, variation in enumerate(batch[:num_variations], 1):
+            if isinstance(variation, dict) and variation.get("post_text"):
+                variations[i] = variation
+
+    # Fall back to one call per missing variation, run concurrently
+    missing = [i for i in range(1, num_variations + 1) if i not in variations]
+    if missing:
+        print(f"Batch response missing {len(missing)} variation(s), generating individually...")
+        with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+            futures = {
+                i: executor.submit(
+                    generate_content, voice_profile, content_strategy, input_type,
+                    user_input, model, numbers[i - 1], use_cache
+                )
+                for i in missing
+            }
+            for i, future in futures.items():
+                single = future.result()
+                if not single.get("error"):
+                    variations[i] = single
+
+    ordered = [variations[i] for i in sorted(variations)]
+    batch_error = result.get("error") if isinstance(result, dict) else None
+
+    return {
+        "variations": ordered,
+        "error": None if ordered else batch_error or "All generations failed"
+    }
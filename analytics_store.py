@@ -0,0 +1,332 @@
+"""
+Local Analytics Mirror
+
+Optional on-disk SQLite copy of the Supabase tables (keywords, linkedin_posts,
+linkedin_post, linkedin_post_engagement, linkedin_company_analysis,
+generated_posts) for fast filters, aggregations and joins without a round
+trip per rerun. Each sync only pulls rows changed since the last one, using
+an (updated_at, id) keyset cursor (created_at / recorded_at for append-only
+tables).
+
+JSON columns are stored as JSON text, so queries can use json_extract():
+
+    query("SELECT company_name, json_extract(engagement_metrics, '$.avg_engagement.total') AS total "
+          "FROM linkedin_company_analysis ORDER BY total DESC")
+
+Deletes in Supabase are not mirrored; call sync_table(name, full=True) to rebuild a table.
+
+The Compare tab reads company analyses through get_mirrored_company_analyses()
+when the mirror is enabled, so picking companies doesn't re-download their
+analysis JSON on every rerun.
+
+Settings (Streamlit secrets or environment variables):
+- ANALYTICS_STORE_ENABLED: "true" enables the mirror (default: false)
+- ANALYTICS_STORE_PATH: SQLite file location (default: .cache/analytics.sqlite3 next to this file)
+"""
+
+import os
+import re
+import json
+import sqlite3
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from seo_functions import iter_table_keyset, COMPANY_ANALYSIS_COLUMNS, LAZY_JSON_DEFAULTS
+
+
+# Mirrored tables and the column(s) used as the incremental sync cursor, in order of preference
+MIRRORED_TABLES = {
+    'keywords': ['updated_at', 'created_at'],
+    'linkedin_posts': ['created_at'],
+    'linkedin_post': ['updated_at'],
+    'linkedin_post_engagement': ['recorded_at'],
+    'linkedin_company_analysis': ['updated_at'],
+    'generated_posts': ['created_at'],
+}
+SYNC_PAGE_SIZE = 500
+READ_SYNC_INTERVAL = 30  # seconds between the incremental syncs run before mirror reads
+
+_sync_lock = threading.Lock()
+_last_read_sync = {}
+
+
+def get_credential(key: str, default=None):
+    """
+    Get credential from Streamlit secrets or environment variables.
+    Tries st.secrets first, falls back to os.environ.
+
+    Args:
+        key: The credential key name
+        default: Default value if not found
+
+    Returns:
+        The credential value or default
+    """
+    try:
+        import streamlit as st
+        return st.secrets.get(key, os.environ.get(key, default))
+    except (ImportError, FileNotFoundError):
+        # Streamlit not available or secrets file not found, use environment
+        return os.environ.get(key, default)
+
+
+def is_store_enabled() -> bool:
+    """Return True if the local mirror has been switched on with ANALYTICS_STORE_ENABLED."""
+    return str(get_credential("ANALYTICS_STORE_ENABLED", "false")).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _store_path() -> Path:
+    path = get_credential("ANALYTICS_STORE_PATH")
+    if path:
+        return Path(path)
+    return Path(__file__).parent / ".cache" / "analytics.sqlite3"
+
+
+@contextmanager
+def _open():
+    """Connection context: commits on success, rolls back on error, always closes."""
+    path = _store_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(str(path), timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        with conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS _sync_state (
+                    table_name TEXT PRIMARY KEY,
+                    cursor_column TEXT NOT NULL,
+                    last_value TEXT,
+                    last_id TEXT,
+                    synced_at TEXT NOT NULL
+                )
+            """)
+            yield conn
+    finally:
+        conn.close()
+
+
+def _quote(identifier: str) -> str:
+    """Quote a column or table name taken from Supabase rows."""
+    if not re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', identifier):
+        raise ValueError(f"Unsupported column name: {identifier!r}")
+    return f'"{identifier}"'
+
+
+def _to_sqlite(value):
+    """Store dicts/lists as JSON text so json_extract() works on them."""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _ensure_columns(conn: sqlite3.Connection, table: str, columns: List[str]) -> None:
+    """Create the mirror table or add any columns it is missing."""
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {_quote(table)} (id PRIMARY KEY)")
+
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")}
+    for column in columns:
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(column)}")
+
+
+def _write_rows(conn: sqlite3.Connection, table: str, rows: List[Dict]) -> None:
+    """Insert or replace a page of rows, keyed on id."""
+    columns = sorted({key for row in rows for key in row})
+    _ensure_columns(conn, table, columns)
+
+    placeholders = ', '.join('?' for _ in columns)
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {_quote(table)} ({', '.join(_quote(c) for c in columns)}) VALUES ({placeholders})",
+        [tuple(_to_sqlite(row.get(column)) for column in columns) for row in rows]
+    )
+
+
+def sync_table(table: str, full: bool = False, page_size: int = SYNC_PAGE_SIZE) -> Dict:
+    """
+    Pull rows changed since the last sync from Supabase into the local mirror.
+
+    Args:
+        table: One of MIRRORED_TABLES
+        full: Drop the local copy and re-download everything
+        page_size: Rows fetched per request
+
+    Returns:
+        Dict with "table", "rows" (number synced) and "error"
+    """
+    if not is_store_enabled():
+        return {"table": table, "rows": 0, "error": "Analytics mirror is disabled (set ANALYTICS_STORE_ENABLED=true)"}
+    if table not in MIRRORED_TABLES:
+        return {"table": table, "rows": 0, "error": f"Table '{table}' is not mirrored"}
+
+    with _sync_lock, _open() as conn:
+        if full:
+            conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+            conn.execute("DELETE FROM _sync_state WHERE table_name = ?", (table,))
+
+        state = conn.execute(
+            "SELECT cursor_column, last_value, last_id FROM _sync_state WHERE table_name = ?", (table,)
+        ).fetchone()
+
+        # Re-probe columns preferred over the saved one on every sync: keywords falls back to
+        # created_at until the upsert migration adds updated_at, and must switch once it exists
+        candidates = MIRRORED_TABLES[table]
+        if state and state['cursor_column'] in candidates:
+            candidates = candidates[:candidates.index(state['cursor_column']) + 1]
+        last_error = None
+
+        for cursor_column in candidates:
+            # A newly available column starts from scratch; rows already mirrored are replaced by id
+            resume = state and state['cursor_column'] == cursor_column and state['last_value']
+            after = (state['last_value'], state['last_id']) if resume else None
+            synced = 0
+            cursor = after
+            page = []
+
+            try:
+                for row in iter_table_keyset(
+                    table,
+                    page_size=page_size,
+                    newest_first=False,
+                    order_column=cursor_column,
+                    after=after
+                ):
+                    page.append(row)
+                    if row.get(cursor_column) is not None:
+                        cursor = (row.get(cursor_column), row.get('id'))
+
+                    if len(page) >= page_size:
+                        _write_rows(conn, table, page)
+                        synced += len(page)
+                        page = []
+
+                if page:
+                    _write_rows(conn, table, page)
+                    synced += len(page)
+
+            except Exception as e:
+                # Cursor column may not exist yet (e.g. keywords before the upsert migration),
+                # so try the next one. Rows already written are harmless: the next sync
+                # resumes from the saved cursor and replaces them by id.
+                last_error = str(e)
+                if synced:
+                    break
+                continue
+
+            conn.execute(
+                "INSERT OR REPLACE INTO _sync_state (table_name, cursor_column, last_value, last_id, synced_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    table,
+                    cursor_column,
+                    cursor[0] if cursor else None,
+                    str(cursor[1]) if cursor else None,
+                    datetime.utcnow().isoformat()
+                )
+            )
+            return {"table": table, "rows": synced, "error": None}
+
+        print(f"Analytics mirror sync failed for {table}: {last_error}")
+        return {"table": table, "rows": 0, "error": last_error}
+
+
+def sync_all(tables: List[str] = None, full: bool = False) -> Dict[str, Dict]:
+    """
+    Sync every mirrored table (or the given subset).
+
+    Args:
+        tables: Optional subset of MIRRORED_TABLES
+        full: Re-download everything instead of syncing incrementally
+
+    Returns:
+        {table: sync_table() result}
+    """
+    results = {}
+    for table in tables or list(MIRRORED_TABLES):
+        try:
+            results[table] = sync_table(table, full=full)
+        except Exception as e:
+            print(f"Analytics mirror sync failed for {table}: {e}")
+            results[table] = {"table": table, "rows": 0, "error": str(e)}
+    return results
+
+
+def query(sql: str, params=()) -> List[Dict]:
+    """
+    Run a read query against the local mirror.
+
+    Args:
+        sql: SQLite SQL; mirrored tables use their Supabase names
+        params: Query parameters for ? placeholders
+
+    Returns:
+        List of row dicts (empty list on error)
+    """
+    try:
+        with _open() as conn:
+            return [dict(row) for row in conn.execute(sql, params).fetchall()]
+    except Exception as e:
+        print(f"Analytics mirror query failed: {e}")
+        return []
+
+
+def query_df(sql: str, params=()):
+    """Run a read query against the local mirror and return a pandas DataFrame."""
+    import pandas as pd
+    return pd.DataFrame(query(sql, params))
+
+
+def get_sync_status() -> List[Dict]:
+    """Return the last sync cursor and time for each mirrored table."""
+    return query("SELECT table_name, cursor_column, last_value, synced_at FROM _sync_state ORDER BY table_name")
+
+
+def get_mirrored_company_analyses(company_ids: List) -> List[Dict]:
+    """
+    Read full company analyses from the mirror, syncing recent changes first.
+
+    Args:
+        company_ids: linkedin_company_analysis row ids
+
+    Returns:
+        Analysis dicts (COMPANY_ANALYSIS_COLUMNS, JSON columns decoded) in the
+        order of company_ids, or None when the mirror is disabled, the sync
+        failed or a company is missing, so the caller reads from Supabase
+    """
+    if not is_store_enabled() or not company_ids:
+        return None
+
+    table = 'linkedin_company_analysis'
+    if time.time() - _last_read_sync.get(table, 0) > READ_SYNC_INTERVAL:
+        if sync_table(table).get("error"):
+            return None
+        _last_read_sync[table] = time.time()
+
+    placeholders = ', '.join('?' for _ in company_ids)
+    rows = query(f"SELECT * FROM {_quote(table)} WHERE id IN ({placeholders})", tuple(company_ids))
+
+    by_id = {}
+    for row in rows:
+        company = {column: row.get(column) for column in COMPANY_ANALYSIS_COLUMNS if column in row}
+        for column, default in LAZY_JSON_DEFAULTS.items():
+            value = company.get(column)
+            if isinstance(value, str):
+                try:
+                    value = json.loads(value)
+                except json.JSONDecodeError:
+                    value = None
+            if not value:
+                value = default.copy() if default is not None else None
+            company[column] = value
+        by_id[row.get('id')] = company
+
+    if any(company_id not in by_id for company_id in company_ids):
+        return None
+    return [by_id[company_id] for company_id in company_ids]
@@ -0,0 +1,404 @@
+"""
+Persistent API Response Cache
+
+Disk-backed (SQLite) cache for paid API responses. Entries are keyed on
+endpoint + normalized request arguments, expire after a per-endpoint TTL and
+are evicted least-recently-used once the cache grows past its size limit.
+
+Settings (Streamlit secrets or environment variables):
+- API_CACHE_ENABLED: "false" disables all caching (default: true)
+- API_CACHE_PATH: SQLite file location (default: .cache/api_cache.sqlite3 next to this file)
+- API_CACHE_MAX_MB: Size limit before LRU eviction (default: 200)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import inspect
+import functools
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+
+DAY = 24 * 60 * 60
+
+# Default time-to-live per endpoint, in seconds
+DEFAULT_TTLS = {
+    "search_volume": 30 * DAY,
+    "keywords_for_keywords": 30 * DAY,
+    "keywords_for_site": 30 * DAY,
+    "ranked_keywords": 30 * DAY,
+    "domain_technologies": 30 * DAY,
+    "ads_search": 7 * DAY,
+    "openrouter": 30 * DAY,
+}
+FALLBACK_TTL = 7 * DAY
+DEFAULT_MAX_MB = 200
+BULK_CHUNK_SIZE = 500  # keys per IN (...) query, below SQLite's variable limit
+
+# Sentinel returned by cache_get on a miss (None is never cached, but be explicit)
+MISS = object()
+
+_stats = {}
+_stats_lock = threading.Lock()
+_init_lock = threading.Lock()
+_initialized_paths = set()
+
+
+def get_credential(key: str, default=None):
+    """
+    Get credential from Streamlit secrets or environment variables.
+    Tries st.secrets first, falls back to os.environ.
+
+    Args:
+        key: The credential key name
+        default: Default value if not found
+
+    Returns:
+        The credential value or default
+    """
+    try:
+        import streamlit as st
+        return st.secrets.get(key, os.environ.get(key, default))
+    except (ImportError, FileNotFoundError):
+        # Streamlit not available or secrets file not found, use environment
+        return os.environ.get(key, default)
+
+
+def is_cache_enabled() -> bool:
+    """Return False if caching has been switched off with API_CACHE_ENABLED."""
+    return str(get_credential("API_CACHE_ENABLED", "true")).strip().lower() not in ("0", "false", "no", "off")
+
+
+def _cache_path() -> Path:
+    path = get_credential("API_CACHE_PATH")
+    if path:
+        return Path(path)
+    return Path(__file__).parent / ".cache" / "api_cache.sqlite3"
+
+
+def _max_bytes() -> int:
+    try:
+        return int(float(get_credential("API_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_MB * 1024 * 1024
+
+
+def _connect() -> sqlite3.Connection:
+    """Open a connection to the cache database, creating the schema on first use."""
+    path = _cache_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(str(path), timeout=10)
+
+    if str(path) not in _initialized_paths:
+        with _init_lock:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS api_cache (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_api_cache_last_access ON api_cache (last_access)")
+            conn.commit()
+            _initialized_paths.add(str(path))
+
+    return conn
+
+
+@contextmanager
+def _open():
+    """Connection context: commits on success, rolls back on error, always closes."""
+    conn = _connect()
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _normalize(value: Any) -> Any:
+    """Normalize request arguments so equivalent requests share a key."""
+    if isinstance(value, str):
+        return value.strip().lower()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def make_cache_key(endpoint: str, payload: Dict) -> str:
+    """
+    Build a cache key from an endpoint name and request payload.
+
+    Args:
+        endpoint: Endpoint name (e.g. "keywords_for_site")
+        payload: Request arguments
+
+    Returns:
+        SHA-256 hex digest
+    """
+    normalized = json.dumps([endpoint, _normalize(payload)], sort_keys=True, default=str)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _record(endpoint: str, outcome: str) -> None:
+    with _stats_lock:
+        counters = _stats.setdefault(endpoint, {"hits": 0, "misses": 0, "writes": 0, "evictions": 0})
+        counters[outcome] += 1
+
+
+def cache_get(endpoint: str, key: str) -> Any:
+    """
+    Look up a cached value.
+
+    Returns:
+        The cached value, or MISS if absent or expired
+    """
+    try:
+        now = time.time()
+        with _open() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM api_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if not row or row[1] < now:
+                if row:
+                    conn.execute("DELETE FROM api_cache WHERE key = ?", (key,))
+                _record(endpoint, "misses")
+                return MISS
+
+            conn.execute("UPDATE api_cache SET last_access = ? WHERE key = ?", (now, key))
+
+        _record(endpoint, "hits")
+        return json.loads(row[0])
+
+    except Exception as e:
+        print(f"API cache read failed: {e}")
+        _record(endpoint, "misses")
+        return MISS
+
+
+def cache_set(endpoint: str, key: str, value: Any, ttl: float = None) -> None:
+    """
+    Store a value, then evict least-recently-used entries if over the size limit.
+
+    Args:
+        endpoint: Endpoint name (used for TTL lookup and stats)
+        key: Cache key from make_cache_key()
+        value: JSON-serializable value
+        ttl: Seconds to keep the entry (default: per-endpoint TTL)
+    """
+    if ttl is None:
+        ttl = DEFAULT_TTLS.get(endpoint, FALLBACK_TTL)
+
+    try:
+        encoded = json.dumps(value, default=str)
+        now = time.time()
+
+        with _open() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO api_cache (key, endpoint, value, size, created_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, encoded, len(encoded), now, now + ttl, now)
+            )
+            _record(endpoint, "writes")
+            _evict(conn)
+
+    except Exception as e:
+        print(f"API cache write failed: {e}")
+
+
+def cache_get_many(endpoint: str, keys: List[str]) -> Dict[str, Any]:
+    """
+    Look up many cached values with one connection and transaction.
+
+    Args:
+        endpoint: Endpoint name (used for stats)
+        keys: Cache keys from make_cache_key()
+
+    Returns:
+        {key: value} for the keys that were present and unexpired
+    """
+    keys = list(dict.fromkeys(keys))
+    hits = {}
+
+    try:
+        now = time.time()
+        expired = []
+
+        with _open() as conn:
+            for i in range(0, len(keys), BULK_CHUNK_SIZE):
+                chunk = keys[i:i + BULK_CHUNK_SIZE]
+                placeholders = ", ".join("?" for _ in chunk)
+                for key, value, expires_at in conn.execute(
+                    f"SELECT key, value, expires_at FROM api_cache WHERE key IN ({placeholders})", chunk
+                ).fetchall():
+                    if expires_at < now:
+                        expired.append((key,))
+                    else:
+                        hits[key] = value
+
+            if expired:
+                conn.executemany("DELETE FROM api_cache WHERE key = ?", expired)
+            if hits:
+                conn.executemany("UPDATE api_cache SET last_access = ? WHERE key = ?", [(now, key) for key in hits])
+
+        hits = {key: json.loads(value) for key, value in hits.items()}
+
+    except Exception as e:
+        print(f"API cache read failed: {e}")
+        hits = {}
+
+    for key in keys:
+        _record(endpoint, "hits" if key in hits else "misses")
+    return hits
+
+
+def cache_set_many(endpoint: str, items: Dict[str, Any], ttl: float = None) -> None:
+    """
+    Store many values in one transaction, then evict once if over the size limit.
+
+    Args:
+        endpoint: Endpoint name (used for TTL lookup and stats)
+        items: {cache key: JSON-serializable value}
+        ttl: Seconds to keep the entries (default: per-endpoint TTL)
+    """
+    if not items:
+        return
+    if ttl is None:
+        ttl = DEFAULT_TTLS.get(endpoint, FALLBACK_TTL)
+
+    try:
+        now = time.time()
+        rows = []
+        for key, value in items.items():
+            encoded = json.dumps(value, default=str)
+            rows.append((key, endpoint, encoded, len(encoded), now, now + ttl, now))
+
+        with _open() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO api_cache (key, endpoint, value, size, created_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            for _ in rows:
+                _record(endpoint, "writes")
+            _evict(conn)
+
+    except Exception as e:
+        print(f"API cache write failed: {e}")
+
+
+def _evict(conn: sqlite3.Connection) -> None:
+    """Drop expired entries, then least-recently-used ones until under the size limit."""
+    conn.execute("DELETE FROM api_cache WHERE expires_at < ?", (time.time(),))
+
+    max_bytes = _max_bytes()
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM api_cache").fetchone()[0]
+    if total <= max_bytes:
+        return
+
+    for key, endpoint, size in conn.execute(
+        "SELECT key, endpoint, size FROM api_cache ORDER BY last_access ASC"
+    ).fetchall():
+        if total <= max_bytes:
+            break
+        conn.execute("DELETE FROM api_cache WHERE key = ?", (key,))
+        total -= size
+        _record(endpoint, "evictions")
+
+
+def clear_cache(endpoint: str = None) -> None:
+    """Delete all cached entries, or only those for one endpoint."""
+    try:
+        with _open() as conn:
+            if endpoint:
+                conn.execute("DELETE FROM api_cache WHERE endpoint = ?", (endpoint,))
+            else:
+                conn.execute("DELETE FROM api_cache")
+    except Exception as e:
+        print(f"API cache clear failed: {e}")
+
+
+def get_cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Return hit/miss/write/eviction counters per endpoint for this process,
+    plus entry counts and bytes stored on disk.
+    """
+    with _stats_lock:
+        stats = {endpoint: dict(counters) for endpoint, counters in _stats.items()}
+
+    try:
+        with _open() as conn:
+            for endpoint, entries, size in conn.execute(
+                "SELECT endpoint, COUNT(*), SUM(size) FROM api_cache GROUP BY endpoint"
+            ).fetchall():
+                counters = stats.setdefault(endpoint, {"hits": 0, "misses": 0, "writes": 0, "evictions": 0})
+                counters["entries"] = entries
+                counters["bytes"] = size
+    except Exception as e:
+        print(f"API cache stats failed: {e}")
+
+    return stats
+
+
+def _is_cacheable(result: Any) -> bool:
+    """Only cache successful results - never None or {"error": ...} dicts."""
+    if result is None:
+        return False
+    if isinstance(result, dict) and result.get("error"):
+        return False
+    return True
+
+
+def cached(endpoint: str, ttl: float = None) -> Callable:
+    """
+    Decorator that caches a fetcher's result on disk.
+
+    The key is built from the endpoint, the function name and all bound
+    arguments. Failed results are never cached. Pass bypass_cache=True to the
+    wrapped function to force a fresh request (the fresh result is still stored).
+
+    Args:
+        endpoint: Endpoint name, used for the TTL lookup and stats
+        ttl: Optional TTL override in seconds
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, bypass_cache: bool = False, **kwargs):
+            if not is_cache_enabled():
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = make_cache_key(endpoint, {"function": func.__name__, "args": dict(bound.arguments)})
+
+            if not bypass_cache:
+                hit = cache_get(endpoint, key)
+                if hit is not MISS:
+                    return hit
+
+            result = func(*args, **kwargs)
+
+            if _is_cacheable(result):
+                cache_set(endpoint, key, result, ttl)
+
+            return result
+
+        return wrapper
+
+    return decorator
@@ -13,18 +13,28 @@ import streamlit as st
 import sys
 import os
 import json
+import hashlib
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from seo_functions import (
-    fetch_linkedin_posts,
+    fetch_linkedin_posts_incremental,
+    linkedin_analysis_posts,
     get_credential,
     save_company_analysis,
-    save_linkedin_posts_to_db,
     get_company_analysis,
-    get_company_competitors
+    get_company_competitors,
+    get_research_checkpoints,
+    research_checkpoints_enabled
 )
 from ai_analysis import analyze_company_complete
+from write_queue import queue_company_analysis, queue_linkedin_posts, flush as flush_writes
+from job_runner import submit_job, get_job, list_jobs, is_active
+
+JOB_POLL_INTERVAL = 2  # seconds between job panel refreshes while a research job is running
+RESEARCH_ANALYSIS_MODEL = "anthropic/claude-haiku-4.5"
+DEFAULT_STAGE_TTL_HOURS = 24.0
 
 def render_company_research_app():
     """Main function to render the Company Research app."""
@@ -35,6 +45,9 @@ def render_company_research_app():
     # Initialize session state for storing research results
     if "research_results" not in st.session_state:
         st.session_state.research_results = None
+    if "research_job_id" not in st.session_state:
+        # A job ID in the URL reattaches a new session to that job
+        st.session_state.research_job_id = st.query_params.get("research_job")
 
     # Create tabs
     tab1, tab2 = st.tabs(["📝 Input & Research", "📊 Final Report"])
@@ -93,7 +106,7 @@ def render_company_research_app():
             - Competitor analysis
 
             **LinkedIn Data** (RapidAPI):
-            - 50 recent company posts
+            - Up to 100 recent company posts
             - Engagement metrics
             - Content themes
 
@@ -102,6 +115,25 @@ def render_company_research_app():
             - Generates comprehensive Company Intelligence Report
             """)
 
+        # Stages finished recently with the same inputs are skipped; pick any to redo anyway
+        force_stages = []
+        if research_checkpoints_enabled():
+            stage_options = {
+                "grok": "Grok web research",
+                "claude": "Claude web research",
+                "linkedin": "LinkedIn analysis",
+                "synthesis": "Final synthesis"
+            }
+            for url in [u.strip() for u in competitor_urls.strip().split('\n') if u.strip()]:
+                stage_options[url] = f"Competitor: {url.rstrip('/').split('/')[-1]}"
+
+            force_stages = st.multiselect(
+                "Force refresh",
+                options=list(stage_options),
+                format_func=stage_options.get,
+                help=f"Stages completed in the last {research_stage_ttl_hours():g} hours are reused unless selected here"
+            )
+
         # Research button
         if st.button("🚀 Start Research", type="primary", use_container_width=True):
             if not company_url.strip():
@@ -117,182 +149,43 @@ def render_company_research_app():
                 # Extract company name from URL
                 company_name = company_url.replace('https://', '').replace('http://', '').split('/')[0].split('.')[0].title()
 
-                st.success(f"✅ Starting multi-source research for **{company_name}**")
-
-                # ==============================================================
-                # STEP 0: CREATE INITIAL DATABASE RECORD
-                # ==============================================================
-                with st.spinner("💾 Initializing database record..."):
-                    save_success = save_company_analysis({
-                        'company_url': linkedin_url,  # Use linkedin_url as company_url for compatibility
-                        'linkedin_company_url': linkedin_url,
-                        'website_url': company_url,
-                        'company_name': company_name,
-                        'research_type': 'primary',
-                        'competitor_of': None
-                    })
-                    if save_success:
-                        st.success("✅ Database record created")
-                    else:
-                        st.error("❌ Failed to create database record - check server logs")
-                        st.stop()
-
-                # ==============================================================
-                # STEP 1: GROK RESEARCH
-                # ==============================================================
-                with st.spinner("🤖 Grok: Running agentic web + X search..."):
-                    grok_result = run_grok_research(
-                        company_url=company_url,
-                        company_name=company_name,
-                        competitors=competitors
-                    )
-
-                if grok_result.get("error"):
-                    st.warning(f"⚠️ Grok search error: {grok_result['error']}")
-                else:
-                    # Save to DB immediately
-                    save_company_analysis({
-                        'company_url': linkedin_url,
-                        'linkedin_company_url': linkedin_url,
-                        'grok_research': grok_result
-                    })
-                    st.success(f"✅ Grok research complete and saved ({grok_result.get('total_tokens', 0)} tokens)")
-
-                # ==============================================================
-                # STEP 2: CLAUDE RESEARCH
-                # ==============================================================
-                with st.spinner("🔍 Claude: Running web fetch + search..."):
-                    claude_result = run_claude_research(
-                        company_url=company_url,
-                        company_name=company_name,
-                        competitors=competitors
-                    )
-
-                if claude_result.get("error"):
-                    st.warning(f"⚠️ Claude search error: {claude_result['error']}")
-                else:
-                    # Save to DB immediately
-                    save_company_analysis({
-                        'company_url': linkedin_url,
-                        'linkedin_company_url': linkedin_url,
-                        'claude_research': claude_result
-                    })
-                    st.success(f"✅ Claude research complete and saved ({claude_result.get('total_tokens', 0)} tokens)")
-
-                # ==============================================================
-                # STEP 3: LINKEDIN DATA
-                # ==============================================================
-                with st.spinner("📊 Fetching LinkedIn posts via RapidAPI..."):
-                    linkedin_result = fetch_linkedin_posts(linkedin_url)
-
-                if linkedin_result.get("error"):
-                    st.warning(f"⚠️ LinkedIn error: {linkedin_result['error']}")
-                else:
-                    posts_data = linkedin_result.get("data", {}).get("data", [])
-                    st.success(f"✅ LinkedIn data fetched ({len(posts_data)} posts)")
-
-                    # Save raw LinkedIn posts to DB
-                    save_linkedin_posts_to_db(linkedin_url, linkedin_result.get("raw_response", {}))
-
-                    # Run AI analysis on LinkedIn posts
-                    if posts_data:
-                        with st.spinner("🤖 Analyzing LinkedIn posts with AI..."):
-                            linkedin_analysis = analyze_company_complete(
-                                posts_data,
-                                company_name,
-                                linkedin_url,
-                                "anthropic/claude-haiku-4.5"
-                            )
-
-                            # Save LinkedIn analysis to DB immediately
-                            save_company_analysis({
-                                'company_url': linkedin_url,
-                                'linkedin_company_url': linkedin_url,
-                                'voice_profile': linkedin_analysis.get('voice_profile', {}),
-                                'content_pillars': linkedin_analysis.get('content_pillars', {}),
-                                'engagement_metrics': linkedin_analysis.get('engagement_metrics', {}),
-                                'top_posts': linkedin_analysis.get('top_posts', []),
-                                'posts_analyzed': linkedin_analysis.get('posts_analyzed', 0),
-                                'date_range': linkedin_analysis.get('date_range', ''),
-                                'analysis_model': linkedin_analysis.get('analysis_model', '')
-                            })
-                            st.success("✅ LinkedIn analysis complete and saved")
-
-                # ==============================================================
-                # STEP 3B: COMPETITOR LINKEDIN SCRAPING
-                # ==============================================================
-                if competitors:
-                    st.markdown(f"### 🔍 Analyzing {len(competitors)} Competitor(s)")
-                    st.info(f"💡 Scraping and analyzing LinkedIn data for {len(competitors)} competitors...")
-
-                    for idx, competitor_url in enumerate(competitors, 1):
-                        with st.spinner(f"📊 Competitor {idx}/{len(competitors)}: Fetching LinkedIn posts..."):
-                            competitor_result = fetch_linkedin_posts(competitor_url)
-
-                        if competitor_result.get("error"):
-                            st.warning(f"⚠️ Competitor {idx} LinkedIn error: {competitor_result['error']}")
-                            continue
-
-                        # Extract competitor name from URL
-                        competitor_name = competitor_url.rstrip('/').split('/')[-1].replace('-', ' ').title()
-
-                        competitor_posts = competitor_result.get("data", {}).get("data", [])
-                        if not competitor_posts:
-                            st.warning(f"⚠️ No posts found for competitor {idx}")
-                            continue
-
-                        st.success(f"✅ Competitor {idx} ({competitor_name}): {len(competitor_posts)} posts fetched")
-
-                        # Save raw competitor posts to DB
-                        save_linkedin_posts_to_db(competitor_url, competitor_result.get("raw_response", {}))
-
-                        # Run AI analysis on competitor posts
-                        with st.spinner(f"🤖 Competitor {idx}: Analyzing with AI..."):
-                            competitor_analysis = analyze_company_complete(
-                                competitor_posts,
-                                competitor_name,
-                                competitor_url,
-                                "anthropic/claude-haiku-4.5"
-                            )
-
-                        # Save competitor analysis to DB
-                        competitor_data = {
-                            'company_url': competitor_url,  # Use competitor linkedin_url as company_url
-                            'linkedin_company_url': competitor_url,
-                            'company_name': competitor_name,
-                            'research_type': 'competitor',
-                            'competitor_of': linkedin_url,  # Reference to main company's linkedin_company_url
-                            'website_url': None,
-                            'voice_profile': competitor_analysis.get('voice_profile', {}),
-                            'content_pillars': competitor_analysis.get('content_pillars', {}),
-                            'engagement_metrics': competitor_analysis.get('engagement_metrics', {}),
-                            'top_posts': competitor_analysis.get('top_posts', []),
-                            'posts_analyzed': competitor_analysis.get('posts_analyzed', 0),
-                            'date_range': competitor_analysis.get('date_range', ''),
-                            'analysis_model': competitor_analysis.get('analysis_model', '')
-                        }
-
-                        save_company_analysis(competitor_data)
-                        st.success(f"✅ Competitor {idx} ({competitor_name}) saved to database")
-
-                # ==============================================================
-                # STEP 4: SYNTHESIS (from DB)
-                # ==============================================================
-                with st.spinner("🧠 Claude: Synthesizing all sources from database into final report..."):
-                    final_report = synthesize_company_report(
-                        company_name=company_name,
-                        company_url=company_url,
-                        linkedin_url=linkedin_url
-                    )
-
-                if final_report.get("error"):
-                    st.error(f"❌ Synthesis failed: {final_report['error']}")
-                else:
-                    st.session_state.research_results = final_report
-                    st.success("✅ Company Intelligence Report complete!")
-                    st.balloons()
-
-                    st.info("👉 View final report in **'Final Report'** tab")
+                # Runs on the shared job pool: reruns and navigation don't interrupt it, and
+                # starting the same research again reattaches to the running job
+                job_id = submit_job(
+                    "company_research",
+                    run_company_research,
+                    company_url,
+                    company_name,
+                    linkedin_url,
+                    competitors,
+                    key=linkedin_url,
+                    label=company_name,
+                    force_stages=force_stages
+                )
+                st.session_state.research_job_id = job_id
+                st.session_state.research_results = None
+                st.query_params["research_job"] = job_id
+
+        # Reattach to a running or finished job (from another session, or after a reload)
+        with st.expander("🔁 Reattach to a research job"):
+            recent_jobs = list_jobs("company_research", limit=10)
+            if not recent_jobs:
+                st.caption("No research jobs yet")
+            for job in recent_jobs:
+                job_col, state_col, open_col = st.columns([3, 1, 1])
+                job_col.markdown(f"**{job['label']}** `{job['id']}`")
+                state_col.caption(job['state'])
+                if open_col.button("Open", key=f"open_research_job_{job['id']}"):
+                    st.session_state.research_job_id = job['id']
+                    st.session_state.research_results = None
+                    st.query_params["research_job"] = job['id']
+                    st.rerun()
+
+        if st.session_state.research_job_id:
+            if is_active(get_job(st.session_state.research_job_id)):
+                _poll_research_job(st.session_state.research_job_id)
+            else:
+                _render_research_job(st.session_state.research_job_id)
 
     # ========================================================================
     # TAB 2: FINAL REPORT
@@ -322,6 +215,461 @@ def render_company_research_app():
                 )
 
 
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def _poll_research_job(job_id: str) -> None:
+    """Refresh only the job panel while the job runs; rerun the whole page once it finishes."""
+    if not _render_research_job(job_id):
+        # The Final Report tab picks up the result on this one full rerun
+        st.rerun()
+
+
+def _render_research_job(job_id: str) -> bool:
+    """
+    Show a research job's progress and pick up its report when finished.
+
+    Returns:
+        True while the job is still running (caller should poll)
+    """
+    job = get_job(job_id)
+
+    if not job:
+        st.warning(f"⚠️ Research job `{job_id}` not found")
+        return False
+
+    st.markdown(f"#### Research: **{job['label']}**")
+    st.caption(f"Job ID: `{job['id']}` - add `&research_job={job['id']}` to this page's URL to follow it from another session")
+    st.progress(job['progress'] or 0.0)
+
+    for event in job['events']:
+        if event.get("status") == "success":
+            st.success(event["message"])
+        elif event.get("status") == "warning":
+            st.warning(event["message"])
+        elif event.get("message"):
+            st.info(event["message"])
+
+    if is_active(job):
+        st.info("⏳ Research is running in the background - you can leave this page and come back")
+        return True
+
+    if job['state'] != "done":
+        st.error(f"❌ Research job {job['state']}: {job.get('error') or 'unknown error'}")
+        return False
+
+    final_report = job['result'] or {}
+    if final_report.get("error"):
+        st.error(f"❌ Synthesis failed: {final_report['error']}")
+    elif st.session_state.research_results is None:
+        st.session_state.research_results = final_report
+        st.success("✅ Company Intelligence Report complete!")
+        st.balloons()
+        st.info("👉 View final report in **'Final Report'** tab")
+    else:
+        st.success("✅ Company Intelligence Report complete!")
+
+    return False
+
+
+# =============================================================================
+# RESEARCH ORCHESTRATION
+# =============================================================================
+
+def _research_grok(
+    company_url: str,
+    company_name: str,
+    linkedin_url: str,
+    competitors: list,
+    input_hash: str = None
+) -> dict:
+    """Run Grok research and save it (with its checkpoint). Returns a completion event."""
+    grok_result = run_grok_research(
+        company_url=company_url,
+        company_name=company_name,
+        competitors=competitors
+    )
+
+    if grok_result.get("error"):
+        return {"source": "grok", "status": "warning", "message": f"⚠️ Grok search error: {grok_result['error']}"}
+
+    checkpoint = _new_checkpoint(input_hash)
+    queue_company_analysis({
+        'company_url': linkedin_url,
+        'linkedin_company_url': linkedin_url,
+        'grok_research': grok_result,
+        **_checkpoint_fields("grok", checkpoint)
+    })
+    return {
+        "source": "grok",
+        "status": "success",
+        "checkpoint": checkpoint,
+        "message": f"✅ Grok research complete ({grok_result.get('total_tokens', 0)} tokens), saving in background"
+    }
+
+
+def _research_claude(
+    company_url: str,
+    company_name: str,
+    linkedin_url: str,
+    competitors: list,
+    input_hash: str = None
+) -> dict:
+    """Run Claude research and save it (with its checkpoint). Returns a completion event."""
+    claude_result = run_claude_research(
+        company_url=company_url,
+        company_name=company_name,
+        competitors=competitors
+    )
+
+    if claude_result.get("error"):
+        return {"source": "claude", "status": "warning", "message": f"⚠️ Claude search error: {claude_result['error']}"}
+
+    checkpoint = _new_checkpoint(input_hash)
+    queue_company_analysis({
+        'company_url': linkedin_url,
+        'linkedin_company_url': linkedin_url,
+        'claude_research': claude_result,
+        **_checkpoint_fields("claude", checkpoint)
+    })
+    return {
+        "source": "claude",
+        "status": "success",
+        "checkpoint": checkpoint,
+        "message": (
+            f"✅ Claude research complete ({claude_result.get('total_tokens', 0)} tokens), saving in background"
+        )
+    }
+
+
+def _research_linkedin(company_name: str, linkedin_url: str, input_hash: str = None) -> dict:
+    """Fetch, analyze and save the main company's LinkedIn posts (with checkpoint). Returns a completion event."""
+    linkedin_result = fetch_linkedin_posts_incremental(linkedin_url)
+
+    if linkedin_result.get("error"):
+        return {"source": "linkedin", "status": "warning", "message": f"⚠️ LinkedIn error: {linkedin_result['error']}"}
+
+    posts_data = linkedin_result.get("data", {}).get("data", [])
+
+    # Save only the newly fetched LinkedIn posts to DB
+    if linkedin_result.get("new_raw_response"):
+        queue_linkedin_posts(linkedin_url, linkedin_result["new_raw_response"])
+
+    if not posts_data:
+        return {"source": "linkedin", "status": "success", "message": "✅ LinkedIn data fetched (0 posts)"}
+
+    linkedin_analysis = analyze_company_complete(
+        linkedin_analysis_posts(posts_data),
+        company_name,
+        linkedin_url,
+        RESEARCH_ANALYSIS_MODEL,
+        use_cache=True
+    )
+
+    checkpoint = _new_checkpoint(input_hash)
+    queue_company_analysis({
+        'company_url': linkedin_url,
+        'linkedin_company_url': linkedin_url,
+        'voice_profile': linkedin_analysis.get('voice_profile', {}),
+        'content_pillars': linkedin_analysis.get('content_pillars', {}),
+        'engagement_metrics': linkedin_analysis.get('engagement_metrics', {}),
+        'top_posts': linkedin_analysis.get('top_posts', []),
+        'posts_analyzed': linkedin_analysis.get('posts_analyzed', 0),
+        'date_range': linkedin_analysis.get('date_range', ''),
+        'analysis_model': linkedin_analysis.get('analysis_model', ''),
+        **_checkpoint_fields("linkedin", checkpoint)
+    })
+    return {
+        "source": "linkedin",
+        "status": "success",
+        "checkpoint": checkpoint,
+        "message": f"✅ LinkedIn data fetched ({len(posts_data)} posts), analysis complete, saving in background"
+    }
+
+
+def _research_competitor(idx: int, competitor_url: str, linkedin_url: str, input_hash: str = None) -> dict:
+    """Fetch, analyze and save one competitor's LinkedIn posts (with checkpoint). Returns a completion event."""
+    source = f"competitor_{idx}"
+
+    competitor_result = fetch_linkedin_posts_incremental(competitor_url)
+
+    if competitor_result.get("error"):
+        return {"source": source, "status": "warning", "message": f"⚠️ Competitor {idx} LinkedIn error: {competitor_result['error']}"}
+
+    # Extract competitor name from URL
+    competitor_name = competitor_url.rstrip('/').split('/')[-1].replace('-', ' ').title()
+
+    competitor_posts = competitor_result.get("data", {}).get("data", [])
+    if not competitor_posts:
+        return {"source": source, "status": "warning", "message": f"⚠️ No posts found for competitor {idx}"}
+
+    # Save only the newly fetched competitor posts to DB
+    if competitor_result.get("new_raw_response"):
+        queue_linkedin_posts(competitor_url, competitor_result["new_raw_response"])
+
+    competitor_analysis = analyze_company_complete(
+        linkedin_analysis_posts(competitor_posts),
+        competitor_name,
+        competitor_url,
+        RESEARCH_ANALYSIS_MODEL,
+        use_cache=True
+    )
+
+    checkpoint = _new_checkpoint(input_hash)
+
+    competitor_data = {
+        'company_url': competitor_url,  # Use competitor linkedin_url as company_url
+        'linkedin_company_url': competitor_url,
+        'company_name': competitor_name,
+        'research_type': 'competitor',
+        'competitor_of': linkedin_url,  # Reference to main company's linkedin_company_url
+        'website_url': None,
+        'voice_profile': competitor_analysis.get('voice_profile', {}),
+        'content_pillars': competitor_analysis.get('content_pillars', {}),
+        'engagement_metrics': competitor_analysis.get('engagement_metrics', {}),
+        'top_posts': competitor_analysis.get('top_posts', []),
+        'posts_analyzed': competitor_analysis.get('posts_analyzed', 0),
+        'date_range': competitor_analysis.get('date_range', ''),
+        'analysis_model': competitor_analysis.get('analysis_model', ''),
+        **_checkpoint_fields("linkedin", checkpoint)
+    }
+
+    queue_company_analysis(competitor_data)
+    return {
+        "source": source,
+        "status": "success",
+        "checkpoint": checkpoint,
+        "message": f"✅ Competitor {idx} ({competitor_name}): {len(competitor_posts)} posts analyzed, saving in background"
+    }
+
+
+def research_stage_ttl_hours() -> float:
+    """Hours a completed research stage stays fresh (RESEARCH_STAGE_TTL_HOURS, default 24; 0 disables skipping)."""
+    try:
+        return float(get_credential("RESEARCH_STAGE_TTL_HOURS", DEFAULT_STAGE_TTL_HOURS))
+    except (TypeError, ValueError):
+        return DEFAULT_STAGE_TTL_HOURS
+
+
+def _stage_hash(*inputs) -> str:
+    """Hash of everything a stage's output depends on."""
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def _new_checkpoint(input_hash: str) -> dict:
+    """Checkpoint recorded when a stage completes (None when checkpoints are off)."""
+    if input_hash is None:
+        return None
+    return {"completed_at": datetime.utcnow().isoformat(), "input_hash": input_hash}
+
+
+def _checkpoint_fields(stage: str, checkpoint: dict) -> dict:
+    """Checkpoint column to save alongside a stage's output, if any."""
+    return {f"{stage}_checkpoint": checkpoint} if checkpoint else {}
+
+
+def _is_fresh(checkpoint: dict, input_hash: str, ttl_hours: float) -> bool:
+    """True if the stage completed with the same inputs within the TTL."""
+    if not checkpoint or ttl_hours <= 0 or checkpoint.get("input_hash") != input_hash:
+        return False
+    try:
+        completed_at = datetime.fromisoformat(checkpoint["completed_at"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    return (datetime.utcnow() - completed_at).total_seconds() < ttl_hours * 3600
+
+
+def run_company_research(
+    company_url: str,
+    company_name: str,
+    linkedin_url: str,
+    competitors: list,
+    progress,
+    force_stages: list = None
+) -> dict:
+    """
+    Full research pipeline, run as a background job (see job_runner.submit_job).
+
+    Creates the database record, runs every source concurrently, then
+    synthesizes the report from the database.
+
+    With RESEARCH_CHECKPOINTS enabled, each stage saves a completion time and
+    input hash with its output. Stages that completed with the same inputs
+    within RESEARCH_STAGE_TTL_HOURS are skipped, so a re-run only redoes
+    stale, failed or forced stages (and synthesis, if anything it reads changed).
+
+    Args:
+        company_url: Company website URL
+        company_name: Company name
+        linkedin_url: Company LinkedIn URL
+        competitors: Competitor LinkedIn URLs
+        progress: Job progress callback(message, fraction, **event)
+        force_stages: Stage IDs to re-run even if fresh: "grok", "claude",
+                      "linkedin", "synthesis" or a competitor URL
+
+    Returns:
+        Final report dict from synthesize_company_report(), or {"error": str}
+    """
+    progress(f"💾 Initializing database record for {company_name}...", 0.02)
+
+    save_success = save_company_analysis({
+        'company_url': linkedin_url,  # Use linkedin_url as company_url for compatibility
+        'linkedin_company_url': linkedin_url,
+        'website_url': company_url,
+        'company_name': company_name,
+        'research_type': 'primary',
+        'competitor_of': None
+    })
+    if not save_success:
+        return {"error": "Failed to create database record - check server logs"}
+
+    progress("✅ Database record created", 0.05, status="success")
+
+    # Decide which stages are still fresh
+    force = set(force_stages or [])
+    checkpoints_enabled = research_checkpoints_enabled()
+    ttl_hours = research_stage_ttl_hours()
+
+    input_hashes = {}
+    if checkpoints_enabled:
+        input_hashes = {
+            "grok": _stage_hash("grok", company_url, company_name, linkedin_url, sorted(competitors)),
+            "claude": _stage_hash("claude", company_url, company_name, linkedin_url, sorted(competitors)),
+            "linkedin": _stage_hash("linkedin", linkedin_url, RESEARCH_ANALYSIS_MODEL),
+            **{url: _stage_hash("linkedin", url, RESEARCH_ANALYSIS_MODEL) for url in competitors}
+        }
+
+    stored = get_research_checkpoints([linkedin_url] + competitors)
+    stage_labels = {"grok": "Grok research", "claude": "Claude research", "linkedin": "LinkedIn analysis"}
+    stage_labels.update({url: f"Competitor {idx}" for idx, url in enumerate(competitors, 1)})
+
+    skip = set()
+    checkpoints = {}
+    for stage, label in stage_labels.items():
+        # Main-company stages live on the main row; each competitor has its own row
+        if stage in ("grok", "claude", "linkedin"):
+            row = stored.get(linkedin_url, {})
+            checkpoint = row.get(stage)
+        else:
+            row = stored.get(stage, {})
+            checkpoint = row.get("linkedin")
+
+        if stage not in force and _is_fresh(checkpoint, input_hashes.get(stage), ttl_hours):
+            skip.add(stage)
+            checkpoints[stage] = checkpoint
+            progress(f"⏭️ {label} is up to date (completed {checkpoint['completed_at'][:16]} UTC), skipped", status="success")
+
+            # A fresh competitor may last have been researched for another company
+            if stage in competitors and row.get("competitor_of") != linkedin_url:
+                queue_company_analysis({
+                    'company_url': stage,
+                    'linkedin_company_url': stage,
+                    'research_type': 'competitor',
+                    'competitor_of': linkedin_url
+                })
+
+    to_run = [stage for stage in stage_labels if stage not in skip]
+    if competitors:
+        progress(f"💡 Researching {len(competitors)} competitor(s) alongside the main company...", 0.05)
+
+    for done, event in enumerate(run_research_sources(
+        company_url=company_url,
+        company_name=company_name,
+        linkedin_url=linkedin_url,
+        competitors=competitors,
+        skip=skip,
+        input_hashes=input_hashes
+    ), 1):
+        if event.get("checkpoint"):
+            checkpoints[event["stage"]] = event["checkpoint"]
+        progress(event["message"], 0.05 + 0.8 * done / max(len(to_run), 1), source=event["source"], status=event["status"])
+
+    # Synthesis depends on every upstream stage: re-run it whenever one of them re-ran or failed
+    synthesis_hash = None
+    if checkpoints_enabled:
+        synthesis_hash = _stage_hash(
+            "synthesis", company_name, company_url, linkedin_url,
+            [(stage, (checkpoints.get(stage) or {}).get("completed_at")) for stage in stage_labels]
+        )
+
+        if "synthesis" not in force and _is_fresh(stored.get(linkedin_url, {}).get("synthesis"), synthesis_hash, ttl_hours):
+            stored_report = get_company_analysis(linkedin_company_url=linkedin_url).get("synthesis_report")
+            if stored_report and not stored_report.get("error"):
+                progress("⏭️ Synthesis is up to date, using the saved report", 0.95, status="success")
+                return dict(stored_report, from_checkpoint=True)
+
+    progress("🧠 Claude: Synthesizing all sources from database into final report...", 0.9)
+
+    final_report = synthesize_company_report(
+        company_name=company_name,
+        company_url=company_url,
+        linkedin_url=linkedin_url
+    )
+
+    checkpoint = _new_checkpoint(synthesis_hash)
+    if checkpoint and not final_report.get("error"):
+        queue_company_analysis({
+            'company_url': linkedin_url,
+            'linkedin_company_url': linkedin_url,
+            'synthesis_report': final_report,
+            **_checkpoint_fields("synthesis", checkpoint)
+        })
+
+    return final_report
+
+
+def run_research_sources(
+    company_url: str,
+    company_name: str,
+    linkedin_url: str,
+    competitors: list,
+    max_workers: int = 8,
+    skip: set = None,
+    input_hashes: dict = None
+):
+    """
+    Run Grok, Claude, the main LinkedIn analysis and every competitor concurrently.
+
+    Each source saves its own results to the database. The initial database
+    record must already exist so concurrent saves only update it.
+
+    Args:
+        skip: Stage IDs not to run ("grok", "claude", "linkedin" or a competitor URL)
+        input_hashes: {stage ID: input hash} saved with each stage's checkpoint
+
+    Yields:
+        Completion event dicts ({"source", "stage", "status", "message", "checkpoint"})
+        as each source finishes. Synthesis can start once the generator is exhausted.
+    """
+    skip = skip or set()
+    input_hashes = input_hashes or {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        if "grok" not in skip:
+            futures[executor.submit(
+                _research_grok, company_url, company_name, linkedin_url, competitors, input_hashes.get("grok")
+            )] = ("grok", "grok")
+        if "claude" not in skip:
+            futures[executor.submit(
+                _research_claude, company_url, company_name, linkedin_url, competitors, input_hashes.get("claude")
+            )] = ("claude", "claude")
+        if "linkedin" not in skip:
+            futures[executor.submit(
+                _research_linkedin, company_name, linkedin_url, input_hashes.get("linkedin")
+            )] = ("linkedin", "linkedin")
+        for idx, competitor_url in enumerate(competitors, 1):
+            if competitor_url not in skip:
+                futures[executor.submit(
+                    _research_competitor, idx, competitor_url, linkedin_url, input_hashes.get(competitor_url)
+                )] = (f"competitor_{idx}", competitor_url)
+
+        for future in as_completed(futures):
+            source, stage = futures[future]
+            try:
+                yield dict(future.result(), stage=stage)
+            except Exception as e:
+                yield {"source": source, "stage": stage, "status": "warning", "message": f"⚠️ {source} failed: {str(e)}"}
+
+
 # =============================================================================
 # RESEARCH FUNCTIONS
 # =============================================================================
@@ -403,10 +751,85 @@ Use both web search and X search to gather comprehensive information."""
         return {"error": str(e)}
 
 
+# Static instructions sent as the system prompt; only the company-specific
+# user message changes between runs. Both are below Anthropic's 1024-token
+# prompt-cache minimum, so they are not marked for caching.
+CLAUDE_RESEARCH_INSTRUCTIONS = """You are a company research analyst. Research the company the user names comprehensively using web fetch and web search.
+
+Please analyze:
+1. Fetch the company website and extract: mission statement, core values, products/services, team information, recent blog posts
+2. Search for industry reports and trends related to this company's sector
+3. Find discussions on Reddit, Quora, or forums about this company or industry
+4. Research competitors and their positioning
+5. Identify gaps, opportunities, and strategic insights
+
+Provide a detailed analysis with citations."""
+
+SYNTHESIS_INSTRUCTIONS = """You are a strategic business analyst creating a comprehensive Company Intelligence Report.
+
+The user will provide structured research data from multiple AI sources and LinkedIn analysis. Synthesize this into a comprehensive intelligence report.
+
+Create a comprehensive report with the following sections:
+
+## 1. Company Overview
+- Mission statement and core values
+- Products/services offered
+- Current marketing messaging
+- Team/leadership information
+- Company stage and maturity
+
+## 2. Digital Presence Audit
+Platform-by-platform analysis:
+- Website presence and content quality
+- LinkedIn: follower count, engagement, posting frequency
+- X/Twitter: presence, followers, engagement, sentiment
+- Other social platforms (Instagram, Facebook, TikTok if found)
+- Overall digital footprint assessment
+
+## 3. Competitive Landscape Analysis
+- Direct competitors identified
+- Competitive positioning
+- Competitor social strategies
+- Market differentiation
+
+## 4. Industry Trends & Opportunities
+- Current industry trends
+- Emerging topics and discussions
+- Thought leaders in this space
+- Common pain points
+
+## 5. Key Gaps & Opportunities Identified
+- Content gaps
+- Untapped platforms
+- Strategic opportunities
+- Recommended focus areas
+
+---
+
+**FORMATTING REQUIREMENTS:**
+- Use markdown formatting
+- Include specific data points and metrics where available
+- Cite sources when making claims
+- Be specific and actionable
+- Highlight key insights with bullet points
+- Use headers and subheaders for clear structure"""
+
+
+def _total_tokens(response) -> int:
+    """Input plus output tokens from an Anthropic response (0 when usage is missing)."""
+    usage = getattr(response, 'usage', None)
+    if not usage:
+        return 0
+    return usage.input_tokens + usage.output_tokens
+
+
 def run_claude_research(company_url: str, company_name: str, competitors: list) -> dict:
     """
     Run Claude web research (fetch + search) for company intel.
 
+    The static instructions are the system prompt; only the company and
+    competitor list are sent as the user message.
+
     Returns:
         dict with 'response', 'citations', 'total_tokens', or 'error'
     """
@@ -428,21 +851,13 @@ def run_claude_research(company_url: str, company_name: str, competitors: list)
             if valid_competitors:
                 competitor_text = f"\n\nKey competitors to analyze:\n" + "\n".join(f"- {comp}" for comp in valid_competitors)
 
-        research_prompt = f"""Research {company_name} ({company_url}) comprehensively using web fetch and web search.{competitor_text}
-
-Please analyze:
-1. Fetch the company website and extract: mission statement, core values, products/services, team information, recent blog posts
-2. Search for industry reports and trends related to this company's sector
-3. Find discussions on Reddit, Quora, or forums about this company or industry
-4. Research competitors and their positioning
-5. Identify gaps, opportunities, and strategic insights
-
-Provide a detailed analysis with citations."""
+        research_prompt = f"Research {company_name} ({company_url}) comprehensively using web fetch and web search.{competitor_text}"
 
         # Call with web tools
         response = client.messages.create(
             model="claude-sonnet-4-5",
             max_tokens=4096,
+            system=CLAUDE_RESEARCH_INSTRUCTIONS,
             messages=[{
                 "role": "user",
                 "content": research_prompt
@@ -479,12 +894,10 @@ Provide a detailed analysis with citations."""
                     if hasattr(citation, 'url') and citation.url:
                         citations.append(citation.url)
 
-        total_tokens = response.usage.input_tokens + response.usage.output_tokens if hasattr(response, 'usage') else 0
-
         return {
             "response": response_text,
             "citations": list(set(citations)),  # Remove duplicates
-            "total_tokens": total_tokens,
+            "total_tokens": _total_tokens(response),
             "model": "claude-sonnet-4-5"
         }
 
@@ -503,7 +916,7 @@ def synthesize_company_report(
     Queries database for main company and competitors, builds structured context.
 
     Returns:
-        dict with 'report' (markdown) or 'error'
+        dict with 'report' (markdown), 'tokens_used', or 'error'
     """
     try:
         import anthropic
@@ -519,6 +932,10 @@ def synthesize_company_report(
         # QUERY DATABASE FOR STRUCTURED DATA
         # ==============================================================
 
+        # Research results are saved write-behind; make sure they have landed
+        if not flush_writes(timeout=60):
+            print("[SYNTHESIS] Warning: some research writes are still pending")
+
         # Get main company data
         print(f"[SYNTHESIS] Querying for main company with linkedin_url: {linkedin_url}")
         main_company = get_company_analysis(linkedin_company_url=linkedin_url)
@@ -587,15 +1004,11 @@ def synthesize_company_report(
   - Posts: {comp.get('posts_analyzed', 0)}
 """
 
-        # Build synthesis prompt
-        synthesis_prompt = f"""You are a strategic business analyst creating a comprehensive Company Intelligence Report.
-
-**Company:** {company_name}
+        # Company-specific data only; the report instructions are the system prompt
+        synthesis_prompt = f"""**Company:** {company_name}
 **Website:** {company_url}
 **LinkedIn:** {linkedin_url}
 
-You have structured research data from multiple AI sources and LinkedIn analysis. Synthesize this into a comprehensive intelligence report.
-
 ---
 
 **GROK RESEARCH (Web + X Search):**
@@ -612,57 +1025,13 @@ You have structured research data from multiple AI sources and LinkedIn analysis
 
 ---
 
-Create a comprehensive report with the following sections:
-
-## 1. Company Overview
-- Mission statement and core values
-- Products/services offered
-- Current marketing messaging
-- Team/leadership information
-- Company stage and maturity
-
-## 2. Digital Presence Audit
-Platform-by-platform analysis:
-- Website presence and content quality
-- LinkedIn: follower count, engagement, posting frequency
-- X/Twitter: presence, followers, engagement, sentiment
-- Other social platforms (Instagram, Facebook, TikTok if found)
-- Overall digital footprint assessment
-
-## 3. Competitive Landscape Analysis
-- Direct competitors identified
-- Competitive positioning
-- Competitor social strategies
-- Market differentiation
-
-## 4. Industry Trends & Opportunities
-- Current industry trends
-- Emerging topics and discussions
-- Thought leaders in this space
-- Common pain points
-
-## 5. Key Gaps & Opportunities Identified
-- Content gaps
-- Untapped platforms
-- Strategic opportunities
-- Recommended focus areas
-
----
-
-**FORMATTING REQUIREMENTS:**
-- Use markdown formatting
-- Include specific data points and metrics where available
-- Cite sources when making claims
-- Be specific and actionable
-- Highlight key insights with bullet points
-- Use headers and subheaders for clear structure
-
 Generate the complete report now."""
 
         # Call Claude for synthesis
         response = client.messages.create(
             model="claude-sonnet-4-5",
             max_tokens=16000,
+            system=SYNTHESIS_INSTRUCTIONS,
             messages=[{
                 "role": "user",
                 "content": synthesis_prompt
@@ -677,7 +1046,7 @@ Generate the complete report now."""
 
         return {
             "report": report_text,
-            "tokens_used": response.usage.input_tokens + response.usage.output_tokens if hasattr(response, 'usage') else 0
+            "tokens_used": _total_tokens(response)
         }
 
     except Exception as e:
@@ -7,6 +7,8 @@ Analyzes Google Ads campaigns for any domain using DataForSEO SERP API
 import streamlit as st
 import os
 import requests
+import http_client
+from api_cache import cached
 import pandas as pd
 from typing import Dict, Any, Optional
 import base64
@@ -21,6 +23,7 @@ def get_credential(key: str, default=None):
         return os.environ.get(key, default)
 
 
+@cached("ads_search")
 def get_google_ads_data(domain: str, location_code: int = 2840, limit: int = 100) -> Optional[Dict[str, Any]]:
     """
     Get Google Ads creatives for a domain using DataForSEO SERP API.
@@ -65,7 +68,7 @@ def get_google_ads_data(domain: str, location_code: int = 2840, limit: int = 100
     ]
 
     try:
-        response = requests.post(url, json=payload, headers=headers)
+        response = http_client.post(url, json=payload, headers=headers)
         response.raise_for_status()
 
         data = response.json()
@@ -11,10 +11,10 @@ import plotly.graph_objects as go
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from seo_functions import (
-    get_keyword_data, get_keyword_suggestions, get_keywords_for_site,
-    calculate_opportunity_score, detect_seasonality,
-    calculate_growth_rate, generate_recommendation, save_keywords_to_db
+    get_keyword_data_bulk, get_keyword_suggestions, get_keywords_for_site,
+    enrich_keywords
 )
+from write_queue import queue_keywords
 
 def render_keywords_app():
     """Main function to render the Keyword Research app."""
@@ -155,26 +155,18 @@ def render_keywords_app():
                             all_keywords = response.get("keywords", [])
                             st.success(f"Found {len(all_keywords)} related keywords")
                     else:
-                        # Get data for each keyword
+                        # Get data for all keywords in batched requests
                         if len(keywords_list) > 1:
                             st.info(f"Fetching data for {len(keywords_list)} keywords...")
 
-                        progress_bar = st.progress(0) if len(keywords_list) > 1 else None
-
-                        for idx, keyword in enumerate(keywords_list):
-                            response = get_keyword_data(keyword)
-                            if response.get("error"):
-                                st.warning(f"⚠️ Failed to get data for '{keyword}': {response['error']}")
-                            else:
-                                result = response.get("result", {})
-                                if result:
-                                    all_keywords.append(result)
-
-                            if progress_bar:
-                                progress_bar.progress((idx + 1) / len(keywords_list))
+                        response = get_keyword_data_bulk(keywords_list)
+                        if response.get("error") and not response.get("results"):
+                            st.error(response['error'])
+                        else:
+                            all_keywords = list(response.get("results", {}).values())
 
-                        if progress_bar:
-                            progress_bar.empty()
+                        for keyword, error in response.get("errors", {}).items():
+                            st.warning(f"⚠️ Failed to get data for '{keyword}': {error}")
 
                         if all_keywords:
                             st.success(f"Successfully fetched data for {len(all_keywords)}/{len(keywords_list)} keywords")
@@ -189,25 +181,14 @@ def render_keywords_app():
 
                 # Process and enrich keyword data
                 if all_keywords:
-                    enriched_keywords = []
-                    for kw in all_keywords:
-                        kw_copy = kw.copy()
-                        kw_copy["opportunity_score"] = calculate_opportunity_score(kw)
-                        kw_copy["growth_rate"] = calculate_growth_rate(kw)
-                        seasonality = detect_seasonality(kw)
-                        kw_copy["is_seasonal"] = seasonality["is_seasonal"]
-                        kw_copy["peak_months"] = ", ".join(seasonality["peak_months"][:3])
-                        kw_copy["recommendation"] = generate_recommendation(kw)
-                        enriched_keywords.append(kw_copy)
+                    enriched_keywords = enrich_keywords(all_keywords)
 
                     st.session_state.keywords_data = enriched_keywords
                     st.session_state.selected_keywords = set()
 
-                    # Save to database
-                    if save_keywords_to_db(enriched_keywords):
-                        st.success(f"✅ Saved {len(enriched_keywords)} keywords to database")
-                    else:
-                        st.warning("⚠️ Failed to save to database, but data is still available in session")
+                    # Save to database in the background
+                    queue_keywords(enriched_keywords)
+                    st.success(f"✅ Saving {len(enriched_keywords)} keywords to database in the background")
 
     # SECTION 2: RESULTS
     if st.session_state.keywords_data:
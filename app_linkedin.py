@@ -17,17 +17,36 @@ import time
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from seo_functions import (
-    fetch_linkedin_posts,
+    fetch_linkedin_posts_incremental,
+    linkedin_analysis_posts,
     save_linkedin_posts_to_db,
     save_company_analysis,
     get_company_analysis,
-    get_all_company_analyses,
-    delete_company_analysis,
-    save_generated_posts
+    get_company_summaries,
+    get_company_analyses_by_id,
+    select_company_fields,
+    json_storage_mode,
+    delete_company_analysis
 )
-from ai_analysis import analyze_company_complete, generate_content
+from ai_analysis import analyze_company_complete, generate_content_variations
+from write_queue import queue_generated_posts
+from job_runner import submit_job, get_job, is_active
+from analytics_store import get_mirrored_company_analyses
 import pandas as pd
 
+JOB_POLL_INTERVAL = 2  # seconds between job panel refreshes while an onboarding job is running
+
+# JSON fields read for the My Clients health check (full analyses load on demand)
+CLIENT_HEALTH_PATHS = [
+    'voice_profile->overall_tone',
+    'voice_profile->consistency_score',
+    'voice_profile->error',
+    'content_pillars->primary_focus',
+    'content_pillars->error',
+    'engagement_metrics->avg_engagement',
+    'engagement_metrics->error'
+]
+
 def render_linkedin_app():
     """Main function to render the LinkedIn Analysis app."""
 
@@ -36,6 +55,10 @@ def render_linkedin_app():
     # Tabs for different sections
     tab1, tab2, tab3, tab4 = st.tabs(["➕ Onboard New Client", "👥 My Clients", "🔍 Competitor Comparison", "✍️ Content Creation"])
 
+    if "onboarding_job_id" not in st.session_state:
+        # A job ID in the URL reattaches a new session to that job
+        st.session_state.onboarding_job_id = st.query_params.get("onboarding_job")
+
     # Set smart defaults (always enabled)
     enable_analysis = True
     analysis_model = "anthropic/claude-haiku-4.5"
@@ -59,7 +82,7 @@ def render_linkedin_app():
             label_visibility="collapsed"
         )
 
-        st.info("**What happens:**\n- Scrapes 50 recent LinkedIn posts\n- Analyzes voice, tone, and writing style\n- Identifies content strategy and themes\n- Calculates engagement metrics\n- Saves data for content generation")
+        st.info("**What happens:**\n- Scrapes up to 100 recent LinkedIn posts (only new ones for existing clients)\n- Analyzes voice, tone, and writing style\n- Identifies content strategy and themes\n- Calculates engagement metrics\n- Saves data for content generation")
 
         onboard_button = st.button("🚀 Onboard Client", type="primary", use_container_width=True)
 
@@ -73,118 +96,23 @@ def render_linkedin_app():
                 # Extract company name
                 company_name = linkedin_url.split('/')[-2] if '/' in linkedin_url else "Unknown Client"
 
-                st.markdown(f"### 🚀 Onboarding **{company_name}**")
-                st.markdown("---")
-
-                # Progress tracking
-                progress_container = st.container()
-                results = {
-                    "posts": {"status": "pending", "data": None, "error": None},
-                    "voice": {"status": "pending", "data": None, "error": None},
-                    "strategy": {"status": "pending", "data": None, "error": None},
-                    "engagement": {"status": "pending", "data": None, "error": None}
-                }
-
-                # Step 1: Fetch LinkedIn posts
-                with progress_container:
-                    status_posts = st.empty()
-                    status_posts.info("📥 **Fetching LinkedIn posts...**")
-
-                response = fetch_linkedin_posts(linkedin_url)
-
-                if not response.get("error"):
-                    data = response.get("data", {})
-                    posts = data.get("data", [])
-                    save_linkedin_posts_to_db(linkedin_url, response.get("raw_response", {}))
-                    results["posts"]["status"] = "success"
-                    results["posts"]["data"] = posts
-                    status_posts.success(f"✅ **Fetched {len(posts)} LinkedIn posts**")
-
-                    # Step 2: Analyze with AI (voice, strategy, engagement)
-                    status_analysis = st.empty()
-                    status_analysis.info(f"🤖 **Analyzing {len(posts)} posts with AI...**")
-
-                    analysis_result = analyze_company_complete(
-                        posts_list=posts,
-                        company_name=company_name,
-                        company_url=linkedin_url,
-                        model=analysis_model
-                    )
-
-                    # Check individual analysis results
-                    voice_profile = analysis_result.get("voice_profile", {})
-                    content_pillars = analysis_result.get("content_pillars", {})
-                    engagement_metrics = analysis_result.get("engagement_metrics", {})
-
-                    if voice_profile.get("error"):
-                        results["voice"]["status"] = "failed"
-                        results["voice"]["error"] = voice_profile.get("error")
-                    else:
-                        results["voice"]["status"] = "success"
-                        results["voice"]["data"] = voice_profile
-
-                    if content_pillars.get("error"):
-                        results["strategy"]["status"] = "failed"
-                        results["strategy"]["error"] = content_pillars.get("error")
-                    else:
-                        results["strategy"]["status"] = "success"
-                        results["strategy"]["data"] = content_pillars
-
-                    if engagement_metrics.get("error"):
-                        results["engagement"]["status"] = "failed"
-                        results["engagement"]["error"] = engagement_metrics.get("error")
-                    else:
-                        results["engagement"]["status"] = "success"
-                        results["engagement"]["data"] = engagement_metrics
-
-                    # Save analysis
-                    save_company_analysis(analysis_result)
-
-                    # Update status for AI analysis
-                    ai_success_count = sum(1 for r in [results["voice"], results["strategy"], results["engagement"]] if r["status"] == "success")
-                    if ai_success_count == 3:
-                        status_analysis.success(f"✅ **AI analysis complete** (Voice, Strategy, Engagement)")
-                    elif ai_success_count > 0:
-                        status_analysis.warning(f"⚠️ **AI analysis partial** ({ai_success_count}/3 succeeded)")
-                    else:
-                        status_analysis.error(f"❌ **AI analysis failed** (all 3 analyses failed)")
-
-                    # Summary
-                    st.markdown("---")
-                    st.markdown("### 📊 Onboarding Summary")
-
-                    success_count = sum(1 for r in results.values() if r["status"] == "success")
-                    total_count = len(results)
-
-                    if success_count == total_count:
-                        st.success(f"🎉 **All analyses complete!** ({success_count}/{total_count})")
-                    elif success_count > 0:
-                        st.warning(f"⚠️ **Partial success** ({success_count}/{total_count} analyses succeeded)")
-                    else:
-                        st.error(f"❌ **Onboarding failed** (0/{total_count} analyses succeeded)")
-
-                    # Show failed analyses with errors
-                    failed_analyses = [(name, data) for name, data in results.items() if data["status"] == "failed"]
-                    if failed_analyses:
-                        st.markdown("#### ❌ Failed Analyses:")
-                        for name, data in failed_analyses:
-                            with st.expander(f"🔴 {name.replace('_', ' ').title()} - Click for details"):
-                                st.error(data["error"])
-                                st.caption("**Next steps:**")
-                                if "OpenRouter" in data["error"]:
-                                    st.info("• Check OPENROUTER_API_KEY in secrets\n• Verify you have credits at openrouter.ai\n• Try a different model")
-                                elif "DataForSEO" in data["error"]:
-                                    st.info("• Check DATAFORSEO credentials in secrets\n• Verify domain is valid\n• Check DataForSEO credits")
-                                elif "ChatGPT" in data["error"]:
-                                    st.info("• Check API configuration\n• Verify provider is accessible")
-
-                    st.info(f"👉 Go to **'My Clients'** tab to view full analysis for **{company_name}**")
+                # Runs on the shared job pool so reruns and navigation don't abort or repeat it
+                st.session_state.onboarding_job_id = submit_job(
+                    "linkedin_onboarding",
+                    run_client_onboarding,
+                    linkedin_url,
+                    company_name,
+                    analysis_model,
+                    key=linkedin_url,
+                    label=company_name
+                )
+                st.query_params["onboarding_job"] = st.session_state.onboarding_job_id
 
-                else:
-                    status_posts.error(f"❌ **Error fetching posts**: {response.get('error')}")
-                    st.error("⛔ Onboarding stopped - cannot proceed without LinkedIn posts")
-                    st.caption("**Next steps:**")
-                    st.info("• Check RAPIDAPI_KEY in secrets\n• Verify LinkedIn URL is correct\n• Check RapidAPI subscription status")
+        if st.session_state.onboarding_job_id:
+            if is_active(get_job(st.session_state.onboarding_job_id)):
+                _poll_onboarding_job(st.session_state.onboarding_job_id)
+            else:
+                _render_onboarding_job(st.session_state.onboarding_job_id)
 
     # ============================================================================
     # TAB 2: MY CLIENTS
@@ -193,31 +121,41 @@ def render_linkedin_app():
         st.markdown("### My Clients")
         st.caption("View and manage all onboarded clients")
 
-        # Load all clients
-        all_clients = get_all_company_analyses(limit=100)
+        # Cards need only summary rows plus the few JSON fields the health check reads;
+        # full analyses are fetched when a client's details are opened
+        client_summaries = get_company_summaries(limit=100)
 
-        if not all_clients:
+        if not client_summaries:
             st.info("📭 No clients yet. Go to 'Onboard New Client' to add your first client!")
         else:
-            st.write(f"**{len(all_clients)} clients onboarded**")
+            st.write(f"**{len(client_summaries)} clients onboarded**")
+
+            client_ids = [c.get('id') for c in client_summaries]
+            health_fields = {
+                row.get('id'): row
+                for row in select_company_fields(CLIENT_HEALTH_PATHS, company_ids=client_ids, limit=len(client_ids))
+            }
+
+            if 'client_details_ids' not in st.session_state:
+                st.session_state.client_details_ids = []
+            details_ids = [i for i in st.session_state.client_details_ids if i in client_ids]
+            client_details = {c.get('id'): c for c in get_company_analyses_by_id(details_ids)}
 
             # Display each client
-            for client in all_clients:
-                company_name = client.get('company_name', 'Unknown')
-                company_url = client.get('company_url', '')
-                posts_analyzed = client.get('posts_analyzed', 0)
-                updated_at = client.get('updated_at', '')[:10] if client.get('updated_at') else 'N/A'
+            for summary in client_summaries:
+                client_id = summary.get('id')
+                company_name = summary.get('company_name', 'Unknown')
+                company_url = summary.get('company_url', '')
+                posts_analyzed = summary.get('posts_analyzed') or 0
+                updated_at = summary.get('updated_at', '')[:10] if summary.get('updated_at') else 'N/A'
+                fields = health_fields.get(client_id, {})
 
                 # Calculate health status
-                voice_profile = client.get('voice_profile', {})
-                content_pillars = client.get('content_pillars', {})
-                engagement_metrics = client.get('engagement_metrics', {})
-
                 data_checks = {
                     "Posts": posts_analyzed > 0,
-                    "Voice": bool(voice_profile and not voice_profile.get('error')),
-                    "Strategy": bool(content_pillars and not content_pillars.get('error')),
-                    "Engagement": bool(engagement_metrics and not engagement_metrics.get('error'))
+                    "Voice": bool(fields.get('voice_profile->overall_tone') and not fields.get('voice_profile->error')),
+                    "Strategy": bool(fields.get('content_pillars->primary_focus') and not fields.get('content_pillars->error')),
+                    "Engagement": bool(fields.get('engagement_metrics->avg_engagement') and not fields.get('engagement_metrics->error'))
                 }
 
                 complete_count = sum(1 for v in data_checks.values() if v)
@@ -269,16 +207,41 @@ def render_linkedin_app():
                     with col1:
                         st.metric("Posts", posts_analyzed)
                     with col2:
-                        engagement = client.get('engagement_metrics', {}).get('avg_engagement', {})
-                        avg_eng = engagement.get('total', 0)
+                        avg_eng = (fields.get('engagement_metrics->avg_engagement') or {}).get('total', 0)
                         st.metric("Avg Engagement", f"{avg_eng:,}")
                     with col3:
-                        voice = client.get('voice_profile', {})
-                        consistency = voice.get('consistency_score', 0) if voice and not voice.get('error') else 0
+                        consistency = (fields.get('voice_profile->consistency_score') or 0) if data_checks["Voice"] else 0
                         st.metric("Voice Consistency", f"{consistency}/10")
 
                     st.divider()
 
+                    # Other action buttons
+                    btn_col1, btn_col2 = st.columns(2)
+                    with btn_col1:
+                        if st.button("🗑️ Delete Client", key=f"delete_{hash(company_url)}", use_container_width=True, type="secondary"):
+                            if delete_company_analysis(company_url):
+                                st.success(f"Deleted {company_name}")
+                                time.sleep(1)
+                                st.rerun()
+                            else:
+                                st.error("Failed to delete client")
+
+                    client = client_details.get(client_id)
+
+                    with btn_col2:
+                        if client is None:
+                            if st.button("🔍 Load Full Analysis", key=f"details_{client_id}", use_container_width=True):
+                                st.session_state.client_details_ids.append(client_id)
+                                st.rerun()
+                        elif st.button("🔼 Hide Full Analysis", key=f"hide_details_{client_id}", use_container_width=True):
+                            st.session_state.client_details_ids.remove(client_id)
+                            st.rerun()
+
+                    if client is None:
+                        continue
+
+                    st.divider()
+
                     # Action buttons
                     if complete_count < total_count:
                         # Show retry button if there are failures
@@ -328,28 +291,6 @@ def render_linkedin_app():
 
                         st.divider()
 
-                    # Other action buttons
-                    btn_col1, btn_col2 = st.columns(2)
-                    with btn_col1:
-                        if st.button("🗑️ Delete Client", key=f"delete_{hash(company_url)}", use_container_width=True, type="secondary"):
-                            if delete_company_analysis(company_url):
-                                st.success(f"Deleted {company_name}")
-                                time.sleep(1)
-                                st.rerun()
-                            else:
-                                st.error("Failed to delete client")
-                    with btn_col2:
-                        if st.button("📥 Download JSON", key=f"download_btn_{hash(company_url)}", use_container_width=True):
-                            st.download_button(
-                                label="Download",
-                                data=str(client),
-                                file_name=f"{company_name}_analysis.json",
-                                mime="application/json",
-                                key=f"download_data_{hash(company_url)}"
-                            )
-
-                    st.divider()
-
                     # Display consolidated 4-tab analysis
                     client_tabs = st.tabs(["📊 Overview", "🎤 Voice & Strategy", "📈 Content Performance", "📥 Export Data"])
 
@@ -473,7 +414,7 @@ def render_linkedin_app():
                     # Download button
                     st.download_button(
                         "📥 Download Client Data (JSON)",
-                        data=json.dumps(client, indent=2),
+                        data=json.dumps(client, indent=2, default=str),
                         file_name=f"client_{company_name.replace(' ', '_')}.json",
                         mime="application/json",
                         key=f"download_client_{hash(company_url)}"
@@ -486,14 +427,38 @@ def render_linkedin_app():
         st.markdown("### Compare Companies Side-by-Side")
         st.caption("Select clients from your portfolio to compare")
 
-        # Load all analyzed companies
-        all_clients = get_all_company_analyses(limit=50)
+        # Load company names only; full analyses are fetched for the selection
+        all_clients = get_company_summaries(limit=50)
 
         if not all_clients:
             st.info("No clients yet. Go to 'Onboard New Client' tab to add clients first.")
         else:
+            # Portfolio overview: only these JSON sub-fields are fetched, not the full analyses.
+            # In text storage mode the whole columns are downloaded, so load it only on request.
+            overview_paths = {
+                'voice_profile->overall_tone': "Tone",
+                'content_pillars->primary_focus': "Primary Focus",
+                'engagement_metrics->avg_engagement->total': "Avg Engagement"
+            }
+            show_overview = json_storage_mode() == "jsonb" or st.checkbox(
+                "📋 Show portfolio overview",
+                value=False,
+                help="Loads tone, focus and engagement for every client"
+            )
+
+            if show_overview:
+                overview = select_company_fields(list(overview_paths), company_ids=[c.get('id') for c in all_clients])
+
+                if overview:
+                    with st.expander("📋 Portfolio Overview", expanded=False):
+                        overview_df = pd.DataFrame([
+                            {"Company": row.get('company_name'), **{label: row.get(path) for path, label in overview_paths.items()}}
+                            for row in overview
+                        ])
+                        st.dataframe(overview_df, use_container_width=True, hide_index=True)
+
             # Company selector
-            company_options = {f"{c.get('company_name', 'Unknown')} ({c.get('posts_analyzed', 0)} posts)": c for c in all_clients}
+            company_options = {f"{c.get('company_name', 'Unknown')} ({c.get('posts_analyzed', 0)} posts)": c.get('id') for c in all_clients}
 
             selected_companies = st.multiselect(
                 "Select Companies to Compare",
@@ -505,7 +470,9 @@ def render_linkedin_app():
             if not selected_companies:
                 st.warning("Select at least one company to view analysis")
             else:
-                companies_to_compare = [company_options[name] for name in selected_companies]
+                selected_ids = [company_options[name] for name in selected_companies]
+                # Local mirror when ANALYTICS_STORE_ENABLED, otherwise (or on a miss) Supabase
+                companies_to_compare = get_mirrored_company_analyses(selected_ids) or get_company_analyses_by_id(selected_ids)
 
                 st.divider()
 
@@ -586,8 +553,8 @@ def render_linkedin_app():
         st.markdown("### ✍️ Generate Content in Client Voice")
         st.caption("Create LinkedIn posts using any client's voice profile")
 
-        # Load all analyzed companies for voice selection
-        all_clients = get_all_company_analyses(limit=50)
+        # Load company names only; the selected company's voice profile is fetched below
+        all_clients = get_company_summaries(limit=50)
 
         if not all_clients:
             st.info("No clients yet. Go to 'Onboard New Client' tab to add clients first.")
@@ -601,7 +568,8 @@ def render_linkedin_app():
                 help="Content will be generated in this company's voice and style"
             )
 
-            selected_company = company_options[selected_company_name]
+            selected_summary = company_options[selected_company_name]
+            selected_company = (get_company_analyses_by_id([selected_summary.get('id')]) or [selected_summary])[0]
 
             st.info(f"Using voice profile from: **{selected_company_name}** ({selected_company.get('posts_analyzed', 0)} posts analyzed)")
 
@@ -660,27 +628,23 @@ def render_linkedin_app():
                     st.warning("Please provide input")
                 else:
                     with st.spinner(f"Generating 3 variations in {selected_company_name}'s voice..."):
-                        # Generate 3 variations
-                        variations = []
-                        for variation_num in range(1, 4):
-                            result = generate_content(
-                                voice_profile=selected_company.get('voice_profile', {}),
-                                content_strategy=selected_company.get('content_pillars', {}),
-                                input_type=input_type,
-                                user_input=user_input,
-                                model="anthropic/claude-sonnet-4.5",
-                                variation_number=variation_num
-                            )
-                            if not result.get('error'):
-                                variations.append(result)
+                        # Generate 3 variations in one call
+                        variations = generate_content_variations(
+                            voice_profile=selected_company.get('voice_profile', {}),
+                            content_strategy=selected_company.get('content_pillars', {}),
+                            input_type=input_type,
+                            user_input=user_input,
+                            model="anthropic/claude-sonnet-4.5",
+                            num_variations=3
+                        ).get("variations", [])
 
                         if not variations:
                             st.error("All generations failed. Please try again.")
                         else:
                             st.success(f"Generated {len(variations)} variations!")
 
-                            # Save to database
-                            save_success = save_generated_posts(
+                            # Save to database in the background
+                            queue_generated_posts(
                                 company_url=selected_company.get('company_url', ''),
                                 company_name=selected_company_name,
                                 input_type=input_type,
@@ -688,8 +652,7 @@ def render_linkedin_app():
                                 variations=variations,
                                 model="anthropic/claude-sonnet-4.5"
                             )
-                            if save_success:
-                                st.caption("✓ Saved to database for future reference")
+                            st.caption("✓ Saving to database for future reference")
 
                             # Display all variations
                             for i, result in enumerate(variations, 1):
@@ -733,3 +696,170 @@ def render_linkedin_app():
                                 )
 
                                 st.divider()
+
+
+def run_client_onboarding(linkedin_url: str, company_name: str, analysis_model: str, progress) -> dict:
+    """
+    Fetch posts and run the full company analysis, as a background job.
+
+    Analysis fields are streamed into the job's partial output as they
+    complete, so the page can preview them while the job runs.
+
+    Args:
+        linkedin_url: Client LinkedIn company URL
+        company_name: Client name
+        analysis_model: OpenRouter model for the analyses
+        progress: Job progress callback(message, fraction, **event)
+
+    Returns:
+        Dict with "posts_count", "new_posts" and "analysis", or {"error": str}
+    """
+    progress("📥 Fetching LinkedIn posts...", 0.05)
+
+    response = fetch_linkedin_posts_incremental(linkedin_url)
+    if response.get("error"):
+        return {"error": response.get("error")}
+
+    posts = response.get("data", {}).get("data", [])
+    if response.get("new_raw_response"):
+        save_linkedin_posts_to_db(linkedin_url, response["new_raw_response"])
+    progress(f"✅ {len(posts)} LinkedIn posts ({response.get('new_posts', 0)} new)", 0.2, status="success")
+
+    recent_posts = linkedin_analysis_posts(posts)
+    progress(f"🤖 Analyzing {len(recent_posts)} most recent posts with AI...", 0.25)
+
+    analysis_result = analyze_company_complete(
+        posts_list=recent_posts,
+        company_name=company_name,
+        company_url=linkedin_url,
+        model=analysis_model,
+        use_cache=True,
+        on_field=lambda analysis, key, value: progress(section=analysis, field=key, value=value)
+    )
+
+    # Save analysis
+    save_company_analysis(analysis_result)
+
+    return {
+        "posts_count": len(posts),
+        "new_posts": response.get("new_posts", 0),
+        "analysis": analysis_result
+    }
+
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def _poll_onboarding_job(job_id: str) -> None:
+    """Refresh only the job panel while the job runs; rerun the whole page once it finishes."""
+    if not _render_onboarding_job(job_id):
+        # Other tabs read the saved analysis, so they refresh once, not on every poll
+        st.rerun()
+
+
+def _render_onboarding_job(job_id: str) -> bool:
+    """
+    Show an onboarding job's progress, live analysis preview and summary.
+
+    Returns:
+        True while the job is still running (caller should poll)
+    """
+    job = get_job(job_id)
+
+    if not job:
+        st.warning(f"⚠️ Onboarding job `{job_id}` not found")
+        return False
+
+    st.markdown(f"### 🚀 Onboarding **{job['label']}**")
+    st.caption(f"Job ID: `{job['id']}` - add `&onboarding_job={job['id']}` to this page's URL to follow it from another session")
+    st.markdown("---")
+
+    for event in job['events']:
+        if event.get("status") == "success":
+            st.success(f"**{event['message']}**")
+        elif is_active(job):
+            # In-progress messages are only relevant while the job runs
+            st.info(f"**{event['message']}**")
+
+    if is_active(job):
+        # Short scalar fields make a useful live preview; skip big nested ones
+        preview_labels = {
+            "voice_profile": "🎤 Voice",
+            "content_pillars": "📋 Strategy",
+            "engagement_metrics": "📈 Engagement"
+        }
+        preview_cols = st.columns(3)
+        for (analysis, label), col in zip(preview_labels.items(), preview_cols):
+            fields = [
+                f"- **{key.replace('_', ' ').title()}:** {value}"
+                for key, value in job['partial'].get(analysis, {}).items()
+                if isinstance(value, (str, int, float)) and len(str(value)) <= 120
+            ]
+            if fields:
+                col.markdown(f"**{label}**\n" + "\n".join(fields))
+
+        st.caption("⏳ Running in the background - you can leave this page and come back")
+        return True
+
+    if job['state'] != "done":
+        st.error(f"❌ **Onboarding job {job['state']}**: {job.get('error') or 'unknown error'}")
+        return False
+
+    outcome = job['result'] or {}
+
+    if outcome.get("error"):
+        st.error(f"❌ **Error fetching posts**: {outcome.get('error')}")
+        st.error("⛔ Onboarding stopped - cannot proceed without LinkedIn posts")
+        st.caption("**Next steps:**")
+        st.info("• Check RAPIDAPI_KEY in secrets\n• Verify LinkedIn URL is correct\n• Check RapidAPI subscription status")
+        return False
+
+    analysis_result = outcome.get("analysis", {})
+    results = {"posts": {"status": "success", "data": None, "error": None}}
+
+    # Check individual analysis results
+    for name, key in [("voice", "voice_profile"), ("strategy", "content_pillars"), ("engagement", "engagement_metrics")]:
+        section = analysis_result.get(key, {})
+        if section.get("error"):
+            results[name] = {"status": "failed", "data": None, "error": section.get("error")}
+        else:
+            results[name] = {"status": "success", "data": section, "error": None}
+
+    # Update status for AI analysis
+    ai_success_count = sum(1 for r in [results["voice"], results["strategy"], results["engagement"]] if r["status"] == "success")
+    if ai_success_count == 3:
+        st.success(f"✅ **AI analysis complete** (Voice, Strategy, Engagement)")
+    elif ai_success_count > 0:
+        st.warning(f"⚠️ **AI analysis partial** ({ai_success_count}/3 succeeded)")
+    else:
+        st.error(f"❌ **AI analysis failed** (all 3 analyses failed)")
+
+    # Summary
+    st.markdown("---")
+    st.markdown("### 📊 Onboarding Summary")
+
+    success_count = sum(1 for r in results.values() if r["status"] == "success")
+    total_count = len(results)
+
+    if success_count == total_count:
+        st.success(f"🎉 **All analyses complete!** ({success_count}/{total_count})")
+    elif success_count > 0:
+        st.warning(f"⚠️ **Partial success** ({success_count}/{total_count} analyses succeeded)")
+    else:
+        st.error(f"❌ **Onboarding failed** (0/{total_count} analyses succeeded)")
+
+    # Show failed analyses with errors
+    failed_analyses = [(name, data) for name, data in results.items() if data["status"] == "failed"]
+    if failed_analyses:
+        st.markdown("#### ❌ Failed Analyses:")
+        for name, data in failed_analyses:
+            with st.expander(f"🔴 {name.replace('_', ' ').title()} - Click for details"):
+                st.error(data["error"])
+                st.caption("**Next steps:**")
+                if "OpenRouter" in data["error"]:
+                    st.info("• Check OPENROUTER_API_KEY in secrets\n• Verify you have credits at openrouter.ai\n• Try a different model")
+                elif "DataForSEO" in data["error"]:
+                    st.info("• Check DATAFORSEO credentials in secrets\n• Verify domain is valid\n• Check DataForSEO credits")
+                elif "ChatGPT" in data["error"]:
+                    st.info("• Check API configuration\n• Verify provider is accessible")
+
+    st.info(f"👉 Go to **'My Clients'** tab to view full analysis for **{job['label']}**")
+    return False
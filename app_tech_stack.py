@@ -7,6 +7,8 @@ Identifies technologies, frameworks, CMS, analytics tools, and more
 import streamlit as st
 import os
 import requests
+import http_client
+from api_cache import cached
 import pandas as pd
 from typing import Dict, Any, Optional
 import base64
@@ -21,6 +23,7 @@ def get_credential(key: str, default=None):
         return os.environ.get(key, default)
 
 
+@cached("domain_technologies")
 def analyze_tech_stack(domain: str) -> Optional[Dict[str, Any]]:
     """
     Analyze website technologies using DataForSEO Domain Analytics API.
@@ -58,7 +61,7 @@ def analyze_tech_stack(domain: str) -> Optional[Dict[str, Any]]:
     ]
 
     try:
-        response = requests.post(url, json=payload, headers=headers)
+        response = http_client.post(url, json=payload, headers=headers)
         response.raise_for_status()
 
         data = response.json()
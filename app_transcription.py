@@ -7,11 +7,13 @@ Uses AssemblyAI API for speech-to-text and analysis
 import streamlit as st
 import os
 import requests
+import http_client
 import time
 import subprocess
 import tempfile
 from typing import Optional, Dict
 from pathlib import Path
+from job_runner import submit_job, get_job, is_active
 
 
 def get_credential(key: str, default=None):
@@ -74,7 +76,7 @@ def upload_file_to_assemblyai(file_data: bytes, api_key: str) -> Optional[str]:
     }
 
     try:
-        response = requests.post(url, headers=headers, data=file_data, timeout=300)
+        response = http_client.post(url, headers=headers, data=file_data, timeout=300)
         response.raise_for_status()
         result = response.json()
         return result.get("upload_url")
@@ -108,7 +110,7 @@ def submit_transcription(audio_url: str, api_key: str, options: Dict) -> Optiona
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
+        response = http_client.post(url, headers=headers, json=payload, timeout=30)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -133,13 +135,70 @@ def get_transcription_status(transcript_id: str, api_key: str) -> Optional[Dict]
     }
 
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http_client.get(url, headers=headers, timeout=30)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
         return {"error": f"API Error: {str(e)}"}
 
 
+TRANSCRIPTION_POLL_INTERVAL = 5  # seconds between AssemblyAI status checks
+TRANSCRIPTION_POLL_TIMEOUT = 3 * 60 * 60
+TRANSCRIPTION_MAX_STATUS_ERRORS = 5  # consecutive failed status requests before giving up
+JOB_POLL_INTERVAL = 3  # seconds between background job checks while a transcription is pending
+
+
+def poll_transcription(transcript_id: str, api_key: str, progress) -> Dict:
+    """
+    Poll AssemblyAI until a transcript completes or fails, as a background job.
+
+    Args:
+        transcript_id: Transcript ID from submit_transcription
+        api_key: AssemblyAI API key
+        progress: Job progress callback(message, fraction, **event)
+
+    Returns:
+        Final status dict from get_transcription_status, or {"error": str}
+    """
+    deadline = time.time() + TRANSCRIPTION_POLL_TIMEOUT
+    status_errors = 0
+    last_status = None
+
+    while time.time() < deadline:
+        status_result = get_transcription_status(transcript_id, api_key)
+
+        # Request failures have no "status"; a failed transcript has status "error"
+        if "status" not in status_result:
+            status_errors += 1
+            if status_errors >= TRANSCRIPTION_MAX_STATUS_ERRORS:
+                return status_result
+        else:
+            status_errors = 0
+            status = status_result.get("status")
+            if status in ("completed", "error"):
+                return status_result
+            if status != last_status:
+                progress(f"Transcription {status}...", transcript_status=status)
+                last_status = status
+
+        time.sleep(TRANSCRIPTION_POLL_INTERVAL)
+
+    return {"error": "Timed out waiting for transcription"}
+
+
+def _track_transcript(transcript: Dict, api_key: str) -> None:
+    """Start (or reattach to) the background poll job for a transcript."""
+    transcript["job_id"] = submit_job(
+        "transcription_poll",
+        poll_transcription,
+        transcript["id"],
+        api_key,
+        key=transcript["id"],
+        label=f"Transcript {transcript['id'][:8]}",
+        pool="poll"  # mostly sleeping for up to hours; keep it off the research/onboarding workers
+    )
+
+
 def render_transcription_app():
     """Render the Meeting Transcription interface."""
 
@@ -300,16 +359,46 @@ def render_transcription_app():
                     elif result.get("id"):
                         st.success(f"✅ Transcription started! ID: {result['id']}")
 
-                        # Add to session state
-                        st.session_state.transcripts.insert(0, {
+                        # Add to session state; status is polled in the background
+                        transcript = {
                             "id": result["id"],
                             "url": final_audio_url if not uploaded_file else f"Uploaded: {uploaded_file.name}",
                             "status": "queued",
                             "options": options
-                        })
+                        }
+                        _track_transcript(transcript, api_key)
+                        st.session_state.transcripts.insert(0, transcript)
 
                         st.rerun()
 
+    # Follow a transcript started in another session
+    with st.expander("🔁 Track an existing transcript"):
+        existing_id = st.text_input("Transcript ID", key="track_transcript_id")
+        if st.button("Track", key="track_transcript") and existing_id.strip():
+            if not any(t["id"] == existing_id.strip() for t in st.session_state.transcripts):
+                transcript = {"id": existing_id.strip(), "url": "Existing transcript", "status": "queued", "options": {}}
+                _track_transcript(transcript, api_key)
+                st.session_state.transcripts.insert(0, transcript)
+            st.rerun()
+
+    # Pick up results from finished background poll jobs
+    poll_jobs = False
+    for transcript in st.session_state.transcripts:
+        if not transcript.get("job_id") or transcript.get("status") in ("completed", "error"):
+            continue
+
+        job = get_job(transcript["job_id"])
+        if is_active(job):
+            poll_jobs = True
+            if job["events"]:
+                transcript["status"] = job["events"][-1].get("transcript_status", transcript["status"])
+        elif job and job["state"] == "done" and job["result"] and "status" in job["result"]:
+            transcript["status"] = job["result"]["status"]
+            transcript["result"] = job["result"]
+        else:
+            # Polling gave up (API errors, timeout or restart): fall back to the Refresh button
+            transcript.pop("job_id", None)
+
     # Display transcripts
     if st.session_state.transcripts:
         st.markdown("---")
@@ -387,6 +476,8 @@ def render_transcription_app():
 
                     elif status == "queued":
                         st.info("⏳ Transcription queued...")
+                elif transcript.get("job_id"):
+                    st.info(f"⏳ Transcription {transcript.get('status', 'queued')}... (checked automatically)")
                 else:
                     st.info("Click 'Refresh' to check transcription status")
 
@@ -396,3 +487,26 @@ def render_transcription_app():
         if st.button("🗑️ Clear All Transcripts", use_container_width=True):
             st.session_state.transcripts = []
             st.rerun()
+
+    # Keep checking while background poll jobs are running
+    if poll_jobs:
+        _watch_transcription_jobs()
+
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def _watch_transcription_jobs() -> None:
+    """Check pending poll jobs without rerunning the page; rerun it once a status changes."""
+    pending = [
+        t for t in st.session_state.transcripts
+        if t.get("job_id") and t.get("status") not in ("completed", "error")
+    ]
+
+    for transcript in pending:
+        job = get_job(transcript["job_id"])
+        status = transcript["status"]
+        if is_active(job) and job["events"]:
+            status = job["events"][-1].get("transcript_status", status)
+        if not is_active(job) or status != transcript["status"]:
+            st.rerun()
+
+    st.caption(f"⏳ {len(pending)} transcription(s) in progress - checked automatically")
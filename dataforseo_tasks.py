@@ -0,0 +1,335 @@
+"""
+DataForSEO Task Queue Engine
+
+Alternative to the /live endpoints in seo_functions for large jobs.
+Jobs are submitted with task_post (cheaper, queued server-side), then a single
+polling loop checks tasks_ready for every pending endpoint and downloads
+finished results with task_get.
+
+Return shapes match the live helpers in seo_functions so callers can switch
+engines without changing how they read results.
+"""
+
+import time
+import requests
+import http_client
+from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+
+from seo_functions import get_credential, get_ranked_keywords_for_domain
+
+
+API_BASE = "https://api.dataforseo.com/v3"
+
+KEYWORDS_FOR_KEYWORDS = "keywords_data/google_ads/keywords_for_keywords"
+KEYWORDS_FOR_SITE = "keywords_data/google_ads/keywords_for_site"
+
+# DataForSEO accepts up to 100 tasks per task_post call
+TASK_POST_BATCH_SIZE = 100
+TASK_GET_MAX_WORKERS = 8
+
+
+def _get_auth():
+    """Return DataForSEO (login, password) or None if not configured."""
+    login = get_credential("DATAFORSEO_LOGIN")
+    password = get_credential("DATAFORSEO_PASSWORD")
+
+    if not login or not password:
+        return None
+
+    return (login, password)
+
+
+def submit_tasks(endpoint: str, payloads: List[Dict], auth: tuple = None) -> Dict:
+    """
+    Submit tasks to a DataForSEO task_post endpoint.
+
+    Each payload gets a "tag" (its index as a string) so results can be mapped
+    back to the input that produced them.
+
+    Args:
+        endpoint: Endpoint path without method, e.g. KEYWORDS_FOR_SITE
+        payloads: List of task payload dicts
+        auth: Optional (login, password); read from credentials if omitted
+
+    Returns:
+        Dict with "tasks" ({task_id: tag}), "errors" ({tag: message}) and "error"
+    """
+    auth = auth or _get_auth()
+    if not auth:
+        return {"error": "DataForSEO credentials not configured"}
+
+    tasks = {}
+    errors = {}
+
+    tagged = [dict(payload, tag=str(idx)) for idx, payload in enumerate(payloads)]
+
+    for i in range(0, len(tagged), TASK_POST_BATCH_SIZE):
+        batch = tagged[i:i + TASK_POST_BATCH_SIZE]
+
+        try:
+            response = http_client.post(
+                f"{API_BASE}/{endpoint}/task_post",
+                json=batch,
+                auth=auth,
+                headers={"Content-Type": "application/json"},
+                timeout=60
+            )
+
+            response.raise_for_status()
+            data = response.json()
+
+            for task in data.get("tasks", []):
+                tag = (task.get("data") or {}).get("tag")
+                # 20100 = "Task Created"
+                if task.get("status_code") == 20100 and task.get("id"):
+                    tasks[task["id"]] = tag
+                else:
+                    errors[tag] = f"Task rejected: {task.get('status_message', 'Unknown error')}"
+
+        except requests.exceptions.RequestException as e:
+            for payload in batch:
+                errors[payload["tag"]] = f"API request failed: {str(e)}"
+        except Exception as e:
+            for payload in batch:
+                errors[payload["tag"]] = f"Error: {str(e)}"
+
+    return {
+        "tasks": tasks,
+        "errors": errors,
+        "error": None if tasks else "No tasks were accepted"
+    }
+
+
+def _get_ready_task_ids(endpoint: str, auth: tuple) -> List[str]:
+    """Return ids of finished tasks for an endpoint (empty list on failure)."""
+    try:
+        response = http_client.get(f"{API_BASE}/{endpoint}/tasks_ready", auth=auth, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+
+        ready = []
+        for task in data.get("tasks", []):
+            for item in task.get("result") or []:
+                if item.get("id"):
+                    ready.append(item["id"])
+        return ready
+
+    except Exception as e:
+        print(f"Error checking tasks_ready for {endpoint}: {e}")
+        return []
+
+
+def _get_task_result(endpoint: str, task_id: str, auth: tuple) -> Dict:
+    """Download one finished task. Returns the raw response or {"error": str}."""
+    try:
+        response = http_client.get(f"{API_BASE}/{endpoint}/task_get/{task_id}", auth=auth, timeout=60)
+        response.raise_for_status()
+        return response.json()
+
+    except requests.exceptions.RequestException as e:
+        return {"error": f"API request failed: {str(e)}"}
+    except Exception as e:
+        return {"error": f"Error: {str(e)}"}
+
+
+def collect_task_results(
+    pending: Dict[str, Dict[str, str]],
+    poll_interval: float = 10.0,
+    timeout: float = 1800.0,
+    auth: tuple = None
+) -> Dict[str, Dict]:
+    """
+    Poll tasks_ready for all pending tasks and fetch each result with task_get.
+
+    Args:
+        pending: {endpoint: {task_id: tag}} as built from submit_tasks results
+        poll_interval: Seconds between tasks_ready checks
+        timeout: Give up on unfinished tasks after this many seconds
+        auth: Optional (login, password); read from credentials if omitted
+
+    Returns:
+        {endpoint: {tag: raw task_get response or {"error": str}}}
+    """
+    auth = auth or _get_auth()
+    if not auth:
+        return {
+            endpoint: {tag: {"error": "DataForSEO credentials not configured"} for tag in tasks.values()}
+            for endpoint, tasks in pending.items()
+        }
+
+    remaining = {endpoint: dict(tasks) for endpoint, tasks in pending.items() if tasks}
+    results = {endpoint: {} for endpoint in pending}
+    deadline = time.time() + timeout
+
+    with ThreadPoolExecutor(max_workers=TASK_GET_MAX_WORKERS) as executor:
+        while remaining:
+            for endpoint in list(remaining):
+                ready_ids = [tid for tid in _get_ready_task_ids(endpoint, auth) if tid in remaining[endpoint]]
+
+                futures = {
+                    tid: executor.submit(_get_task_result, endpoint, tid, auth)
+                    for tid in ready_ids
+                }
+                for tid, future in futures.items():
+                    tag = remaining[endpoint].pop(tid)
+                    results[endpoint][tag] = future.result()
+
+                if not remaining[endpoint]:
+                    del remaining[endpoint]
+
+            if not remaining:
+                break
+
+            if time.time() >= deadline:
+                for endpoint, tasks in remaining.items():
+                    for tag in tasks.values():
+                        results[endpoint][tag] = {"error": f"Task not ready after {int(timeout)} seconds"}
+                break
+
+            time.sleep(poll_interval)
+
+    return results
+
+
+def _keyword_list_response(data: Dict, not_found: str, **extra) -> Dict:
+    """Build the same response shape as the live keyword list helpers."""
+    if data.get("error"):
+        return {"error": data["error"]}
+
+    if data.get("tasks") and data["tasks"][0].get("result") and len(data["tasks"][0]["result"]) > 0:
+        results = data["tasks"][0]["result"]
+
+        response = {
+            "keywords": results,
+            "count": len(results),
+        }
+        response.update(extra)
+        response["raw_response"] = data
+        response["error"] = None
+        return response
+
+    return {"error": not_found}
+
+
+def _run_keyword_list_tasks(endpoint: str, payloads: List[Dict], poll_interval: float, timeout: float) -> Dict[str, Dict]:
+    """Submit payloads to an endpoint, wait for them, and return raw results by tag."""
+    auth = _get_auth()
+    if not auth:
+        return {str(idx): {"error": "DataForSEO credentials not configured"} for idx in range(len(payloads))}
+
+    submitted = submit_tasks(endpoint, payloads, auth)
+    if submitted.get("error") and not submitted.get("tasks"):
+        message = submitted["error"]
+        return {
+            str(idx): {"error": submitted.get("errors", {}).get(str(idx), message)}
+            for idx in range(len(payloads))
+        }
+
+    collected = collect_task_results({endpoint: submitted["tasks"]}, poll_interval, timeout, auth)[endpoint]
+
+    for tag, message in submitted.get("errors", {}).items():
+        collected[tag] = {"error": message}
+
+    return collected
+
+
+def get_keyword_suggestions_tasks(
+    seed_keywords: List[str],
+    limit: int = 100,
+    poll_interval: float = 10.0,
+    timeout: float = 1800.0
+) -> Dict[str, Dict]:
+    """
+    Queued version of get_keyword_suggestions for many seed keywords.
+
+    Args:
+        seed_keywords: Seed keywords to get suggestions for
+        limit: Maximum number of suggestions per seed (default: 100)
+        poll_interval: Seconds between tasks_ready checks
+        timeout: Give up on unfinished tasks after this many seconds
+
+    Returns:
+        {seed_keyword: same dict shape as get_keyword_suggestions()}
+    """
+    payloads = [{
+        "keywords": [seed],
+        "language_code": "en",
+        "location_code": 2840,  # United States
+        "limit": limit
+    } for seed in seed_keywords]
+
+    raw = _run_keyword_list_tasks(KEYWORDS_FOR_KEYWORDS, payloads, poll_interval, timeout)
+
+    return {
+        seed: _keyword_list_response(raw.get(str(idx), {}), f"No suggestions found for '{seed}'")
+        for idx, seed in enumerate(seed_keywords)
+    }
+
+
+def get_keywords_for_site_tasks(
+    urls: List[str],
+    limit: int = 100,
+    poll_interval: float = 10.0,
+    timeout: float = 1800.0
+) -> Dict[str, Dict]:
+    """
+    Queued version of get_keywords_for_site for many competitor sites.
+
+    Args:
+        urls: Competitor website URLs
+        limit: Maximum number of keywords per site (default: 100)
+        poll_interval: Seconds between tasks_ready checks
+        timeout: Give up on unfinished tasks after this many seconds
+
+    Returns:
+        {url: same dict shape as get_keywords_for_site()}
+    """
+    payloads = [{
+        "target": url,
+        "language_code": "en",
+        "location_code": 2840,  # United States
+        "limit": limit
+    } for url in urls]
+
+    raw = _run_keyword_list_tasks(KEYWORDS_FOR_SITE, payloads, poll_interval, timeout)
+
+    return {
+        url: _keyword_list_response(raw.get(str(idx), {}), f"No keywords found for '{url}'", url=url)
+        for idx, url in enumerate(urls)
+    }
+
+
+def get_ranked_keywords_for_domains(
+    domains: List[str],
+    limit: int = 500,
+    include_paid: bool = False,
+    max_position: int = None,
+    max_workers: int = 4
+) -> Dict[str, Dict]:
+    """
+    Ranked keywords for many domains.
+
+    DataForSEO Labs only offers live endpoints (no task_post), so domains are
+    fetched concurrently through get_ranked_keywords_for_domain instead of
+    being queued.
+
+    Args:
+        domains: Domains to analyze
+        limit: Maximum number of keywords per domain (default: 500, max: 1000)
+        include_paid: Include paid keywords in addition to organic
+        max_position: Optional filter for maximum ranking position
+        max_workers: Number of concurrent live requests
+
+    Returns:
+        {domain: same dict shape as get_ranked_keywords_for_domain()}
+    """
+    if not domains:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(len(domains), max_workers)) as executor:
+        futures = {
+            domain: executor.submit(get_ranked_keywords_for_domain, domain, limit, include_paid, max_position)
+            for domain in domains
+        }
+        return {domain: future.result() for domain, future in futures.items()}
@@ -0,0 +1,164 @@
+"""
+Engagement Metrics
+
+Deterministic LinkedIn engagement statistics computed locally with pandas:
+averages, percentiles, weekday/hour distributions, posting cadence, content
+length buckets and top/bottom posts. The engagement analysis prompt receives
+these as a compact summary instead of asking the LLM to do the arithmetic.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+
+ENGAGEMENT_FIELDS = {'likes': 'num_likes', 'comments': 'num_comments', 'reposts': 'num_reposts'}
+PERCENTILES = [25, 50, 75, 90]
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+LENGTH_BUCKETS = [0, 300, 800, 1500, np.inf]
+LENGTH_LABELS = ["<300 chars", "300-800 chars", "800-1500 chars", "1500+ chars"]
+
+
+def posts_to_frame(posts_list: List[Dict]) -> pd.DataFrame:
+    """
+    Build a typed DataFrame from RapidAPI post dicts.
+
+    Args:
+        posts_list: List of post dicts (num_likes, num_comments, num_reposts, posted, text)
+
+    Returns:
+        DataFrame with likes, comments, reposts, total, posted_at (UTC), length, text and url columns
+    """
+    df = pd.DataFrame({
+        'text': [p.get('text') or '' for p in posts_list],
+        'url': [p.get('post_url') or p.get('url') or '' for p in posts_list],
+        'posted': [p.get('posted') for p in posts_list],
+        **{
+            name: [p.get(field) for p in posts_list]
+            for name, field in ENGAGEMENT_FIELDS.items()
+        }
+    })
+
+    for name in ENGAGEMENT_FIELDS:
+        df[name] = pd.to_numeric(df[name], errors='coerce').fillna(0).astype(np.int64)
+
+    df['total'] = df[list(ENGAGEMENT_FIELDS)].sum(axis=1)
+    df['posted_at'] = pd.to_datetime(df['posted'], errors='coerce', utc=True, format='mixed')
+    df['length'] = df['text'].str.len()
+
+    return df
+
+
+def _distribution(df: pd.DataFrame, key, labels: List) -> List[Dict]:
+    """Post count and average total engagement per group, in label order, skipping empty groups."""
+    grouped = df.groupby(key, observed=True)['total'].agg(['count', 'mean'])
+    return [
+        {"label": str(label), "posts": int(grouped.loc[label, 'count']), "avg_engagement": round(float(grouped.loc[label, 'mean']), 1)}
+        for label in labels
+        if label in grouped.index
+    ]
+
+
+def _post_summary(row) -> Dict:
+    return {
+        'text': row.text[:200],
+        'url': row.url,
+        'engagement': int(row.total),
+        'posted': row.posted if isinstance(row.posted, str) else ''
+    }
+
+
+def compute_engagement_metrics(posts_list: List[Dict], top_n: int = 5) -> Dict:
+    """
+    Compute engagement statistics for a set of posts.
+
+    Args:
+        posts_list: List of post dicts with engagement fields
+        top_n: Number of top and bottom posts to return
+
+    Returns:
+        Dict with "posts", "avg_engagement", "median_engagement", "percentiles",
+        "by_weekday", "by_hour" (UTC), "by_length", "cadence", "date_range",
+        "top_posts" and "bottom_posts" (empty dict when there are no posts)
+    """
+    if not posts_list:
+        return {}
+
+    df = posts_to_frame(posts_list)
+    columns = list(ENGAGEMENT_FIELDS) + ['total']
+
+    means = df[columns].mean()
+    medians = df[columns].median()
+    percentiles = np.percentile(df['total'].to_numpy(), PERCENTILES)
+
+    dated = df.dropna(subset=['posted_at']).sort_values('posted_at')
+    cadence = {"posts_per_week": None, "median_days_between_posts": None}
+    date_range = "Unknown"
+
+    if not dated.empty:
+        first, last = dated['posted_at'].iloc[0], dated['posted_at'].iloc[-1]
+        date_range = f"{first:%Y-%m-%d} to {last:%Y-%m-%d}"
+
+        span_weeks = (last - first).total_seconds() / (7 * 86400)
+        if span_weeks > 0:
+            cadence["posts_per_week"] = round(len(dated) / span_weeks, 1)
+
+        gaps = dated['posted_at'].diff().dropna().dt.total_seconds() / 86400
+        if not gaps.empty:
+            cadence["median_days_between_posts"] = round(float(gaps.median()), 1)
+
+    by_weekday = _distribution(dated, dated['posted_at'].dt.day_name(), WEEKDAYS)
+    by_hour = _distribution(dated, dated['posted_at'].dt.hour, list(range(24)))
+    by_length = _distribution(
+        df[df['length'] > 0],
+        pd.cut(df.loc[df['length'] > 0, 'length'], LENGTH_BUCKETS, labels=LENGTH_LABELS, right=False),
+        LENGTH_LABELS
+    )
+
+    ranked = df[df['text'] != ''].sort_values('total', ascending=False, kind='stable')
+
+    return {
+        "posts": int(len(df)),
+        "avg_engagement": {name: round(float(means[name]), 1) for name in columns},
+        "median_engagement": {name: float(medians[name]) for name in columns},
+        "percentiles": {f"p{p}": round(float(v), 1) for p, v in zip(PERCENTILES, percentiles)},
+        "by_weekday": by_weekday,
+        "by_hour": by_hour,
+        "by_length": by_length,
+        "cadence": cadence,
+        "date_range": date_range,
+        "top_posts": [_post_summary(row) for row in ranked.head(top_n).itertuples()],
+        "bottom_posts": [_post_summary(row) for row in ranked.tail(top_n).iloc[::-1].itertuples()]
+    }
+
+
+def format_engagement_summary(metrics: Dict) -> str:
+    """
+    Render computed metrics as a compact text block for the engagement prompt.
+
+    Args:
+        metrics: Result of compute_engagement_metrics()
+
+    Returns:
+        Multi-line summary string
+    """
+    if not metrics:
+        return "No engagement data available."
+
+    def distribution(rows: List[Dict]) -> str:
+        return ", ".join(f"{r['label']}: {r['avg_engagement']} avg ({r['posts']} posts)" for r in rows) or "n/a"
+
+    avg = metrics["avg_engagement"]
+    cadence = metrics["cadence"]
+
+    return "\n".join([
+        f"Posts: {metrics['posts']} ({metrics['date_range']})",
+        f"Average per post: {avg['likes']} likes, {avg['comments']} comments, {avg['reposts']} reposts, {avg['total']} total",
+        f"Median total per post: {metrics['median_engagement']['total']}",
+        "Total engagement percentiles: " + ", ".join(f"{k} {v}" for k, v in metrics["percentiles"].items()),
+        f"Posting cadence: {cadence['posts_per_week'] if cadence['posts_per_week'] is not None else 'n/a'} posts/week, "
+        f"median {cadence['median_days_between_posts'] if cadence['median_days_between_posts'] is not None else 'n/a'} days between posts",
+        f"By weekday: {distribution(metrics['by_weekday'])}",
+        f"By hour (UTC): {distribution(metrics['by_hour'])}",
+        f"By post length: {distribution(metrics['by_length'])}"
+    ])
@@ -0,0 +1,125 @@
+"""
+Shared HTTP Transport
+
+One pooled requests.Session reused by every outbound API call
+(DataForSEO, RapidAPI, OpenRouter, AssemblyAI) so connections are
+kept alive per host instead of paying a TCP+TLS handshake per request.
+
+Pool sizing can be tuned with HTTP_POOL_CONNECTIONS (number of hosts kept
+pooled) and HTTP_POOL_MAXSIZE (connections kept per host).
+"""
+
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 20
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_credential(key: str, default=None):
+    """
+    Get credential from Streamlit secrets or environment variables.
+    Tries st.secrets first, falls back to os.environ.
+
+    Args:
+        key: The credential key name
+        default: Default value if not found
+
+    Returns:
+        The credential value or default
+    """
+    try:
+        import streamlit as st
+        return st.secrets.get(key, os.environ.get(key, default))
+    except (ImportError, FileNotFoundError):
+        # Streamlit not available or secrets file not found, use environment
+        return os.environ.get(key, default)
+
+
+def _int_setting(key: str, default: int) -> int:
+    """Read an integer setting, falling back to default on bad values."""
+    try:
+        return int(get_credential(key, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def create_session(pool_connections: int = None, pool_maxsize: int = None) -> requests.Session:
+    """
+    Build a requests.Session with keep-alive connection pools and gzip negotiation.
+
+    Args:
+        pool_connections: Number of per-host pools to keep (default: HTTP_POOL_CONNECTIONS or 10)
+        pool_maxsize: Max connections kept alive per host (default: HTTP_POOL_MAXSIZE or 20)
+
+    Returns:
+        Configured requests.Session
+    """
+    if pool_connections is None:
+        pool_connections = _int_setting("HTTP_POOL_CONNECTIONS", DEFAULT_POOL_CONNECTIONS)
+    if pool_maxsize is None:
+        pool_maxsize = _int_setting("HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE)
+
+    # Only retry stale keep-alive connections; callers handle HTTP errors themselves
+    retries = Retry(total=1, connect=1, read=0, status=0, allowed_methods=None, raise_on_status=False)
+
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retries,
+        pool_block=False
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive"
+    })
+
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Get the process-wide pooled session, creating it on first use.
+
+    Returns:
+        Shared requests.Session
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+
+    return _session
+
+
+def reset_session() -> None:
+    """Close the shared session so the next call rebuilds it (e.g. after changing pool sizes)."""
+    global _session
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """POST through the shared pooled session. Accepts the same kwargs as requests.post."""
+    return get_session().post(url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """GET through the shared pooled session. Accepts the same kwargs as requests.get."""
+    return get_session().get(url, **kwargs)
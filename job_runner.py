@@ -0,0 +1,329 @@
+"""
+Background Job Runner
+
+Runs long work (company research, LinkedIn onboarding analysis, transcription
+polling) on a process-wide thread pool instead of the Streamlit script thread,
+so reruns, widget interactions and navigating away don't abort or repeat it.
+
+Every job is recorded in a SQLite job table with its state, progress events,
+partial output and final result. Any session can reattach to a running or
+finished job by ID with get_job(). Each job records the boot ID of the
+process that queued it; jobs still queued or running under another boot ID
+are marked "interrupted" the first time a new process opens the store
+(process IDs are not used, since a restarted container often reuses them).
+
+Job functions receive a `progress` keyword argument:
+
+    def work(url, progress):
+        progress("Fetching posts...", 0.1)
+        progress("Voice done", 0.5, source="voice", status="success")
+        progress(section="voice", field="tone", value="warm")   # streamed output -> job["partial"]
+        return {"report": ...}
+
+    job_id = submit_job("research", work, url, key=url, label="Acme")
+    job = get_job(job_id)   # {"state": "running", "progress": 0.5, "events": [...], ...}
+
+Long waits that do little work (e.g. polling an external service) should be
+submitted with pool="poll" so they don't hold the workers that heavy jobs
+need.
+
+Settings (Streamlit secrets or environment variables):
+- JOB_MAX_WORKERS: Jobs run concurrently across all sessions (default: 4)
+- JOB_POLL_MAX_WORKERS: Polling jobs run concurrently in the "poll" pool (default: 16)
+- JOB_STORE_PATH: SQLite file location (default: .cache/jobs.sqlite3 next to this file)
+- JOB_RETENTION_DAYS: Finished jobs older than this are deleted (default: 7)
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List
+
+
+JOB_ACTIVE_STATES = ("queued", "running")
+JOB_FINISHED_STATES = ("done", "failed", "interrupted")
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_POLL_MAX_WORKERS = 16
+JOB_POOLS = {
+    # pool name: (setting, default workers)
+    "default": ("JOB_MAX_WORKERS", DEFAULT_MAX_WORKERS),
+    "poll": ("JOB_POLL_MAX_WORKERS", DEFAULT_POLL_MAX_WORKERS)
+}
+DEFAULT_RETENTION_DAYS = 7
+
+_lock = threading.Lock()
+_init_lock = threading.Lock()
+_progress_lock = threading.Lock()  # serializes read-modify-write of events/partial
+_executors = {}
+_initialized_paths = set()
+_BOOT_ID = uuid.uuid4().hex  # identifies this process's jobs across PID reuse
+
+
+def get_credential(key: str, default=None):
+    """
+    Get credential from Streamlit secrets or environment variables.
+    Tries st.secrets first, falls back to os.environ.
+
+    Args:
+        key: The credential key name
+        default: Default value if not found
+
+    Returns:
+        The credential value or default
+    """
+    try:
+        import streamlit as st
+        return st.secrets.get(key, os.environ.get(key, default))
+    except (ImportError, FileNotFoundError):
+        # Streamlit not available or secrets file not found, use environment
+        return os.environ.get(key, default)
+
+
+def _store_path() -> Path:
+    path = get_credential("JOB_STORE_PATH")
+    if path:
+        return Path(path)
+    return Path(__file__).parent / ".cache" / "jobs.sqlite3"
+
+
+def _init_store(conn: sqlite3.Connection) -> None:
+    """Create the job table and clean up after earlier processes (once per path)."""
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            key TEXT,
+            label TEXT,
+            state TEXT NOT NULL,
+            progress REAL NOT NULL DEFAULT 0,
+            message TEXT,
+            events TEXT NOT NULL DEFAULT '[]',
+            partial TEXT NOT NULL DEFAULT '{}',
+            result TEXT,
+            error TEXT,
+            pid INTEGER,
+            boot_id TEXT,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS jobs_kind_created_idx ON jobs (kind, created_at)")
+
+    # Stores created before boot IDs were recorded
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+    if "boot_id" not in columns:
+        conn.execute("ALTER TABLE jobs ADD COLUMN boot_id TEXT")
+
+    # Threads die with their process, so jobs left active by another process never finish
+    conn.execute(
+        "UPDATE jobs SET state = 'interrupted', error = 'Server restarted before the job finished', finished_at = ? "
+        "WHERE state IN ('queued', 'running') AND (boot_id IS NULL OR boot_id != ?)",
+        (time.time(), _BOOT_ID)
+    )
+
+    retention_days = float(get_credential("JOB_RETENTION_DAYS", DEFAULT_RETENTION_DAYS))
+    conn.execute(
+        "DELETE FROM jobs WHERE state IN ('done', 'failed', 'interrupted') AND created_at < ?",
+        (time.time() - retention_days * 86400,)
+    )
+
+
+@contextmanager
+def _open():
+    """Connection context: commits on success, rolls back on error, always closes."""
+    path = _store_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(str(path), timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        with conn:
+            if str(path) not in _initialized_paths:
+                with _init_lock:
+                    if str(path) not in _initialized_paths:
+                        _init_store(conn)
+                        _initialized_paths.add(str(path))
+            yield conn
+    finally:
+        conn.close()
+
+
+def _get_executor(pool: str = "default") -> ThreadPoolExecutor:
+    """Process-wide pool shared by every session (created on first use)."""
+    setting, default_workers = JOB_POOLS[pool]
+
+    with _lock:
+        if pool not in _executors:
+            max_workers = int(get_credential(setting, default_workers))
+            _executors[pool] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"job-{pool}")
+        return _executors[pool]
+
+
+def _dumps(value) -> str:
+    # Results may contain datetimes or SDK objects; store those as strings
+    return json.dumps(value, default=str)
+
+
+def _update(job_id: str, **fields) -> None:
+    columns = ", ".join(f"{name} = ?" for name in fields)
+    with _open() as conn:
+        conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+
+def _make_progress(job_id: str) -> Callable:
+    """Build the progress(message, fraction, **event) callback passed to job functions."""
+
+    def progress(message: str = None, fraction: float = None, **event) -> None:
+        with _progress_lock, _open() as conn:
+            row = conn.execute("SELECT progress, events, partial FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+
+            events = json.loads(row['events'])
+            partial = json.loads(row['partial'])
+
+            # Events with a "field" are streamed output: keep only the latest value per field
+            if "field" in event:
+                partial.setdefault(event.get("section", ""), {})[event["field"]] = event.get("value")
+            else:
+                events.append(dict(event, message=message, time=time.time()))
+
+            conn.execute(
+                "UPDATE jobs SET progress = ?, message = COALESCE(?, message), events = ?, partial = ? WHERE id = ?",
+                (
+                    row['progress'] if fraction is None else max(0.0, min(1.0, fraction)),
+                    message,
+                    _dumps(events),
+                    _dumps(partial),
+                    job_id
+                )
+            )
+
+    return progress
+
+
+def _run(job_id: str, func: Callable, args: tuple, kwargs: Dict) -> None:
+    _update(job_id, state="running", started_at=time.time())
+
+    try:
+        result = func(*args, progress=_make_progress(job_id), **kwargs)
+        _update(job_id, state="done", progress=1.0, result=_dumps(result), finished_at=time.time())
+    except Exception as e:
+        print(f"Job {job_id} failed: {e}")
+        _update(job_id, state="failed", error=str(e), finished_at=time.time())
+
+
+def submit_job(
+    kind: str,
+    func: Callable,
+    *args,
+    key: str = None,
+    label: str = None,
+    pool: str = "default",
+    **kwargs
+) -> str:
+    """
+    Queue a function to run in the background.
+
+    Args:
+        kind: Job category used for listing, e.g. "company_research"
+        func: Function to run; called as func(*args, progress=callback, **kwargs)
+        *args: Positional arguments for func
+        key: Optional identity; if a job of the same kind and key is still
+             queued or running, its ID is returned instead of starting another
+        label: Human-readable name shown in job lists
+        pool: Worker pool from JOB_POOLS; "poll" for long, mostly idle waits
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Job ID
+    """
+    if pool not in JOB_POOLS:
+        raise ValueError(f"Unknown job pool: {pool}")
+
+    with _lock, _open() as conn:
+        if key is not None:
+            existing = conn.execute(
+                "SELECT id FROM jobs WHERE kind = ? AND key = ? AND state IN ('queued', 'running') "
+                "ORDER BY created_at DESC LIMIT 1",
+                (kind, key)
+            ).fetchone()
+            if existing:
+                return existing['id']
+
+        job_id = uuid.uuid4().hex[:12]
+        conn.execute(
+            "INSERT INTO jobs (id, kind, key, label, state, pid, boot_id, created_at) "
+            "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)",
+            (job_id, kind, key, label or kind, os.getpid(), _BOOT_ID, time.time())
+        )
+
+    _get_executor(pool).submit(_run, job_id, func, args, kwargs)
+    return job_id
+
+
+def _row_to_job(row: sqlite3.Row, full: bool = True) -> Dict:
+    job = {k: row[k] for k in row.keys() if k not in ("events", "partial", "result")}
+    if full:
+        job["events"] = json.loads(row['events'])
+        job["partial"] = json.loads(row['partial'])
+        job["result"] = json.loads(row['result']) if row['result'] else None
+    return job
+
+
+def get_job(job_id: str) -> Dict:
+    """
+    Look up a job by ID.
+
+    Args:
+        job_id: ID returned by submit_job()
+
+    Returns:
+        Job dict ("id", "kind", "label", "state", "progress", "message",
+        "events", "partial", "result", "error" and timestamps), or None if unknown
+    """
+    try:
+        with _open() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+    except Exception as e:
+        print(f"Error reading job {job_id}: {e}")
+        return None
+
+
+def list_jobs(kind: str = None, limit: int = 20) -> List[Dict]:
+    """
+    List recent jobs, newest first, without their events or results.
+
+    Args:
+        kind: Optional job category to filter on
+        limit: Maximum number of jobs to return
+
+    Returns:
+        List of job dicts (empty list on error)
+    """
+    try:
+        with _open() as conn:
+            if kind:
+                rows = conn.execute(
+                    "SELECT * FROM jobs WHERE kind = ? ORDER BY created_at DESC LIMIT ?", (kind, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [_row_to_job(row, full=False) for row in rows]
+    except Exception as e:
+        print(f"Error listing jobs: {e}")
+        return []
+
+
+def is_active(job: Dict) -> bool:
+    """Return True if the job is still queued or running."""
+    return bool(job) and job.get("state") in JOB_ACTIVE_STATES
@@ -0,0 +1,36 @@
+-- Convert JSON-as-text columns to native JSONB.
+--
+-- Run once in the Supabase SQL editor, then set SUPABASE_JSON_STORAGE=jsonb
+-- (Streamlit secrets or environment) so the app writes dicts/lists directly.
+-- Readers accept both layouts, so the app keeps working between the two steps,
+-- but writes made in "text" mode after this migration are stored as JSON strings.
+--
+-- Existing values were written with json.dumps, so they parse as JSON as-is.
+-- Empty strings become NULL.
+
+BEGIN;
+
+ALTER TABLE keywords
+    ALTER COLUMN monthly_searches TYPE jsonb USING NULLIF(monthly_searches, '')::jsonb;
+
+ALTER TABLE linkedin_posts
+    ALTER COLUMN post_data TYPE jsonb USING NULLIF(post_data, '')::jsonb;
+
+ALTER TABLE linkedin_company_analysis
+    ALTER COLUMN voice_profile TYPE jsonb USING NULLIF(voice_profile, '')::jsonb,
+    ALTER COLUMN content_pillars TYPE jsonb USING NULLIF(content_pillars, '')::jsonb,
+    ALTER COLUMN engagement_metrics TYPE jsonb USING NULLIF(engagement_metrics, '')::jsonb,
+    ALTER COLUMN posting_strategy TYPE jsonb USING NULLIF(posting_strategy, '')::jsonb,
+    ALTER COLUMN top_posts TYPE jsonb USING NULLIF(top_posts, '')::jsonb,
+    ALTER COLUMN strategic_recommendations TYPE jsonb USING NULLIF(strategic_recommendations, '')::jsonb,
+    ALTER COLUMN ranked_keywords TYPE jsonb USING NULLIF(ranked_keywords, '')::jsonb,
+    ALTER COLUMN ai_perception TYPE jsonb USING NULLIF(ai_perception, '')::jsonb,
+    ALTER COLUMN grok_research TYPE jsonb USING NULLIF(grok_research, '')::jsonb,
+    ALTER COLUMN claude_research TYPE jsonb USING NULLIF(claude_research, '')::jsonb;
+
+ALTER TABLE generated_posts
+    ALTER COLUMN variation_1 TYPE jsonb USING NULLIF(variation_1, '')::jsonb,
+    ALTER COLUMN variation_2 TYPE jsonb USING NULLIF(variation_2, '')::jsonb,
+    ALTER COLUMN variation_3 TYPE jsonb USING NULLIF(variation_3, '')::jsonb;
+
+COMMIT;
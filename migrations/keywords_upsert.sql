@@ -0,0 +1,50 @@
+-- Deduplicate the keywords table and prepare it for KEYWORDS_SAVE_MODE=upsert.
+--
+-- Adds location/language/snapshot-month columns, keeps only the newest row
+-- per (keyword, location_code, language_code, month), adds the unique key the
+-- upsert conflicts on, and creates keyword_history for metric changes.
+-- Existing rows were all fetched for the United States / English defaults.
+
+BEGIN;
+
+ALTER TABLE keywords
+    ADD COLUMN IF NOT EXISTS location_code integer NOT NULL DEFAULT 2840,
+    ADD COLUMN IF NOT EXISTS language_code text NOT NULL DEFAULT 'en',
+    ADD COLUMN IF NOT EXISTS month text,
+    ADD COLUMN IF NOT EXISTS updated_at timestamptz NOT NULL DEFAULT now();
+
+UPDATE keywords
+SET month = to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM')
+WHERE month IS NULL;
+
+ALTER TABLE keywords ALTER COLUMN month SET NOT NULL;
+
+DELETE FROM keywords k
+USING keywords newer
+WHERE k.keyword = newer.keyword
+  AND k.location_code = newer.location_code
+  AND k.language_code = newer.language_code
+  AND k.month = newer.month
+  AND (newer.created_at, newer.id) > (k.created_at, k.id);
+
+ALTER TABLE keywords
+    ADD CONSTRAINT keywords_keyword_location_language_month_key
+    UNIQUE (keyword, location_code, language_code, month);
+
+CREATE TABLE IF NOT EXISTS keyword_history (
+    id bigserial PRIMARY KEY,
+    keyword text NOT NULL,
+    location_code integer NOT NULL,
+    language_code text NOT NULL,
+    month text NOT NULL,
+    search_volume integer,
+    cpc numeric,
+    competition_level text,
+    opportunity_score numeric,
+    recorded_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS keyword_history_keyword_idx
+    ON keyword_history (keyword, location_code, language_code, recorded_at);
+
+COMMIT;
@@ -0,0 +1,106 @@
+-- Normalized per-post LinkedIn storage for LINKEDIN_POSTS_SAVE_MODE=normalized.
+--
+-- Creates linkedin_post (one row per post, keyed on the same identity as
+-- linkedin_post_id(): URN, then post URL, then posted time + text) with typed
+-- engagement columns, and linkedin_post_engagement for engagement over time.
+-- Existing linkedin_posts blobs are backfilled, keeping the newest copy of
+-- each post. linkedin_posts itself is left untouched.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS linkedin_post (
+    post_id text PRIMARY KEY,
+    id bigint GENERATED ALWAYS AS IDENTITY UNIQUE,  -- keyset cursor for iter_table_keyset / analytics mirror
+    company_url text NOT NULL,
+    urn text,
+    post_url text,
+    text text,
+    posted_at timestamptz,
+    likes integer NOT NULL DEFAULT 0,
+    comments integer NOT NULL DEFAULT 0,
+    reposts integer NOT NULL DEFAULT 0,
+    engagement integer GENERATED ALWAYS AS (likes + comments + reposts) STORED,
+    post_data jsonb,
+    first_seen_at timestamptz NOT NULL DEFAULT now(),
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS linkedin_post_company_posted_idx
+    ON linkedin_post (company_url, posted_at DESC);
+
+CREATE INDEX IF NOT EXISTS linkedin_post_company_engagement_idx
+    ON linkedin_post (company_url, engagement DESC);
+
+CREATE INDEX IF NOT EXISTS linkedin_post_updated_idx
+    ON linkedin_post (updated_at, post_id);
+
+CREATE TABLE IF NOT EXISTS linkedin_post_engagement (
+    id bigserial PRIMARY KEY,
+    post_id text NOT NULL REFERENCES linkedin_post (post_id) ON DELETE CASCADE,
+    likes integer NOT NULL DEFAULT 0,
+    comments integer NOT NULL DEFAULT 0,
+    reposts integer NOT NULL DEFAULT 0,
+    recorded_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS linkedin_post_engagement_post_idx
+    ON linkedin_post_engagement (post_id, recorded_at);
+
+-- Backfill from the blob table (post_data may still be text or already jsonb)
+WITH posts AS (
+    SELECT
+        lp.url AS company_url,
+        lp.created_at,
+        p AS post
+    FROM linkedin_posts lp
+    CROSS JOIN LATERAL jsonb_array_elements(
+        CASE WHEN jsonb_typeof(NULLIF(lp.post_data::text, '')::jsonb -> 'data') = 'array'
+             THEN NULLIF(lp.post_data::text, '')::jsonb -> 'data'
+             ELSE '[]'::jsonb END
+    ) AS p
+),
+identified AS (
+    SELECT
+        COALESCE(
+            NULLIF(post ->> 'urn', ''),
+            NULLIF(post ->> 'post_url', ''),
+            NULLIF(post ->> 'url', ''),
+            COALESCE(post ->> 'posted', '') || '|' || left(COALESCE(post ->> 'text', ''), 100)
+        ) AS post_id,
+        company_url,
+        created_at,
+        post
+    FROM posts
+),
+ranked AS (
+    SELECT *, min(created_at) OVER (PARTITION BY post_id) AS first_seen_at
+    FROM identified
+)
+INSERT INTO linkedin_post (
+    post_id, company_url, urn, post_url, text, posted_at,
+    likes, comments, reposts, post_data, first_seen_at, updated_at
+)
+SELECT DISTINCT ON (post_id)
+    post_id,
+    company_url,
+    post ->> 'urn',
+    COALESCE(NULLIF(post ->> 'post_url', ''), post ->> 'url'),
+    post ->> 'text',
+    CASE WHEN post ->> 'posted' ~ '^\d{4}-\d{2}-\d{2}'
+         THEN (post ->> 'posted')::timestamp AT TIME ZONE 'UTC' END,
+    CASE WHEN post ->> 'num_likes' ~ '^\d+$' THEN (post ->> 'num_likes')::integer ELSE 0 END,
+    CASE WHEN post ->> 'num_comments' ~ '^\d+$' THEN (post ->> 'num_comments')::integer ELSE 0 END,
+    CASE WHEN post ->> 'num_reposts' ~ '^\d+$' THEN (post ->> 'num_reposts')::integer ELSE 0 END,
+    post,
+    first_seen_at,
+    created_at
+FROM ranked
+ORDER BY post_id, created_at DESC
+ON CONFLICT (post_id) DO NOTHING;
+
+INSERT INTO linkedin_post_engagement (post_id, likes, comments, reposts, recorded_at)
+SELECT post_id, likes, comments, reposts, updated_at
+FROM linkedin_post p
+WHERE NOT EXISTS (SELECT 1 FROM linkedin_post_engagement e WHERE e.post_id = p.post_id);
+
+COMMIT;
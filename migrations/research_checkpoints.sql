@@ -0,0 +1,18 @@
+-- Research stage checkpoints for RESEARCH_CHECKPOINTS=true.
+--
+-- Each research stage (Grok, Claude, LinkedIn analysis, synthesis) saves
+-- {"completed_at", "input_hash"} in its own column, in the same upsert as
+-- its output, so concurrent stages never overwrite each other's checkpoint.
+-- Competitor rows only use linkedin_checkpoint. synthesis_report keeps the
+-- last synthesized report so an up-to-date synthesis can be reused.
+
+BEGIN;
+
+ALTER TABLE linkedin_company_analysis
+    ADD COLUMN IF NOT EXISTS grok_checkpoint jsonb,
+    ADD COLUMN IF NOT EXISTS claude_checkpoint jsonb,
+    ADD COLUMN IF NOT EXISTS linkedin_checkpoint jsonb,
+    ADD COLUMN IF NOT EXISTS synthesis_checkpoint jsonb,
+    ADD COLUMN IF NOT EXISTS synthesis_report jsonb;
+
+COMMIT;
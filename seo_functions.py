@@ -6,10 +6,18 @@ No cloud infrastructure needed - just API calls.
 """
 
 import requests
+import http_client
 import os
+import re
 import json
+import time
+import threading
+import numpy as np
 from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from supabase import create_client, Client
+from postgrest.types import ReturnMethod
+from api_cache import cached, cache_get_many, cache_set_many, make_cache_key, is_cache_enabled
 
 
 def get_credential(key: str, default=None):
@@ -32,6 +40,7 @@ def get_credential(key: str, default=None):
         return os.environ.get(key, default)
 
 
+@cached("search_volume")
 def get_keyword_data(keyword: str) -> Dict:
     """
     Fetch keyword research data from DataForSEO API.
@@ -57,7 +66,7 @@ def get_keyword_data(keyword: str) -> Dict:
     }]
 
     try:
-        response = requests.post(
+        response = http_client.post(
             api_url,
             json=payload,
             auth=(dataforseo_login, dataforseo_password),
@@ -86,31 +95,179 @@ def get_keyword_data(keyword: str) -> Dict:
         return {"error": f"Error: {str(e)}"}
 
 
-def fetch_linkedin_posts(linkedin_url: str) -> Dict:
+# DataForSEO accepts up to 1000 keywords per search_volume task
+SEARCH_VOLUME_BATCH_SIZE = 1000
+SEARCH_VOLUME_MAX_WORKERS = 4
+
+
+def _fetch_search_volume_batch(
+    keywords: List[str],
+    location_code: int,
+    language_code: str,
+    auth: tuple
+) -> Dict:
     """
-    Fetch LinkedIn company posts from RapidAPI.
+    Send one search_volume/live request for a batch of keywords.
+
+    Returns:
+        Dict with "results" (list of result dicts) or "error"
+    """
+    api_url = "https://api.dataforseo.com/v3/keywords_data/google_ads/search_volume/live"
+
+    payload = [{
+        "keywords": keywords,
+        "language_code": language_code,
+        "location_code": location_code
+    }]
+
+    try:
+        response = http_client.post(
+            api_url,
+            json=payload,
+            auth=auth,
+            headers={"Content-Type": "application/json"},
+            timeout=60
+        )
+
+        response.raise_for_status()
+        data = response.json()
+
+        task = data["tasks"][0] if data.get("tasks") else {}
+        if task.get("status_code") and task["status_code"] != 20000:
+            return {"error": f"DataForSEO error: {task.get('status_message', 'Unknown error')}"}
+
+        return {"results": task.get("result") or []}
+
+    except requests.exceptions.RequestException as e:
+        return {"error": f"API request failed: {str(e)}"}
+    except Exception as e:
+        return {"error": f"Error: {str(e)}"}
+
+
+def get_keyword_data_bulk(
+    keywords: List[str],
+    location_code: int = 2840,
+    language_code: str = "en",
+    bypass_cache: bool = False
+) -> Dict:
+    """
+    Fetch search volume data for many keywords at once from DataForSEO.
+
+    Keywords are de-duplicated and looked up in the response cache first.
+    The rest are split into batches of up to 1000 and the batches are sent
+    concurrently.
 
     Args:
-        linkedin_url: LinkedIn company URL
+        keywords: Keywords to research
+        location_code: DataForSEO location code (default: 2840, United States)
+        language_code: Language code (default: "en")
+        bypass_cache: Skip cached results and fetch everything fresh
 
     Returns:
-        Dictionary with posts data
+        Dictionary with "results" ({keyword: result}), "errors" ({keyword: message})
+        and "error" (set only if nothing could be fetched)
     """
-    rapidapi_key = get_credential("RAPIDAPI_KEY")
+    dataforseo_login = get_credential("DATAFORSEO_LOGIN")
+    dataforseo_password = get_credential("DATAFORSEO_PASSWORD")
 
-    if not rapidapi_key:
-        return {"error": "RapidAPI key not configured"}
+    if not dataforseo_login or not dataforseo_password:
+        return {"error": "DataForSEO credentials not configured"}
+
+    # De-duplicate while keeping input order
+    unique_keywords = list(dict.fromkeys(kw.strip() for kw in keywords if kw and kw.strip()))
+    if not unique_keywords:
+        return {"results": {}, "errors": {}, "error": "No keywords provided"}
+
+    results = {}
+    errors = {}
+
+    # Serve what we can from the per-keyword cache
+    use_cache = is_cache_enabled()
+    cache_keys = {
+        kw: make_cache_key("search_volume", {"keyword": kw, "location_code": location_code, "language_code": language_code})
+        for kw in unique_keywords
+    } if use_cache else {}
+
+    hits = cache_get_many("search_volume", list(cache_keys.values())) if use_cache and not bypass_cache else {}
+
+    to_fetch = []
+    for kw in unique_keywords:
+        if kw in cache_keys and cache_keys[kw] in hits:
+            results[kw] = hits[cache_keys[kw]]
+        else:
+            to_fetch.append(kw)
+
+    batches = [
+        to_fetch[i:i + SEARCH_VOLUME_BATCH_SIZE]
+        for i in range(0, len(to_fetch), SEARCH_VOLUME_BATCH_SIZE)
+    ]
+    auth = (dataforseo_login, dataforseo_password)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(len(batches), SEARCH_VOLUME_MAX_WORKERS))) as executor:
+        futures = {
+            executor.submit(_fetch_search_volume_batch, batch, location_code, language_code, auth): batch
+            for batch in batches
+        }
+
+        for future in as_completed(futures):
+            batch = futures[future]
+            response = future.result()
+
+            if response.get("error"):
+                for kw in batch:
+                    errors[kw] = response["error"]
+                continue
+
+            # DataForSEO may normalise case, so match returned rows case-insensitively
+            by_lower = {r.get("keyword", "").lower(): r for r in response["results"] if r.get("keyword")}
+            fetched = {}
+            for kw in batch:
+                result = by_lower.get(kw.lower())
+                if result:
+                    results[kw] = result
+                    fetched[kw] = result
+                else:
+                    errors[kw] = f"No data found for '{kw}'"
+
+            # One cache transaction (and one eviction pass) per batch
+            if use_cache:
+                cache_set_many("search_volume", {cache_keys[kw]: result for kw, result in fetched.items()})
+
+    # Preserve input order in the results mapping
+    ordered_results = {kw: results[kw] for kw in unique_keywords if kw in results}
+
+    return {
+        "results": ordered_results,
+        "errors": errors,
+        "error": None if ordered_results else "No data found for any keyword"
+    }
+
+
+LINKEDIN_PAGE_SIZE = 50  # posts returned per get-company-posts page
+LINKEDIN_MAX_WORKERS = 4
+LINKEDIN_STORED_POSTS_LIMIT = 1000  # stored posts merged with new ones
+LINKEDIN_STORED_BLOBS_PAGE_SIZE = 20  # linkedin_posts rows per request in blob mode (each holds one fetch's new posts)
+DEFAULT_LINKEDIN_ANALYSIS_MAX_POSTS = 100
+DEFAULT_LINKEDIN_REFRESH_DAYS = 7
+
+
+def _fetch_linkedin_posts_page(linkedin_url: str, start: int, rapidapi_key: str) -> Dict:
+    """
+    Fetch one page of company posts from RapidAPI.
 
+    Returns:
+        {"data": raw page response, "error": None} or {"error": str}
+    """
     api_url = "https://fresh-linkedin-profile-data.p.rapidapi.com/get-company-posts"
 
     params = {
         "linkedin_url": linkedin_url,
-        "start": "0",
+        "start": str(start),
         "sort_by": "recent"
     }
 
     try:
-        response = requests.get(
+        response = http_client.get(
             api_url,
             params=params,
             headers={
@@ -121,17 +278,7 @@ def fetch_linkedin_posts(linkedin_url: str) -> Dict:
         )
 
         response.raise_for_status()
-        data = response.json()
-
-        if data.get("data") and len(data["data"]) > 0:
-            # Return raw response
-            return {
-                "data": data,
-                "raw_response": data,
-                "error": None
-            }
-        else:
-            return {"error": f"No posts found for {linkedin_url}"}
+        return {"data": response.json(), "error": None}
 
     except requests.exceptions.Timeout:
         return {"error": f"API timeout after 120 seconds. The LinkedIn API is very slow - try again later or try a different company."}
@@ -141,6 +288,264 @@ def fetch_linkedin_posts(linkedin_url: str) -> Dict:
         return {"error": f"Error: {str(e)}"}
 
 
+def fetch_linkedin_posts(linkedin_url: str) -> Dict:
+    """
+    Fetch LinkedIn company posts from RapidAPI.
+
+    Only fetches the first page (most recent posts); see
+    fetch_linkedin_posts_incremental() for paging and refreshes.
+
+    Args:
+        linkedin_url: LinkedIn company URL
+
+    Returns:
+        Dictionary with posts data
+    """
+    rapidapi_key = get_credential("RAPIDAPI_KEY")
+
+    if not rapidapi_key:
+        return {"error": "RapidAPI key not configured"}
+
+    page = _fetch_linkedin_posts_page(linkedin_url, 0, rapidapi_key)
+    if page.get("error"):
+        return {"error": page["error"]}
+
+    data = page["data"]
+
+    if data.get("data") and len(data["data"]) > 0:
+        # Return raw response
+        return {
+            "data": data,
+            "raw_response": data,
+            "error": None
+        }
+    else:
+        return {"error": f"No posts found for {linkedin_url}"}
+
+
+def linkedin_post_id(post: Dict) -> str:
+    """Stable identity for a LinkedIn post: URN, then URL, then posted time + text."""
+    return str(
+        post.get('urn')
+        or post.get('post_url')
+        or post.get('url')
+        or f"{post.get('posted', '')}|{(post.get('text') or '')[:100]}"
+    )
+
+
+def _linkedin_post_engagement(post: Dict) -> tuple:
+    """(likes, comments, reposts) of a RapidAPI post dict, for change detection."""
+    return (_to_int(post.get('num_likes')), _to_int(post.get('num_comments')), _to_int(post.get('num_reposts')))
+
+
+def linkedin_refresh_cutoff() -> str:
+    """
+    Oldest "posted" timestamp whose stored engagement is re-read on each fetch.
+
+    Set LINKEDIN_REFRESH_DAYS to change the window (default: 7, 0 disables
+    paging past the first already-stored post).
+    """
+    from datetime import datetime, timedelta
+
+    days = float(get_credential("LINKEDIN_REFRESH_DAYS", DEFAULT_LINKEDIN_REFRESH_DAYS))
+    return (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def get_stored_linkedin_posts(linkedin_url: str) -> List[Dict]:
+    """
+    Return the stored posts for a LinkedIn URL.
+
+    In blob mode each linkedin_posts row holds the posts fetched at one time,
+    so all of the company's rows are read newest-first and merged, keeping the
+    newest copy of each post.
+
+    Args:
+        linkedin_url: LinkedIn company URL
+
+    Returns:
+        List of post dicts (most recent first), empty if nothing is stored
+    """
+    if linkedin_posts_save_mode() == "normalized":
+        return query_linkedin_posts(company_url=linkedin_url, limit=LINKEDIN_STORED_POSTS_LIMIT)
+
+    try:
+        posts = []
+        seen_ids = set()
+
+        for row in iter_table_keyset(
+            'linkedin_posts',
+            columns='id, created_at, post_data',
+            page_size=LINKEDIN_STORED_BLOBS_PAGE_SIZE,
+            filters={'url': linkedin_url}
+        ):
+            post_data = _decode_json_field(row.get('post_data'), {})
+            for post in post_data.get('data') or []:
+                post_id = linkedin_post_id(post)
+                if post_id not in seen_ids:
+                    seen_ids.add(post_id)
+                    posts.append(post)
+            if len(posts) >= LINKEDIN_STORED_POSTS_LIMIT:
+                break
+
+        posts.sort(key=lambda post: str(post.get('posted') or ''), reverse=True)
+        return posts[:LINKEDIN_STORED_POSTS_LIMIT]
+
+    except Exception as e:
+        print(f"Error retrieving stored LinkedIn posts from Supabase: {e}")
+        return []
+
+
+def fetch_linkedin_posts_incremental(
+    linkedin_url: str,
+    max_posts: int = 100,
+    since: str = None,
+    max_workers: int = LINKEDIN_MAX_WORKERS
+) -> Dict:
+    """
+    Fetch only posts newer than those already stored, paging as needed.
+
+    Pages (start=0, 50, 100, ...) are requested concurrently in waves and
+    read newest-first. Already-stored posts on fetched pages are re-observed
+    with their current engagement; paging continues past them while they are
+    within the refresh window (LINKEDIN_REFRESH_DAYS), and otherwise stops
+    after the page holding the first stored post. Fetching also stops at the
+    first post older than `since`, or after `max_posts` new posts.
+
+    Fetched posts replace their stored copies in "data". "new_raw_response"
+    holds only new posts and stored posts whose engagement changed, and is
+    what callers should save so storage grows with changes rather than with
+    the full history.
+
+    Args:
+        linkedin_url: LinkedIn company URL
+        max_posts: Maximum number of new posts to fetch
+        since: Optional oldest "posted" timestamp to fetch back to (e.g. "2025-01-01")
+        max_workers: Pages fetched concurrently per wave
+
+    Returns:
+        Same shape as fetch_linkedin_posts() with all (merged) posts, plus
+        "new_posts" (count fetched this time), "refreshed_posts" (stored posts
+        whose engagement changed) and "new_raw_response" (the response with
+        only those posts, None when there are none)
+    """
+    rapidapi_key = get_credential("RAPIDAPI_KEY")
+
+    if not rapidapi_key:
+        return {"error": "RapidAPI key not configured"}
+
+    stored_posts = get_stored_linkedin_posts(linkedin_url)
+    stored_by_id = {linkedin_post_id(post): post for post in stored_posts}
+    refresh_cutoff = linkedin_refresh_cutoff()
+
+    fetched_posts = []  # new and re-observed posts, in page (newest-first) order
+    new_posts = []
+    refreshed_posts = []
+    seen_ids = set()
+    first_page = None
+    next_start = 0
+    reached_end = False
+    refreshing = False
+
+    # A tracked company usually has only a few new posts: check the first page alone
+    wave_size = 1 if stored_posts else max_workers
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while not reached_end and len(new_posts) < max_posts:
+            # Never request more pages than max_posts still needs
+            pages_needed = -(-(max_posts - len(new_posts)) // LINKEDIN_PAGE_SIZE)
+            starts = [next_start + i * LINKEDIN_PAGE_SIZE for i in range(min(wave_size, pages_needed))]
+            next_start = starts[-1] + LINKEDIN_PAGE_SIZE
+            pages = list(executor.map(lambda start: _fetch_linkedin_posts_page(linkedin_url, start, rapidapi_key), starts))
+
+            for page in pages:
+                if page.get("error"):
+                    if first_page is None and not stored_posts:
+                        return {"error": page["error"]}
+                    print(f"LinkedIn paging stopped for {linkedin_url}: {page['error']}")
+                    reached_end = True
+                    break
+
+                if first_page is None:
+                    first_page = page["data"]
+
+                posts = page["data"].get("data") or []
+                found_stored = False
+
+                for post in posts:
+                    post_id = linkedin_post_id(post)
+                    posted = str(post.get('posted') or '')
+
+                    if since and posted and posted < since:
+                        reached_end = True
+                        break
+                    if post_id in seen_ids:
+                        continue
+
+                    seen_ids.add(post_id)
+                    fetched_posts.append(post)
+
+                    if post_id in stored_by_id:
+                        # Already stored: keep the fresh engagement, record it only if it changed
+                        found_stored = True
+                        if _linkedin_post_engagement(post) != _linkedin_post_engagement(stored_by_id[post_id]):
+                            refreshed_posts.append(post)
+                    else:
+                        new_posts.append(post)
+                        if len(new_posts) >= max_posts:
+                            reached_end = True
+                            break
+
+                # Past the newest stored post, keep paging only to refresh recent engagement
+                refreshing = refreshing or found_stored
+                oldest_posted = str(posts[-1].get('posted') or '') if posts else ''
+                if refreshing and not (oldest_posted and oldest_posted >= refresh_cutoff):
+                    reached_end = True
+
+                if reached_end or len(posts) < LINKEDIN_PAGE_SIZE:
+                    reached_end = True
+                    break
+
+            # Refresh paging usually needs one more page at most; new history needs full waves
+            wave_size = 1 if refreshing else max_workers
+
+    merged = fetched_posts + [post for post in stored_posts if linkedin_post_id(post) not in seen_ids]
+
+    if not merged:
+        return {"error": f"No posts found for {linkedin_url}"}
+
+    data = dict(first_page or {}, data=merged)
+    changed_ids = {linkedin_post_id(post) for post in new_posts + refreshed_posts}
+    changed = [post for post in fetched_posts if linkedin_post_id(post) in changed_ids]
+
+    return {
+        "data": data,
+        "raw_response": data,
+        "new_raw_response": dict(first_page or {}, data=changed) if changed else None,
+        "new_posts": len(new_posts),
+        "refreshed_posts": len(refreshed_posts),
+        "error": None
+    }
+
+
+def linkedin_analysis_posts(posts: List[Dict]) -> List[Dict]:
+    """
+    Return the most recent posts to send to the LLM analysis.
+
+    Incremental fetches return the whole stored history; analysing only a
+    recent window keeps prompt cost and cache keys stable between refreshes.
+    Set LINKEDIN_ANALYSIS_MAX_POSTS to change the window (default: 100).
+
+    Args:
+        posts: Post dicts, most recent first
+
+    Returns:
+        At most LINKEDIN_ANALYSIS_MAX_POSTS posts
+    """
+    max_posts = int(get_credential("LINKEDIN_ANALYSIS_MAX_POSTS", DEFAULT_LINKEDIN_ANALYSIS_MAX_POSTS))
+    return posts[:max_posts]
+
+
+@cached("keywords_for_keywords")
 def get_keyword_suggestions(seed_keyword: str, limit: int = 100) -> Dict:
     """
     Get related keyword suggestions from DataForSEO.
@@ -168,7 +573,7 @@ def get_keyword_suggestions(seed_keyword: str, limit: int = 100) -> Dict:
     }]
 
     try:
-        response = requests.post(
+        response = http_client.post(
             api_url,
             json=payload,
             auth=(dataforseo_login, dataforseo_password),
@@ -197,6 +602,7 @@ def get_keyword_suggestions(seed_keyword: str, limit: int = 100) -> Dict:
         return {"error": f"Error: {str(e)}"}
 
 
+@cached("keywords_for_site")
 def get_keywords_for_site(url: str, limit: int = 100) -> Dict:
     """
     Get keywords for a competitor website from DataForSEO.
@@ -224,7 +630,7 @@ def get_keywords_for_site(url: str, limit: int = 100) -> Dict:
     }]
 
     try:
-        response = requests.post(
+        response = http_client.post(
             api_url,
             json=payload,
             auth=(dataforseo_login, dataforseo_password),
@@ -254,6 +660,7 @@ def get_keywords_for_site(url: str, limit: int = 100) -> Dict:
         return {"error": f"Error: {str(e)}"}
 
 
+@cached("ranked_keywords")
 def get_ranked_keywords_for_domain(
     domain: str,
     limit: int = 500,
@@ -304,7 +711,7 @@ def get_ranked_keywords_for_domain(
         ]
 
     try:
-        response = requests.post(
+        response = http_client.post(
             api_url,
             json=payload,
             auth=(dataforseo_login, dataforseo_password),
@@ -441,7 +848,7 @@ def query_llm_about_company(
         }]
 
         try:
-            response = requests.post(
+            response = http_client.post(
                 api_url,
                 json=payload,
                 auth=(dataforseo_login, dataforseo_password),
@@ -655,184 +1062,863 @@ def generate_recommendation(keyword_data: Dict) -> str:
     return rec
 
 
-# Database functions
-
-def get_supabase_client() -> Client:
-    """Get Supabase client."""
-    url = get_credential("SUPABASE_URL")
-    key = get_credential("SUPABASE_ANON_KEY")
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+               "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
 
-    if not url or not key:
-        raise ValueError("Supabase credentials not configured. Set SUPABASE_URL and SUPABASE_ANON_KEY environment variables.")
 
-    return create_client(url, key)
+def _enrich_keyword(keyword_data: Dict) -> Dict:
+    """Enrich a single keyword with the per-dict helper functions."""
+    kw_copy = keyword_data.copy()
+    kw_copy["opportunity_score"] = calculate_opportunity_score(keyword_data)
+    kw_copy["growth_rate"] = calculate_growth_rate(keyword_data)
+    seasonality = detect_seasonality(keyword_data)
+    kw_copy["is_seasonal"] = seasonality["is_seasonal"]
+    kw_copy["peak_months"] = ", ".join(seasonality["peak_months"][:3])
+    kw_copy["recommendation"] = generate_recommendation(keyword_data)
+    return kw_copy
 
 
-def save_keywords_to_db(keywords_data: List[Dict]) -> bool:
+def _build_monthly_matrix(monthly_lists: List[List[Dict]]):
     """
-    Save keywords data to Supabase.
-
-    Args:
-        keywords_data: List of keyword dictionaries
+    Parse every keyword's monthly_searches once into padded keywords x months arrays.
 
     Returns:
-        True if successful, False otherwise
+        (volumes, months, lengths, bad_rows) - bad_rows flags keywords whose history
+        has non-numeric values and must be handled by the per-dict functions
     """
-    try:
-        supabase = get_supabase_client()
+    n = len(monthly_lists)
+    lengths = np.fromiter((len(m) for m in monthly_lists), dtype=np.int64, count=n)
+    width = max(int(lengths.max()) if n else 0, 1)
 
-        # Prepare data for bulk insert
-        data_to_insert = []
-        for kw in keywords_data:
-            data_to_insert.append({
-                'keyword': kw.get('keyword'),
-                'search_volume': kw.get('search_volume'),
-                'cpc': kw.get('cpc'),
-                'competition_level': kw.get('competition_level'),
-                'opportunity_score': kw.get('opportunity_score'),
-                'growth_rate': kw.get('growth_rate'),
-                'is_seasonal': kw.get('is_seasonal'),
-                'peak_months': kw.get('peak_months'),
-                'recommendation': kw.get('recommendation'),
-                'monthly_searches': json.dumps(kw.get('monthly_searches', []))
-            })
+    volumes = np.zeros((n, width), dtype=np.float64)
+    months = np.zeros((n, width), dtype=np.int64)
+    bad_rows = np.zeros(n, dtype=bool)
 
-        # Bulk insert
-        response = supabase.table('keywords').insert(data_to_insert).execute()
-        return True
+    rows = np.repeat(np.arange(n), lengths)
+    cols = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
 
-    except Exception as e:
-        print(f"Error saving keywords to Supabase: {e}")
-        return False
+    try:
+        flat_volumes = np.array([m.get("search_volume", 0) or 0 for monthly in monthly_lists for m in monthly])
+        flat_months = np.array(
+            [m.get("month") or 0 for monthly in monthly_lists for m in monthly], dtype=np.int64
+        )
+        if flat_volumes.size and flat_volumes.dtype.kind not in "biuf":
+            raise TypeError("non-numeric search volume")
+        volumes[rows, cols] = flat_volumes
+        months[rows, cols] = flat_months
+    except (TypeError, ValueError):
+        # Malformed history somewhere - parse row by row and flag the bad ones
+        for i, monthly in enumerate(monthly_lists):
+            try:
+                row_volumes = [m.get("search_volume", 0) or 0 for m in monthly]
+                if not all(isinstance(v, (int, float)) for v in row_volumes):
+                    raise TypeError("non-numeric search volume")
+                volumes[i, :len(monthly)] = row_volumes
+                months[i, :len(monthly)] = [m.get("month") or 0 for m in monthly]
+            except (TypeError, ValueError):
+                bad_rows[i] = True
 
+    return volumes, months, lengths, bad_rows
 
-def save_linkedin_posts_to_db(url: str, posts_data: Dict) -> bool:
+
+def enrich_keywords(keywords_data: List[Dict]) -> List[Dict]:
     """
-    Save LinkedIn posts data to Supabase.
+    Add opportunity_score, growth_rate, is_seasonal, peak_months and recommendation
+    to every keyword in one batch.
+
+    Equivalent to calling calculate_opportunity_score, calculate_growth_rate,
+    detect_seasonality and generate_recommendation on each keyword, but monthly
+    histories are parsed once into a keywords x months matrix and every metric is
+    computed with vectorized NumPy passes over it.
 
     Args:
-        url: LinkedIn URL
-        posts_data: Posts data dictionary
+        keywords_data: List of keyword dicts (DataForSEO results)
 
     Returns:
-        True if successful, False otherwise
+        List of enriched keyword dict copies, in input order
     """
-    try:
-        supabase = get_supabase_client()
-
-        data_to_insert = {
-            'url': url,
-            'post_data': json.dumps(posts_data)
-        }
+    n = len(keywords_data)
+    if n == 0:
+        return []
 
-        response = supabase.table('linkedin_posts').insert(data_to_insert).execute()
-        return True
+    monthly_lists = [kw.get("monthly_searches") or [] for kw in keywords_data]
+    volumes, months, lengths, bad_rows = _build_monthly_matrix(monthly_lists)
 
-    except Exception as e:
-        print(f"Error saving LinkedIn posts to Supabase: {e}")
-        return False
+    row_index = np.arange(n)
+    valid = np.arange(volumes.shape[1])[None, :] < lengths[:, None]
+    has_history = lengths >= 2
 
+    first = volumes[:, 0]
+    last = volumes[row_index, np.maximum(lengths - 1, 0)]
 
-def get_all_keywords_from_db(limit: int = 1000) -> List[Dict]:
-    """
-    Retrieve keywords from Supabase.
+    # Scalar inputs for the opportunity score (same coercion rules as calculate_opportunity_score)
+    search_volume = np.zeros(n, dtype=np.float64)
+    competition = np.full(n, 0.5, dtype=np.float64)
+    score_valid = np.ones(n, dtype=bool)
+    for i, kw in enumerate(keywords_data):
+        comp = kw.get("competition")
+        if comp is None or comp == 0:
+            comp = 0.5
+        try:
+            search_volume[i] = float(kw.get("search_volume", 0) or 0)
+            competition[i] = float(comp)
+        except (TypeError, ValueError):
+            score_valid[i] = False
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Opportunity score: last month falls back to 1 when missing/zero
+        score_old = np.where(last == 0, 1.0, last)
+        growth_factor = np.where(has_history & (score_old > 0), first / score_old, 1.0)
+        raw_scores = (search_volume * growth_factor) / (competition * 100)
+        scores = np.where(score_valid & np.isfinite(raw_scores), np.minimum(raw_scores, 10.0), 0.0)
+
+        # Growth rate: percentage change from oldest to most recent month
+        growth = np.where(has_history & (last != 0), ((first - last) / last) * 100, 0.0)
+
+        # Seasonality: months >25% above / below the keyword's own average
+        averages = np.where(lengths > 0, (volumes * valid).sum(axis=1) / np.maximum(lengths, 1), 0.0)
+
+    seasonal_rows = (lengths >= 12) & (averages != 0)
+    # Same month filter as detect_seasonality: skip missing months and ones that would raise IndexError
+    named_month = (months != 0) & (months >= -11) & (months <= 12)
+    candidate = valid & named_month & seasonal_rows[:, None]
+    peak_mask = candidate & (volumes > averages[:, None] * 1.25)
+    low_mask = candidate & (volumes < averages[:, None] * 0.75)
+    is_seasonal = peak_mask.any(axis=1) | low_mask.any(axis=1)
+
+    # Collect peak month names per keyword (row-major order keeps months in input order)
+    peak_rows, peak_cols = np.nonzero(peak_mask)
+    peak_names = np.array(MONTH_NAMES)[(months[peak_rows, peak_cols] - 1) % 12]
+    peaks_by_row = {}
+    for row, name in zip(peak_rows.tolist(), peak_names.tolist()):
+        peaks_by_row.setdefault(row, []).append(name)
+
+    enriched = []
+    for i, kw in enumerate(keywords_data):
+        if bad_rows[i]:
+            enriched.append(_enrich_keyword(kw))
+            continue
 
-    Args:
-        limit: Maximum number of records to return
+        # round() per value keeps Python's rounding (np.round can differ on ties)
+        score = round(float(scores[i]), 1)
+        growth_rate = round(float(growth[i]), 1)
+        peak_months = peaks_by_row.get(i, [])
 
-    Returns:
-        List of keyword dictionaries
-    """
-    try:
-        supabase = get_supabase_client()
+        if score >= 7.0:
+            rec = "✅ Excellent opportunity! "
+        elif score >= 4.0:
+            rec = "⚠️ Good opportunity with caveats. "
+        else:
+            rec = "❌ Difficult keyword. "
+
+        if growth_rate > 10:
+            rec += f"Growing fast (+{growth_rate}%). "
+        elif growth_rate < -10:
+            rec += f"Declining ({growth_rate}%). "
+        if is_seasonal[i] and peak_months:
+            rec += f"Peaks in {', '.join(peak_months[:3])}. "
+        competition_level = kw.get("competition_level", "UNKNOWN")
+        if competition_level == "HIGH":
+            rec += "High competition - consider long-tail variations."
+        elif competition_level == "LOW":
+            rec += "Low competition - great for quick wins!"
+
+        kw_copy = kw.copy()
+        kw_copy["opportunity_score"] = score
+        kw_copy["growth_rate"] = growth_rate
+        kw_copy["is_seasonal"] = bool(is_seasonal[i])
+        kw_copy["peak_months"] = ", ".join(peak_months[:3])
+        kw_copy["recommendation"] = rec
+        enriched.append(kw_copy)
+
+    return enriched
 
-        response = supabase.table('keywords').select('*').order('created_at', desc=True).limit(limit).execute()
 
-        keywords = []
-        for item in response.data:
-            kw = {
-                'keyword': item.get('keyword'),
-                'search_volume': item.get('search_volume'),
-                'cpc': item.get('cpc'),
-                'competition_level': item.get('competition_level'),
-                'opportunity_score': item.get('opportunity_score'),
-                'growth_rate': item.get('growth_rate'),
-                'is_seasonal': item.get('is_seasonal'),
-                'peak_months': item.get('peak_months'),
-                'recommendation': item.get('recommendation'),
-                'monthly_searches': json.loads(item.get('monthly_searches', '[]')),
-                'created_at': item.get('created_at')
-            }
-            keywords.append(kw)
+# Database functions
 
-        return keywords
+def db_diagnostics_enabled() -> bool:
+    """Return True if DB_DIAGNOSTICS is set, enabling verbose logging and verification queries."""
+    return str(get_credential("DB_DIAGNOSTICS", "false")).strip().lower() in ("1", "true", "yes", "on")
 
-    except Exception as e:
-        print(f"Error retrieving keywords from Supabase: {e}")
-        return []
 
+def json_storage_mode() -> str:
+    """
+    Return how nested data is stored in Supabase: "text" or "jsonb".
 
-def get_all_linkedin_posts_from_db(limit: int = 100) -> List[Dict]:
+    Set SUPABASE_JSON_STORAGE=jsonb after running migrations/jsonb_columns.sql.
+    In "text" mode values are json.dumps'd into text columns (the original layout).
     """
-    Retrieve LinkedIn posts from Supabase.
+    mode = str(get_credential("SUPABASE_JSON_STORAGE", "text")).strip().lower()
+    return "jsonb" if mode == "jsonb" else "text"
 
-    Args:
-        limit: Maximum number of records to return
 
-    Returns:
-        List of post dictionaries
+def _encode_json(value):
+    """Prepare a nested value for a JSON column in the configured storage mode."""
+    if json_storage_mode() == "jsonb":
+        return value
+    return json.dumps(value)
+
+
+def _decode_json_field(value, default):
+    """
+    Decode a stored JSON column, returning default for empty or invalid values.
+
+    Works for both storage modes: text columns come back as JSON strings,
+    JSONB columns come back already decoded.
     """
+    if value is None or value == '':
+        return default
+    if not isinstance(value, str):
+        return value
     try:
-        supabase = get_supabase_client()
+        return json.loads(value)
+    except (TypeError, ValueError):
+        return default
 
-        response = supabase.table('linkedin_posts').select('*').order('created_at', desc=True).limit(limit).execute()
 
-        posts = []
-        for item in response.data:
-            post = {
-                'url': item.get('url'),
-                'post_data': json.loads(item.get('post_data', '{}')),
-                'created_at': item.get('created_at')
-            }
-            posts.append(post)
+# Process-wide Supabase client, shared across reruns, sessions and threads
+SUPABASE_HEALTH_CHECK_INTERVAL = 300  # seconds between liveness checks
 
-        return posts
+_supabase_client = None
+_supabase_credentials = None
+_supabase_checked_at = 0.0
+_supabase_lock = threading.Lock()
 
+
+def _supabase_is_healthy(client: Client) -> bool:
+    """Run a minimal query to confirm the client can still reach the database."""
+    try:
+        client.table('linkedin_company_analysis').select('id').limit(1).execute()
+        return True
     except Exception as e:
-        print(f"Error retrieving LinkedIn posts from Supabase: {e}")
-        return []
+        print(f"Supabase health check failed: {e}")
+        return False
 
 
-def save_company_analysis(analysis_dict: Dict) -> bool:
+def get_supabase_client() -> Client:
     """
-    Save company-level LinkedIn analysis to Supabase.
-
-    Args:
-        analysis_dict: Complete analysis dict from analyze_company_complete()
-                      For Company Research tool: linkedin_company_url, website_url, grok_research, claude_research
-                      For Company Intelligence tool: company_url, company_name, voice_profile, etc.
+    Get the shared Supabase client.
 
-    Returns:
-        True if successful, False otherwise
+    The client is created lazily on first use and reused afterwards. It is
+    rebuilt if SUPABASE_URL / SUPABASE_ANON_KEY change, or if the periodic
+    health check (every SUPABASE_HEALTH_CHECK_INTERVAL seconds) fails.
     """
-    try:
-        supabase = get_supabase_client()
+    global _supabase_client, _supabase_credentials, _supabase_checked_at
 
-        data = {}
+    url = get_credential("SUPABASE_URL")
+    key = get_credential("SUPABASE_ANON_KEY")
 
-        # Add fields based on what's provided in analysis_dict
-        if 'company_url' in analysis_dict:
+    if not url or not key:
+        raise ValueError("Supabase credentials not configured. Set SUPABASE_URL and SUPABASE_ANON_KEY environment variables.")
+
+    with _supabase_lock:
+        now = time.time()
+
+        if _supabase_client is not None and _supabase_credentials == (url, key):
+            if now - _supabase_checked_at < SUPABASE_HEALTH_CHECK_INTERVAL:
+                return _supabase_client
+            if _supabase_is_healthy(_supabase_client):
+                _supabase_checked_at = now
+                return _supabase_client
+
+        _supabase_client = create_client(url, key)
+        _supabase_credentials = (url, key)
+        _supabase_checked_at = now
+
+        return _supabase_client
+
+
+def reset_supabase_client() -> None:
+    """Drop the shared Supabase client so the next call creates a fresh one."""
+    global _supabase_client, _supabase_credentials
+
+    with _supabase_lock:
+        _supabase_client = None
+        _supabase_credentials = None
+
+
+# Metrics compared to decide whether a keyword changed enough to record history
+KEYWORD_HISTORY_FIELDS = ['search_volume', 'cpc', 'competition_level', 'opportunity_score']
+KEYWORD_UPSERT_CONFLICT = 'keyword,location_code,language_code,month'
+KEYWORD_LOOKUP_BATCH_SIZE = 200
+
+
+def keyword_save_mode() -> str:
+    """
+    Return how save_keywords_to_db writes rows: "insert" or "upsert".
+
+    Set KEYWORDS_SAVE_MODE=upsert after running migrations/keywords_upsert.sql.
+    "insert" appends a row per keyword per search (the original behaviour).
+    """
+    mode = str(get_credential("KEYWORDS_SAVE_MODE", "insert")).strip().lower()
+    return "upsert" if mode == "upsert" else "insert"
+
+
+def _keyword_row(kw: Dict) -> Dict:
+    """Build a keywords table row from an enriched keyword dict."""
+    return {
+        'keyword': kw.get('keyword'),
+        'search_volume': kw.get('search_volume'),
+        'cpc': kw.get('cpc'),
+        'competition_level': kw.get('competition_level'),
+        'opportunity_score': kw.get('opportunity_score'),
+        'growth_rate': kw.get('growth_rate'),
+        'is_seasonal': kw.get('is_seasonal'),
+        'peak_months': kw.get('peak_months'),
+        'recommendation': kw.get('recommendation'),
+        'monthly_searches': _encode_json(kw.get('monthly_searches', []))
+    }
+
+
+def _keyword_metrics_changed(old: Dict, new: Dict) -> bool:
+    """Compare tracked metrics, treating numerically equal values (5 vs 5.0) as unchanged."""
+    for field in KEYWORD_HISTORY_FIELDS:
+        old_value, new_value = old.get(field), new.get(field)
+        if isinstance(old_value, (int, float)) and isinstance(new_value, (int, float)):
+            if abs(float(old_value) - float(new_value)) > 1e-9:
+                return True
+        elif old_value != new_value:
+            return True
+    return False
+
+
+def _upsert_keywords(supabase: Client, rows: List[Dict], location_code: int, language_code: str) -> None:
+    """
+    Upsert keyword rows for the current snapshot month and record history for changes.
+
+    Rows are keyed on (keyword, location_code, language_code, month), so repeated
+    searches update metrics in place. A keyword_history row is written only
+    for new keywords or when a tracked metric differs from the stored value.
+    """
+    from datetime import datetime
+
+    month = datetime.utcnow().strftime('%Y-%m')
+    now = datetime.utcnow().isoformat()
+
+    # Last occurrence wins; Postgres rejects an upsert touching the same key twice
+    by_key = {}
+    for row in rows:
+        if not row.get('keyword'):
+            continue
+        row = dict(row, location_code=location_code, language_code=language_code, month=month, updated_at=now)
+        by_key[row['keyword']] = row
+    rows = list(by_key.values())
+
+    if not rows:
+        return
+
+    # Current values for this month, to decide which keywords changed
+    existing = {}
+    keywords = list(by_key)
+    for i in range(0, len(keywords), KEYWORD_LOOKUP_BATCH_SIZE):
+        response = supabase.table('keywords')\
+            .select(', '.join(['keyword'] + KEYWORD_HISTORY_FIELDS))\
+            .eq('location_code', location_code)\
+            .eq('language_code', language_code)\
+            .eq('month', month)\
+            .in_('keyword', keywords[i:i + KEYWORD_LOOKUP_BATCH_SIZE])\
+            .execute()
+        for item in response.data or []:
+            existing[item.get('keyword')] = item
+
+    history = [
+        {
+            'keyword': row['keyword'],
+            'location_code': location_code,
+            'language_code': language_code,
+            'month': month,
+            **{field: row.get(field) for field in KEYWORD_HISTORY_FIELDS},
+            'recorded_at': now
+        }
+        for row in rows
+        if row['keyword'] not in existing or _keyword_metrics_changed(existing[row['keyword']], row)
+    ]
+
+    supabase.table('keywords')\
+        .upsert(rows, on_conflict=KEYWORD_UPSERT_CONFLICT, returning=ReturnMethod.minimal)\
+        .execute()
+
+    if history:
+        supabase.table('keyword_history')\
+            .insert(history, returning=ReturnMethod.minimal)\
+            .execute()
+
+
+def save_keywords_to_db(
+    keywords_data: List[Dict],
+    location_code: int = 2840,
+    language_code: str = "en"
+) -> bool:
+    """
+    Save keywords data to Supabase.
+
+    In "upsert" mode (KEYWORDS_SAVE_MODE=upsert) each keyword is stored once
+    per location, language and month, with changes tracked in keyword_history.
+    Otherwise every keyword is inserted as a new row.
+
+    Args:
+        keywords_data: List of keyword dictionaries
+        location_code: DataForSEO location code the data was fetched for (default: 2840)
+        language_code: Language code the data was fetched for (default: "en")
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        supabase = get_supabase_client()
+
+        rows = [_keyword_row(kw) for kw in keywords_data]
+
+        if keyword_save_mode() == "upsert":
+            _upsert_keywords(supabase, rows, location_code, language_code)
+        else:
+            # Bulk insert
+            supabase.table('keywords').insert(rows).execute()
+
+        return True
+
+    except Exception as e:
+        print(f"Error saving keywords to Supabase: {e}")
+        return False
+
+
+LINKEDIN_POST_ENGAGEMENT_FIELDS = ['likes', 'comments', 'reposts']
+LINKEDIN_POST_LOOKUP_BATCH_SIZE = 100  # post ids are URNs/URLs, keep .in_() query strings short
+
+
+def linkedin_posts_save_mode() -> str:
+    """
+    Return how LinkedIn posts are stored: "blob" or "normalized".
+
+    Set LINKEDIN_POSTS_SAVE_MODE=normalized after running migrations/linkedin_post.sql.
+    "blob" inserts the whole RapidAPI response into linkedin_posts per fetch
+    (the original behaviour); "normalized" upserts one linkedin_post row per post.
+    """
+    mode = str(get_credential("LINKEDIN_POSTS_SAVE_MODE", "blob")).strip().lower()
+    return "normalized" if mode == "normalized" else "blob"
+
+
+def _to_int(value) -> int:
+    """Parse an engagement count that may arrive as int, float, string or None."""
+    try:
+        return int(float(str(value).replace(',', '')))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _parse_posted_at(value):
+    """Convert a post's "posted" value (e.g. "2025-03-18 15:02:11") to ISO 8601, or None."""
+    from datetime import datetime
+
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).strip().replace('Z', '+00:00')).isoformat()
+    except ValueError:
+        return None
+
+
+def _linkedin_post_row(company_url: str, post: Dict) -> Dict:
+    """Build a linkedin_post table row from a RapidAPI post dict."""
+    return {
+        'post_id': linkedin_post_id(post),
+        'company_url': company_url,
+        'urn': post.get('urn'),
+        'post_url': post.get('post_url') or post.get('url'),
+        'text': post.get('text'),
+        'posted_at': _parse_posted_at(post.get('posted')),
+        'likes': _to_int(post.get('num_likes')),
+        'comments': _to_int(post.get('num_comments')),
+        'reposts': _to_int(post.get('num_reposts')),
+        # linkedin_post.post_data is created as jsonb, so the dict is sent as-is
+        'post_data': post
+    }
+
+
+def _upsert_linkedin_posts(supabase: Client, company_url: str, posts: List[Dict]) -> None:
+    """
+    Upsert one linkedin_post row per post and record engagement changes.
+
+    Rows are keyed on post_id, so posts repeated across fetches are stored
+    once. A linkedin_post_engagement row is written for new posts and
+    whenever likes, comments or reposts differ from the stored values.
+    """
+    from datetime import datetime
+
+    now = datetime.utcnow().isoformat()
+
+    # Last occurrence wins; Postgres rejects an upsert touching the same key twice
+    by_id = {}
+    for post in posts:
+        row = dict(_linkedin_post_row(company_url, post), updated_at=now)
+        by_id[row['post_id']] = row
+    rows = list(by_id.values())
+
+    if not rows:
+        return
+
+    existing = {}
+    post_ids = list(by_id)
+    for i in range(0, len(post_ids), LINKEDIN_POST_LOOKUP_BATCH_SIZE):
+        response = supabase.table('linkedin_post')\
+            .select(', '.join(['post_id'] + LINKEDIN_POST_ENGAGEMENT_FIELDS))\
+            .in_('post_id', post_ids[i:i + LINKEDIN_POST_LOOKUP_BATCH_SIZE])\
+            .execute()
+        for item in response.data or []:
+            existing[item.get('post_id')] = item
+
+    history = [
+        {
+            'post_id': row['post_id'],
+            **{field: row[field] for field in LINKEDIN_POST_ENGAGEMENT_FIELDS},
+            'recorded_at': now
+        }
+        for row in rows
+        if row['post_id'] not in existing
+        or any(_to_int(existing[row['post_id']].get(field)) != row[field] for field in LINKEDIN_POST_ENGAGEMENT_FIELDS)
+    ]
+
+    supabase.table('linkedin_post')\
+        .upsert(rows, on_conflict='post_id', returning=ReturnMethod.minimal)\
+        .execute()
+
+    if history:
+        supabase.table('linkedin_post_engagement')\
+            .insert(history, returning=ReturnMethod.minimal)\
+            .execute()
+
+
+def save_linkedin_posts_to_db(url: str, posts_data: Dict) -> bool:
+    """
+    Save LinkedIn posts data to Supabase.
+
+    In "normalized" mode (LINKEDIN_POSTS_SAVE_MODE=normalized) each post is
+    upserted into linkedin_post with engagement changes tracked in
+    linkedin_post_engagement. Otherwise the whole response is inserted into
+    linkedin_posts as one record.
+
+    Args:
+        url: LinkedIn URL
+        posts_data: Posts data dictionary
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        supabase = get_supabase_client()
+
+        if linkedin_posts_save_mode() == "normalized":
+            _upsert_linkedin_posts(supabase, url, posts_data.get('data') or [])
+            return True
+
+        data_to_insert = {
+            'url': url,
+            'post_data': _encode_json(posts_data)
+        }
+
+        response = supabase.table('linkedin_posts').insert(data_to_insert).execute()
+        return True
+
+    except Exception as e:
+        print(f"Error saving LinkedIn posts to Supabase: {e}")
+        return False
+
+
+LINKEDIN_POST_ORDER_COLUMNS = ['posted_at', 'engagement', 'likes', 'comments', 'reposts', 'updated_at']
+
+
+def query_linkedin_posts(
+    company_url: str = None,
+    posted_after: str = None,
+    posted_before: str = None,
+    min_engagement: int = None,
+    order_by: str = 'posted_at',
+    limit: int = 100
+) -> List[Dict]:
+    """
+    Query normalized LinkedIn posts by company, date range and engagement.
+
+    Filters run in Postgres on the typed linkedin_post columns, so only the
+    matching posts are transferred. Requires migrations/linkedin_post.sql.
+
+    Args:
+        company_url: Optional LinkedIn company URL to restrict to
+        posted_after: Optional inclusive lower bound for posted_at (e.g. "2025-01-01")
+        posted_before: Optional exclusive upper bound for posted_at
+        min_engagement: Optional minimum likes + comments + reposts
+        order_by: One of LINKEDIN_POST_ORDER_COLUMNS, highest/newest first
+        limit: Maximum number of posts to return
+
+    Returns:
+        List of post dicts in the RapidAPI shape (empty list on error)
+    """
+    if order_by not in LINKEDIN_POST_ORDER_COLUMNS:
+        print(f"Unsupported LinkedIn post ordering '{order_by}', using posted_at")
+        order_by = 'posted_at'
+
+    try:
+        supabase = get_supabase_client()
+
+        query = supabase.table('linkedin_post').select('post_data')
+
+        if company_url:
+            query = query.eq('company_url', company_url)
+        if posted_after:
+            query = query.gte('posted_at', posted_after)
+        if posted_before:
+            query = query.lt('posted_at', posted_before)
+        if min_engagement is not None:
+            query = query.gte('engagement', min_engagement)
+
+        response = query.order(order_by, desc=True, nullsfirst=False).limit(limit).execute()
+
+        return [_decode_json_field(item.get('post_data'), {}) for item in response.data or []]
+
+    except Exception as e:
+        print(f"Error querying LinkedIn posts from Supabase: {e}")
+        return []
+
+
+def get_linkedin_post_engagement_history(post_id: str) -> List[Dict]:
+    """
+    Return recorded engagement snapshots for one post, oldest first.
+
+    Args:
+        post_id: Post identity from linkedin_post_id()
+
+    Returns:
+        List of {"likes", "comments", "reposts", "recorded_at"} dicts
+    """
+    try:
+        supabase = get_supabase_client()
+
+        response = supabase.table('linkedin_post_engagement')\
+            .select(', '.join(LINKEDIN_POST_ENGAGEMENT_FIELDS + ['recorded_at']))\
+            .eq('post_id', post_id)\
+            .order('recorded_at')\
+            .execute()
+
+        return response.data or []
+
+    except Exception as e:
+        print(f"Error retrieving LinkedIn post engagement history from Supabase: {e}")
+        return []
+
+
+DB_PAGE_SIZE = 500
+
+
+def iter_table_keyset(
+    table: str,
+    columns: str = '*',
+    page_size: int = DB_PAGE_SIZE,
+    newest_first: bool = True,
+    order_column: str = 'created_at',
+    after: tuple = None,
+    filters: Dict = None
+):
+    """
+    Yield raw rows from a table, paging with an (order_column, id) keyset cursor.
+
+    Each page is a separate request filtered on the last row seen, so memory
+    stays constant and later pages are as cheap as the first (no OFFSET scans).
+    Rows whose order_column is NULL are skipped, since they can't form a cursor.
+
+    Args:
+        table: Supabase table name (must have order_column and id columns)
+        columns: Columns to select
+        page_size: Rows fetched per request
+        newest_first: Order descending (default) or ascending
+        order_column: Timestamp column to page by (default: created_at)
+        after: Optional (order_value, id) cursor to resume after
+        filters: Optional {column: value} equality filters
+
+    Yields:
+        Row dicts as returned by PostgREST
+
+    Raises:
+        Exception: Supabase errors are raised, so a failed page is never
+        mistaken for the end of the table
+    """
+    supabase = get_supabase_client()
+    op = 'lt' if newest_first else 'gt'
+    cursor = after
+
+    while True:
+        query = supabase.table(table).select(columns).not_.is_(order_column, 'null')
+
+        for column, value in (filters or {}).items():
+            query = query.eq(column, value)
+
+        if cursor:
+            value, row_id = cursor
+            query = query.or_(
+                f'{order_column}.{op}."{value}",and({order_column}.eq."{value}",id.{op}.{row_id})'
+            )
+
+        response = query\
+            .order(order_column, desc=newest_first)\
+            .order('id', desc=newest_first)\
+            .limit(page_size)\
+            .execute()
+
+        rows = response.data or []
+        for row in rows:
+            yield row
+
+        if len(rows) < page_size:
+            return
+
+        cursor = (rows[-1].get(order_column), rows[-1].get('id'))
+
+
+def _keyword_from_row(item: Dict) -> Dict:
+    """Convert a keywords table row to the keyword dict shape used by the app."""
+    return {
+        'keyword': item.get('keyword'),
+        'search_volume': item.get('search_volume'),
+        'cpc': item.get('cpc'),
+        'competition_level': item.get('competition_level'),
+        'opportunity_score': item.get('opportunity_score'),
+        'growth_rate': item.get('growth_rate'),
+        'is_seasonal': item.get('is_seasonal'),
+        'peak_months': item.get('peak_months'),
+        'recommendation': item.get('recommendation'),
+        'monthly_searches': _decode_json_field(item.get('monthly_searches'), []),
+        'created_at': item.get('created_at')
+    }
+
+
+def _linkedin_post_from_row(item: Dict) -> Dict:
+    """Convert a linkedin_posts table row to the post dict shape used by the app."""
+    return {
+        'url': item.get('url'),
+        'post_data': _decode_json_field(item.get('post_data'), {}),
+        'created_at': item.get('created_at')
+    }
+
+
+def iter_keywords_from_db(page_size: int = DB_PAGE_SIZE, newest_first: bool = True):
+    """
+    Stream every saved keyword using keyset pagination.
+
+    Args:
+        page_size: Rows fetched per request
+        newest_first: Newest keywords first (default) or oldest first
+
+    Yields:
+        Keyword dictionaries (same shape as get_all_keywords_from_db)
+
+    Raises:
+        Exception: Supabase errors, so a partial export is never mistaken for a complete one
+    """
+    for item in iter_table_keyset('keywords', page_size=page_size, newest_first=newest_first):
+        yield _keyword_from_row(item)
+
+
+def iter_linkedin_posts_from_db(page_size: int = 100, newest_first: bool = True):
+    """
+    Stream every saved LinkedIn posts record using keyset pagination.
+
+    Args:
+        page_size: Rows fetched per request (post_data rows are large, keep this modest)
+        newest_first: Newest records first (default) or oldest first
+
+    Yields:
+        Post dictionaries (same shape as get_all_linkedin_posts_from_db)
+
+    Raises:
+        Exception: Supabase errors, so a partial export is never mistaken for a complete one
+    """
+    for item in iter_table_keyset('linkedin_posts', page_size=page_size, newest_first=newest_first):
+        yield _linkedin_post_from_row(item)
+
+
+def get_all_keywords_from_db(limit: int = 1000) -> List[Dict]:
+    """
+    Retrieve keywords from Supabase.
+
+    Only returns the newest `limit` rows; use iter_keywords_from_db() to
+    stream the full history.
+
+    Args:
+        limit: Maximum number of records to return
+
+    Returns:
+        List of keyword dictionaries
+    """
+    try:
+        supabase = get_supabase_client()
+
+        response = supabase.table('keywords').select('*').order('created_at', desc=True).limit(limit).execute()
+
+        return [_keyword_from_row(item) for item in response.data]
+
+    except Exception as e:
+        print(f"Error retrieving keywords from Supabase: {e}")
+        return []
+
+
+def get_all_linkedin_posts_from_db(limit: int = 100) -> List[Dict]:
+    """
+    Retrieve LinkedIn posts from Supabase.
+
+    Only returns the newest `limit` rows; use iter_linkedin_posts_from_db()
+    to stream the full history.
+
+    Args:
+        limit: Maximum number of records to return
+
+    Returns:
+        List of post dictionaries
+    """
+    try:
+        supabase = get_supabase_client()
+
+        response = supabase.table('linkedin_posts').select('*').order('created_at', desc=True).limit(limit).execute()
+
+        return [_linkedin_post_from_row(item) for item in response.data]
+
+    except Exception as e:
+        print(f"Error retrieving LinkedIn posts from Supabase: {e}")
+        return []
+
+
+def save_company_analysis(analysis_dict: Dict) -> bool:
+    """
+    Save company-level LinkedIn analysis to Supabase.
+
+    Every save sets updated_at, which orders company lists and drives the
+    analytics mirror's incremental sync.
+
+    Args:
+        analysis_dict: Complete analysis dict from analyze_company_complete()
+                      For Company Research tool: linkedin_company_url, website_url, grok_research, claude_research
+                      For Company Intelligence tool: company_url, company_name, voice_profile, etc.
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        supabase = get_supabase_client()
+
+        from datetime import datetime
+
+        data = {'updated_at': datetime.utcnow().isoformat()}
+
+        # Add fields based on what's provided in analysis_dict
+        if 'company_url' in analysis_dict:
             data['company_url'] = analysis_dict.get('company_url')
         if 'company_name' in analysis_dict:
             data['company_name'] = analysis_dict.get('company_name')
         if 'voice_profile' in analysis_dict:
-            data['voice_profile'] = json.dumps(analysis_dict.get('voice_profile', {}))
+            data['voice_profile'] = _encode_json(analysis_dict.get('voice_profile', {}))
         if 'content_pillars' in analysis_dict:
-            data['content_pillars'] = json.dumps(analysis_dict.get('content_pillars', {}))
+            data['content_pillars'] = _encode_json(analysis_dict.get('content_pillars', {}))
         if 'engagement_metrics' in analysis_dict:
-            data['engagement_metrics'] = json.dumps(analysis_dict.get('engagement_metrics', {}))
+            data['engagement_metrics'] = _encode_json(analysis_dict.get('engagement_metrics', {}))
         if 'top_posts' in analysis_dict:
-            data['top_posts'] = json.dumps(analysis_dict.get('top_posts', []))
+            data['top_posts'] = _encode_json(analysis_dict.get('top_posts', []))
         if 'posts_analyzed' in analysis_dict:
             data['posts_analyzed'] = analysis_dict.get('posts_analyzed')
         if 'date_range' in analysis_dict:
@@ -842,11 +1928,11 @@ def save_company_analysis(analysis_dict: Dict) -> bool:
 
         # Add new fields if present
         if 'ranked_keywords' in analysis_dict:
-            data['ranked_keywords'] = json.dumps(analysis_dict.get('ranked_keywords'))
+            data['ranked_keywords'] = _encode_json(analysis_dict.get('ranked_keywords'))
         if 'ranked_keywords_domain' in analysis_dict:
             data['ranked_keywords_domain'] = analysis_dict.get('ranked_keywords_domain')
         if 'ai_perception' in analysis_dict:
-            data['ai_perception'] = json.dumps(analysis_dict.get('ai_perception'))
+            data['ai_perception'] = _encode_json(analysis_dict.get('ai_perception'))
 
         # Add comprehensive research fields (Company Research tool)
         if 'linkedin_company_url' in analysis_dict:
@@ -854,66 +1940,40 @@ def save_company_analysis(analysis_dict: Dict) -> bool:
         if 'website_url' in analysis_dict:
             data['website_url'] = analysis_dict.get('website_url')
         if 'grok_research' in analysis_dict:
-            data['grok_research'] = json.dumps(analysis_dict.get('grok_research'))
+            data['grok_research'] = _encode_json(analysis_dict.get('grok_research'))
         if 'claude_research' in analysis_dict:
-            data['claude_research'] = json.dumps(analysis_dict.get('claude_research'))
+            data['claude_research'] = _encode_json(analysis_dict.get('claude_research'))
         if 'competitor_of' in analysis_dict:
             data['competitor_of'] = analysis_dict.get('competitor_of')
         if 'research_type' in analysis_dict:
             data['research_type'] = analysis_dict.get('research_type')
 
+        # Research stage checkpoints are saved with the stage output in the same upsert
+        if research_checkpoints_enabled():
+            for column in RESEARCH_CHECKPOINT_COLUMNS + ['synthesis_report']:
+                if column in analysis_dict:
+                    data[column] = _encode_json(analysis_dict.get(column))
+
         # Determine unique key - use linkedin_company_url if provided, otherwise company_url
         if 'linkedin_company_url' in analysis_dict and analysis_dict.get('linkedin_company_url'):
-            # Company Research tool - check if record exists, then update or insert
+            # Company Research tool - single atomic upsert (requires unique constraint on linkedin_company_url)
             linkedin_url = analysis_dict.get('linkedin_company_url')
-            print(f"[DB SAVE] linkedin_company_url = '{linkedin_url}'")
-            print(f"[DB SAVE] Fields to save: {list(data.keys())}")
-            print(f"[DB SAVE] Querying for existing record...")
+            diagnostics = db_diagnostics_enabled()
 
-            existing = supabase.table('linkedin_company_analysis')\
-                .select('id, linkedin_company_url')\
-                .eq('linkedin_company_url', linkedin_url)\
-                .execute()
+            if diagnostics:
+                print(f"[DB SAVE] linkedin_company_url = '{linkedin_url}'")
+                print(f"[DB SAVE] Fields to save: {list(data.keys())}")
 
-            print(f"[DB SAVE] Query returned {len(existing.data) if existing.data else 0} records")
-            if existing.data:
-                print(f"[DB SAVE] Existing record data: {existing.data}")
-
-            if existing.data and len(existing.data) > 0:
-                # Update existing record
-                record_id = existing.data[0]['id']
-                print(f"[DB SAVE] Updating existing record ID {record_id}")
-                response = supabase.table('linkedin_company_analysis')\
-                    .update(data)\
-                    .eq('id', record_id)\
-                    .execute()
-                print(f"[DB SAVE] Update response: {len(response.data) if response.data else 0} records affected")
+            supabase.table('linkedin_company_analysis')\
+                .upsert(data, on_conflict='linkedin_company_url', returning=ReturnMethod.minimal)\
+                .execute()
 
-                # Verify the update
+            if diagnostics:
                 verify = supabase.table('linkedin_company_analysis')\
                     .select('id, linkedin_company_url')\
-                    .eq('id', record_id)\
+                    .eq('linkedin_company_url', linkedin_url)\
                     .execute()
-                print(f"[DB SAVE] Verification: Record still exists with linkedin_company_url = '{verify.data[0].get('linkedin_company_url') if verify.data else 'NOT FOUND'}'")
-            else:
-                # Insert new record
-                print(f"[DB SAVE] Inserting new record")
-                response = supabase.table('linkedin_company_analysis').insert(data).execute()
-                print(f"[DB SAVE] Insert response: {response.data if response.data else 'NO DATA'}")
-
-                if response.data and len(response.data) > 0:
-                    new_id = response.data[0].get('id')
-                    print(f"[DB SAVE] New record created with ID {new_id}")
-
-                    # Immediately verify we can query it back
-                    verify = supabase.table('linkedin_company_analysis')\
-                        .select('id, linkedin_company_url')\
-                        .eq('linkedin_company_url', linkedin_url)\
-                        .execute()
-                    print(f"[DB SAVE] Verification: Can query back {len(verify.data) if verify.data else 0} records with this linkedin_company_url")
-                else:
-                    print(f"[DB SAVE] WARNING: Insert returned no data - operation may have failed silently")
-                    return False
+                print(f"[DB SAVE] Verification: Can query back {len(verify.data) if verify.data else 0} records with this linkedin_company_url")
 
         elif 'company_url' in analysis_dict and analysis_dict.get('company_url'):
             # Company Intelligence tool - upsert by company_url (assumes unique constraint exists)
@@ -952,11 +2012,14 @@ def update_company_ranked_keywords(
 
         from datetime import datetime
 
+        now = datetime.utcnow().isoformat()
+
         data = {
             'company_url': company_url,
-            'ranked_keywords': json.dumps(ranked_keywords_data),
+            'ranked_keywords': _encode_json(ranked_keywords_data),
             'ranked_keywords_domain': domain,
-            'ranked_keywords_fetched_at': datetime.utcnow().isoformat()
+            'ranked_keywords_fetched_at': now,
+            'updated_at': now
         }
 
         # Use upsert (will update if exists, insert if not)
@@ -985,9 +2048,12 @@ def update_company_ai_perception(
     try:
         supabase = get_supabase_client()
 
+        from datetime import datetime
+
         data = {
             'company_url': company_url,
-            'ai_perception': json.dumps(ai_perception_data)
+            'ai_perception': _encode_json(ai_perception_data),
+            'updated_at': datetime.utcnow().isoformat()
         }
 
         # Use upsert (will update if exists, insert if not)
@@ -1012,19 +2078,22 @@ def get_company_analysis(company_url: str = None, linkedin_company_url: str = No
     """
     try:
         supabase = get_supabase_client()
+        diagnostics = db_diagnostics_enabled()
 
         # Query by linkedin_company_url if provided, otherwise by company_url
         if linkedin_company_url:
-            print(f"[DB GET] Querying by linkedin_company_url = '{linkedin_company_url}'")
+            if diagnostics:
+                print(f"[DB GET] Querying by linkedin_company_url = '{linkedin_company_url}'")
             response = supabase.table('linkedin_company_analysis')\
                 .select('*')\
                 .eq('linkedin_company_url', linkedin_company_url)\
                 .execute()
-            print(f"[DB GET] Query returned {len(response.data) if response.data else 0} records")
-            if response.data and len(response.data) > 0:
+            if diagnostics:
+                print(f"[DB GET] Query returned {len(response.data) if response.data else 0} records")
+            if diagnostics and response.data and len(response.data) > 0:
                 print(f"[DB GET] Found record with ID {response.data[0].get('id')}")
                 print(f"[DB GET] Record linkedin_company_url = '{response.data[0].get('linkedin_company_url')}'")
-            else:
+            elif diagnostics:
                 print(f"[DB GET] No matching records found")
                 # Debug: Try to see ALL records in the table
                 all_records = supabase.table('linkedin_company_analysis')\
@@ -1036,18 +2105,20 @@ def get_company_analysis(company_url: str = None, linkedin_company_url: str = No
                     for rec in all_records.data:
                         print(f"[DB GET] DEBUG:   - ID {rec.get('id')}: linkedin_company_url = '{rec.get('linkedin_company_url')}', company_name = '{rec.get('company_name')}'")
         elif company_url:
-            print(f"[DB GET] Querying by company_url = '{company_url}'")
+            if diagnostics:
+                print(f"[DB GET] Querying by company_url = '{company_url}'")
             response = supabase.table('linkedin_company_analysis')\
                 .select('*')\
                 .eq('company_url', company_url)\
                 .execute()
-            print(f"[DB GET] Query returned {len(response.data) if response.data else 0} records")
+            if diagnostics:
+                print(f"[DB GET] Query returned {len(response.data) if response.data else 0} records")
         else:
-            print(f"[DB GET] No URL provided, returning empty")
             return {}
 
         if not response.data or len(response.data) == 0:
-            print(f"[DB GET] No data found, returning empty dict")
+            if diagnostics:
+                print(f"[DB GET] No data found, returning empty dict")
             return {}
 
         item = response.data[0]
@@ -1058,12 +2129,12 @@ def get_company_analysis(company_url: str = None, linkedin_company_url: str = No
             'linkedin_company_url': item.get('linkedin_company_url'),
             'website_url': item.get('website_url'),
             'company_name': item.get('company_name'),
-            'voice_profile': json.loads(item.get('voice_profile', '{}')) if item.get('voice_profile') else {},
-            'content_pillars': json.loads(item.get('content_pillars', '{}')) if item.get('content_pillars') else {},
-            'engagement_metrics': json.loads(item.get('engagement_metrics', '{}')) if item.get('engagement_metrics') else {},
-            'posting_strategy': json.loads(item.get('posting_strategy', '{}')) if item.get('posting_strategy') else {},
-            'top_posts': json.loads(item.get('top_posts', '[]')) if item.get('top_posts') else [],
-            'strategic_recommendations': json.loads(item.get('strategic_recommendations', '{}')) if item.get('strategic_recommendations') else {},
+            'voice_profile': _decode_json_field(item.get('voice_profile'), {}),
+            'content_pillars': _decode_json_field(item.get('content_pillars'), {}),
+            'engagement_metrics': _decode_json_field(item.get('engagement_metrics'), {}),
+            'posting_strategy': _decode_json_field(item.get('posting_strategy'), {}),
+            'top_posts': _decode_json_field(item.get('top_posts'), []),
+            'strategic_recommendations': _decode_json_field(item.get('strategic_recommendations'), {}),
             'posts_analyzed': item.get('posts_analyzed'),
             'date_range': item.get('date_range'),
             'analysis_model': item.get('analysis_model'),
@@ -1073,23 +2144,26 @@ def get_company_analysis(company_url: str = None, linkedin_company_url: str = No
 
         # Add new fields if present
         if item.get('ranked_keywords'):
-            result['ranked_keywords'] = json.loads(item.get('ranked_keywords'))
+            result['ranked_keywords'] = _decode_json_field(item.get('ranked_keywords'), None)
         if item.get('ranked_keywords_domain'):
             result['ranked_keywords_domain'] = item.get('ranked_keywords_domain')
         if item.get('ranked_keywords_fetched_at'):
             result['ranked_keywords_fetched_at'] = item.get('ranked_keywords_fetched_at')
         if item.get('ai_perception'):
-            result['ai_perception'] = json.loads(item.get('ai_perception'))
+            result['ai_perception'] = _decode_json_field(item.get('ai_perception'), None)
 
         # Add comprehensive research fields
         if item.get('grok_research'):
-            result['grok_research'] = json.loads(item.get('grok_research'))
+            result['grok_research'] = _decode_json_field(item.get('grok_research'), None)
         if item.get('claude_research'):
-            result['claude_research'] = json.loads(item.get('claude_research'))
+            result['claude_research'] = _decode_json_field(item.get('claude_research'), None)
         if item.get('competitor_of'):
             result['competitor_of'] = item.get('competitor_of')
         if item.get('research_type'):
             result['research_type'] = item.get('research_type')
+        for column in RESEARCH_CHECKPOINT_COLUMNS + ['synthesis_report']:
+            if item.get(column):
+                result[column] = _decode_json_field(item.get(column), None)
 
         return result
 
@@ -1098,6 +2172,60 @@ def get_company_analysis(company_url: str = None, linkedin_company_url: str = No
         return {}
 
 
+RESEARCH_STAGES = ['grok', 'claude', 'linkedin', 'synthesis']
+RESEARCH_CHECKPOINT_COLUMNS = [f'{stage}_checkpoint' for stage in RESEARCH_STAGES]
+
+
+def research_checkpoints_enabled() -> bool:
+    """
+    Return True if research stage checkpoints are stored (RESEARCH_CHECKPOINTS=true).
+
+    Enable after running migrations/research_checkpoints.sql, which adds the
+    <stage>_checkpoint and synthesis_report columns to linkedin_company_analysis.
+    """
+    return str(get_credential("RESEARCH_CHECKPOINTS", "false")).strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_research_checkpoints(linkedin_company_urls: List[str]) -> Dict[str, Dict]:
+    """
+    Fetch stored research stage checkpoints for several companies in one query.
+
+    Only the small checkpoint columns are selected, not the stage outputs.
+
+    Args:
+        linkedin_company_urls: LinkedIn company URLs (main company and competitors)
+
+    Returns:
+        {linkedin_company_url: {"competitor_of": str, stage: checkpoint dict or None}},
+        empty if checkpoints are disabled or on error
+    """
+    if not research_checkpoints_enabled() or not linkedin_company_urls:
+        return {}
+
+    try:
+        supabase = get_supabase_client()
+
+        response = supabase.table('linkedin_company_analysis')\
+            .select(', '.join(['linkedin_company_url', 'competitor_of'] + RESEARCH_CHECKPOINT_COLUMNS))\
+            .in_('linkedin_company_url', list(linkedin_company_urls))\
+            .execute()
+
+        return {
+            item.get('linkedin_company_url'): {
+                'competitor_of': item.get('competitor_of'),
+                **{
+                    stage: _decode_json_field(item.get(f'{stage}_checkpoint'), None)
+                    for stage in RESEARCH_STAGES
+                }
+            }
+            for item in response.data or []
+        }
+
+    except Exception as e:
+        print(f"Error retrieving research checkpoints from Supabase: {e}")
+        return {}
+
+
 def get_company_competitors(main_company_url: str) -> List[Dict]:
     """
     Retrieve all competitor analyses for a given company from Supabase.
@@ -1128,10 +2256,10 @@ def get_company_competitors(main_company_url: str) -> List[Dict]:
                 'linkedin_company_url': item.get('linkedin_company_url'),
                 'website_url': item.get('website_url'),
                 'company_name': item.get('company_name'),
-                'voice_profile': json.loads(item.get('voice_profile', '{}')) if item.get('voice_profile') else {},
-                'content_pillars': json.loads(item.get('content_pillars', '{}')) if item.get('content_pillars') else {},
-                'engagement_metrics': json.loads(item.get('engagement_metrics', '{}')) if item.get('engagement_metrics') else {},
-                'top_posts': json.loads(item.get('top_posts', '[]')) if item.get('top_posts') else [],
+                'voice_profile': _decode_json_field(item.get('voice_profile'), {}),
+                'content_pillars': _decode_json_field(item.get('content_pillars'), {}),
+                'engagement_metrics': _decode_json_field(item.get('engagement_metrics'), {}),
+                'top_posts': _decode_json_field(item.get('top_posts'), []),
                 'posts_analyzed': item.get('posts_analyzed'),
                 'date_range': item.get('date_range'),
                 'analysis_model': item.get('analysis_model'),
@@ -1149,60 +2277,274 @@ def get_company_competitors(main_company_url: str) -> List[Dict]:
         return []
 
 
+# Columns needed by list views (dropdowns, client cards) - no heavy JSON
+COMPANY_SUMMARY_COLUMNS = [
+    'id', 'company_url', 'linkedin_company_url', 'company_name',
+    'posts_analyzed', 'date_range', 'updated_at'
+]
+
+# Columns returned by get_all_company_analyses (excludes grok/claude research text
+# and the large ranked_keywords / ai_perception payloads; use get_company_analysis
+# for those)
+COMPANY_ANALYSIS_COLUMNS = COMPANY_SUMMARY_COLUMNS + [
+    'voice_profile', 'content_pillars', 'engagement_metrics', 'posting_strategy',
+    'top_posts', 'strategic_recommendations', 'analysis_model', 'created_at',
+    'ranked_keywords_domain', 'ranked_keywords_fetched_at'
+]
+
+# Heavy JSON columns decoded on first access, with the value used when empty
+LAZY_JSON_DEFAULTS = {
+    'voice_profile': {},
+    'content_pillars': {},
+    'engagement_metrics': {},
+    'posting_strategy': {},
+    'top_posts': [],
+    'strategic_recommendations': {}
+}
+
+
+class LazyCompanyRecord(dict):
+    """
+    Company analysis dict whose heavy JSON columns are decoded on first access.
+
+    Behaves like the plain dicts returned elsewhere: .get(), [], `in`,
+    iteration and json.dumps() all see decoded values.
+    """
+
+    def __init__(self, fields: Dict, raw_json: Dict):
+        super().__init__(fields)
+        self._raw = dict(raw_json)
+
+    def _decode(self, key):
+        if key in self._raw:
+            raw = self._raw.pop(key)
+            decoded = _decode_json_field(raw, LAZY_JSON_DEFAULTS.get(key))
+            # Fields with a None default stay absent when empty
+            if decoded is not None:
+                dict.__setitem__(self, key, decoded)
+
+    def _decode_all(self):
+        for key in list(self._raw):
+            self._decode(key)
+
+    def __getitem__(self, key):
+        self._decode(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        self._decode(key)
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        self._decode(key)
+        return dict.__contains__(self, key)
+
+    def keys(self):
+        self._decode_all()
+        return dict.keys(self)
+
+    def items(self):
+        self._decode_all()
+        return dict.items(self)
+
+    def values(self):
+        self._decode_all()
+        return dict.values(self)
+
+    def __iter__(self):
+        self._decode_all()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._decode_all()
+        return dict.__len__(self)
+
+    def __repr__(self):
+        self._decode_all()
+        return dict.__repr__(self)
+
+    def copy(self):
+        self._decode_all()
+        return dict(self)
+
+
+def _to_lazy_company_record(item: Dict) -> LazyCompanyRecord:
+    """Split a projected row into plain fields and lazily decoded JSON fields."""
+    fields = {key: value for key, value in item.items() if key not in LAZY_JSON_DEFAULTS}
+    raw_json = {key: item.get(key) for key in LAZY_JSON_DEFAULTS if key in item}
+
+    # Optional columns are omitted when empty, matching the previous behaviour
+    for key in ('ranked_keywords_domain', 'ranked_keywords_fetched_at'):
+        if not fields.get(key):
+            fields.pop(key, None)
+
+    return LazyCompanyRecord(fields, raw_json)
+
+
+def get_company_summaries(limit: int = 50) -> List[Dict]:
+    """
+    Retrieve lightweight company rows for dropdowns and lists.
+
+    Only selects COMPANY_SUMMARY_COLUMNS (names, URLs, post counts), so no
+    analysis JSON is transferred.
+
+    Args:
+        limit: Maximum number of companies to return
+
+    Returns:
+        List of summary dicts, most recently updated first
+    """
+    try:
+        supabase = get_supabase_client()
+
+        response = supabase.table('linkedin_company_analysis')\
+            .select(', '.join(COMPANY_SUMMARY_COLUMNS))\
+            .order('updated_at', desc=True)\
+            .limit(limit)\
+            .execute()
+
+        return response.data or []
+
+    except Exception as e:
+        print(f"Error retrieving company summaries from Supabase: {e}")
+        return []
+
+
+def get_company_analyses_by_id(company_ids: List) -> List[Dict]:
+    """
+    Retrieve full analyses for specific companies (e.g. after picking from a summary list).
+
+    Args:
+        company_ids: Row ids from get_company_summaries()
+
+    Returns:
+        List of LazyCompanyRecord dicts, in the order of company_ids
+    """
+    if not company_ids:
+        return []
+
+    try:
+        supabase = get_supabase_client()
+
+        response = supabase.table('linkedin_company_analysis')\
+            .select(', '.join(COMPANY_ANALYSIS_COLUMNS))\
+            .in_('id', list(company_ids))\
+            .execute()
+
+        by_id = {item.get('id'): _to_lazy_company_record(item) for item in response.data or []}
+        return [by_id[company_id] for company_id in company_ids if company_id in by_id]
+
+    except Exception as e:
+        print(f"Error retrieving company analyses from Supabase: {e}")
+        return []
+
+
 def get_all_company_analyses(limit: int = 50) -> List[Dict]:
     """
     Retrieve all company analyses from Supabase for comparison.
 
+    Only the analysis columns are selected, and JSON columns are decoded
+    lazily on first access. Use get_company_summaries() when only names and
+    post counts are needed.
+
     Args:
         limit: Maximum number of companies to return
 
     Returns:
-        List of company analysis dictionaries
+        List of company analysis dictionaries (LazyCompanyRecord)
     """
     try:
         supabase = get_supabase_client()
 
         response = supabase.table('linkedin_company_analysis')\
-            .select('*')\
+            .select(', '.join(COMPANY_ANALYSIS_COLUMNS))\
             .order('updated_at', desc=True)\
             .limit(limit)\
             .execute()
 
-        companies = []
-        for item in response.data:
-            company = {
-                'id': item.get('id'),
-                'company_url': item.get('company_url'),
-                'company_name': item.get('company_name'),
-                'voice_profile': json.loads(item.get('voice_profile', '{}')),
-                'content_pillars': json.loads(item.get('content_pillars', '{}')),
-                'engagement_metrics': json.loads(item.get('engagement_metrics', '{}')),
-                'posting_strategy': json.loads(item.get('posting_strategy', '{}')),
-                'top_posts': json.loads(item.get('top_posts', '[]')),
-                'strategic_recommendations': json.loads(item.get('strategic_recommendations', '{}')),
-                'posts_analyzed': item.get('posts_analyzed'),
-                'date_range': item.get('date_range'),
-                'analysis_model': item.get('analysis_model'),
-                'created_at': item.get('created_at'),
-                'updated_at': item.get('updated_at')
-            }
+        return [_to_lazy_company_record(item) for item in response.data or []]
 
-            # Add new fields if present
-            if item.get('ranked_keywords'):
-                company['ranked_keywords'] = json.loads(item.get('ranked_keywords'))
-            if item.get('ranked_keywords_domain'):
-                company['ranked_keywords_domain'] = item.get('ranked_keywords_domain')
-            if item.get('ranked_keywords_fetched_at'):
-                company['ranked_keywords_fetched_at'] = item.get('ranked_keywords_fetched_at')
-            if item.get('ai_perception'):
-                company['ai_perception'] = json.loads(item.get('ai_perception'))
+    except Exception as e:
+        print(f"Error retrieving company analyses from Supabase: {e}")
+        return []
 
-            companies.append(company)
 
-        return companies
+def _json_path_alias(path: str) -> str:
+    """
+    PostgREST alias for a JSON path, built from the whole path so paths
+    ending in the same key don't collide (voice_profile->overall_tone ->
+    voice_profile__overall_tone).
+    """
+    return '__'.join(re.sub(r'\W', '_', part.strip()) for part in re.split(r'->>?', path))
+
+
+def _extract_json_path(item: Dict, path: str):
+    """Walk a 'column->key->key' path through a decoded row (text storage fallback)."""
+    parts = [part.strip() for part in re.split(r'->>?', path)]
+    value = _decode_json_field(item.get(parts[0]), None)
+    for part in parts[1:]:
+        if isinstance(value, dict):
+            value = value.get(part)
+        elif isinstance(value, list) and part.lstrip('-').isdigit():
+            index = int(part)
+            value = value[index] if -len(value) <= index < len(value) else None
+        else:
+            return None
+    return value
+
+
+def select_company_fields(
+    json_paths: List[str],
+    company_ids: List = None,
+    limit: int = 50
+) -> List[Dict]:
+    """
+    Select only specific sub-fields of the company analysis JSON columns.
+
+    Paths use PostgREST syntax, e.g. "voice_profile->overall_tone" or
+    "engagement_metrics->avg_engagement->total". With JSONB storage the
+    server returns just those values; with text storage the whole columns are
+    fetched and the paths are resolved locally, so results look the same.
+
+    Args:
+        json_paths: JSON paths to select
+        company_ids: Optional row ids to restrict to
+        limit: Maximum number of companies to return
+
+    Returns:
+        List of dicts with id, company_name and one key per path (the path
+        itself, e.g. row["voice_profile->overall_tone"])
+    """
+    try:
+        supabase = get_supabase_client()
+        server_side = json_storage_mode() == "jsonb"
+
+        if server_side:
+            columns = ['id', 'company_name'] + [f"{_json_path_alias(path)}:{path}" for path in json_paths]
+        else:
+            base_columns = {re.split(r'->>?', path)[0].strip() for path in json_paths}
+            columns = ['id', 'company_name'] + sorted(base_columns)
+
+        query = supabase.table('linkedin_company_analysis').select(', '.join(columns))
+        if company_ids:
+            query = query.in_('id', list(company_ids))
+
+        response = query.order('updated_at', desc=True).limit(limit).execute()
+
+        results = []
+        for item in response.data or []:
+            row = {'id': item.get('id'), 'company_name': item.get('company_name')}
+            for path in json_paths:
+                if server_side:
+                    row[path] = item.get(_json_path_alias(path))
+                else:
+                    row[path] = _extract_json_path(item, path)
+            results.append(row)
+
+        return results
 
     except Exception as e:
-        print(f"Error retrieving company analyses from Supabase: {e}")
+        print(f"Error selecting company fields from Supabase: {e}")
         return []
 
 
@@ -1261,9 +2603,9 @@ def save_generated_posts(
             'company_name': company_name,
             'input_type': input_type,
             'user_input': user_input,
-            'variation_1': json.dumps(variations[0]) if len(variations) > 0 else None,
-            'variation_2': json.dumps(variations[1]) if len(variations) > 1 else None,
-            'variation_3': json.dumps(variations[2]) if len(variations) > 2 else None,
+            'variation_1': _encode_json(variations[0]) if len(variations) > 0 else None,
+            'variation_2': _encode_json(variations[1]) if len(variations) > 1 else None,
+            'variation_3': _encode_json(variations[2]) if len(variations) > 2 else None,
             'generation_model': model
         }
 
@@ -1304,9 +2646,9 @@ def get_generated_posts(company_url: str = None, limit: int = 50) -> List[Dict]:
                 'company_name': item.get('company_name'),
                 'input_type': item.get('input_type'),
                 'user_input': item.get('user_input'),
-                'variation_1': json.loads(item.get('variation_1', '{}')),
-                'variation_2': json.loads(item.get('variation_2', '{}')),
-                'variation_3': json.loads(item.get('variation_3', '{}')),
+                'variation_1': _decode_json_field(item.get('variation_1'), {}),
+                'variation_2': _decode_json_field(item.get('variation_2'), {}),
+                'variation_3': _decode_json_field(item.get('variation_3'), {}),
                 'generation_model': item.get('generation_model'),
                 'created_at': item.get('created_at')
             }
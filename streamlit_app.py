@@ -384,6 +384,15 @@ def render_app(app_name):
         elif app_name == "company_research":
             st.info("🔬 Company Research")
 
+        # Background database writes (see write_queue.py)
+        from write_queue import get_write_status
+        write_status = get_write_status()
+        if write_status["pending"]:
+            st.caption(f"💾 Saving {write_status['pending']} item(s) to database...")
+        if write_status["failed"]:
+            failed = [job for job in write_status["jobs"] if job["state"] == "failed"]
+            st.warning(f"⚠️ {len(failed)} database write(s) failed: " + ", ".join(job["description"] for job in failed[:3]))
+
     # Import and render the appropriate app
     if app_name == "linkedin":
         from app_linkedin import render_linkedin_app
@@ -0,0 +1,288 @@
+"""
+Write-Behind Persistence Queue
+
+Supabase saves are handed to a single background writer thread so Streamlit
+reruns don't wait on database round trips. Writes to the same row that are
+still waiting in the queue are coalesced into one, failed writes are retried
+with exponential backoff, and the queue is flushed when the process exits.
+
+Use the queue_* helpers from app code, get_write_status() to show delivery
+status, and flush() before reading back data that was just queued.
+"""
+
+import time
+import queue
+import atexit
+import threading
+import itertools
+from collections import OrderedDict
+from typing import Callable, Dict
+
+from seo_functions import (
+    save_keywords_to_db,
+    save_linkedin_posts_to_db,
+    save_company_analysis,
+    save_generated_posts,
+    linkedin_post_id
+)
+
+
+WRITE_QUEUE_MAXSIZE = 200
+WRITE_MAX_ATTEMPTS = 5
+WRITE_BACKOFF_BASE = 1.0  # seconds, doubled after each failed attempt
+WRITE_BACKOFF_MAX = 30.0
+WRITE_STATUS_HISTORY = 100  # finished jobs kept for get_write_status()
+SHUTDOWN_FLUSH_TIMEOUT = 30.0
+
+_queue = queue.Queue(maxsize=WRITE_QUEUE_MAXSIZE)
+_lock = threading.Lock()
+_jobs = OrderedDict()      # job_id -> job dict (queued, running and recent finished jobs)
+_pending_keys = {}         # coalesce key -> job_id still waiting in the queue
+_ids = itertools.count(1)
+_worker = None
+
+
+def _ensure_worker() -> None:
+    """Start the writer thread on first use."""
+    global _worker
+
+    with _lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_worker_loop, name="supabase-write-behind", daemon=True)
+            _worker.start()
+
+
+def _set_state(job: Dict, state: str, error: str = None) -> None:
+    with _lock:
+        job["state"] = state
+        job["error"] = error
+        job["updated_at"] = time.time()
+
+
+def _run_job(job: Dict) -> None:
+    """Call the write function, retrying with exponential backoff on failure."""
+    for attempt in range(1, WRITE_MAX_ATTEMPTS + 1):
+        _set_state(job, "running")
+        job["attempts"] = attempt
+
+        try:
+            # Save helpers report failure by returning False rather than raising
+            ok = job["func"](*job["args"], **job["kwargs"]) is not False
+            error = None if ok else "Write returned False"
+        except Exception as e:
+            ok = False
+            error = str(e)
+
+        if ok:
+            _set_state(job, "done")
+            return
+
+        if attempt < WRITE_MAX_ATTEMPTS:
+            _set_state(job, "retrying", error)
+            time.sleep(min(WRITE_BACKOFF_BASE * (2 ** (attempt - 1)), WRITE_BACKOFF_MAX))
+        else:
+            print(f"Write-behind: giving up on '{job['description']}' after {attempt} attempts: {error}")
+            _set_state(job, "failed", error)
+
+
+def _prune_finished() -> None:
+    """Keep only the most recent WRITE_STATUS_HISTORY finished jobs (call with _lock held)."""
+    finished = [job_id for job_id, job in _jobs.items() if job["state"] in ("done", "failed")]
+    for job_id in finished[:max(0, len(finished) - WRITE_STATUS_HISTORY)]:
+        del _jobs[job_id]
+
+
+def _worker_loop() -> None:
+    while True:
+        job_id = _queue.get()
+        try:
+            with _lock:
+                job = _jobs.get(job_id)
+                # Once running, later writes to the same row become a new job
+                if job and job["key"] is not None and _pending_keys.get(job["key"]) == job_id:
+                    del _pending_keys[job["key"]]
+
+            if job:
+                _run_job(job)
+
+            with _lock:
+                _prune_finished()
+        finally:
+            _queue.task_done()
+
+
+def submit_write(
+    func: Callable,
+    *args,
+    key=None,
+    merge: Callable = None,
+    description: str = None,
+    **kwargs
+) -> int:
+    """
+    Queue a write to run on the background writer thread.
+
+    Args:
+        func: Save function to call, e.g. save_company_analysis
+        *args: Positional arguments for func
+        key: Optional row identity; a queued write with the same key is coalesced
+        merge: Optional merge(old_args, new_args) -> args used when coalescing;
+               without it the newer write replaces the queued one
+        description: Label shown in get_write_status()
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Job id (the existing job's id if the write was coalesced)
+    """
+    _ensure_worker()
+
+    with _lock:
+        existing_id = _pending_keys.get(key) if key is not None else None
+        existing = _jobs.get(existing_id) if existing_id else None
+
+        if existing and existing["state"] == "queued":
+            existing["args"] = merge(existing["args"], args) if merge else args
+            existing["kwargs"] = dict(existing["kwargs"], **kwargs) if merge else kwargs
+            existing["coalesced"] += 1
+            existing["updated_at"] = time.time()
+            return existing_id
+
+        job_id = next(_ids)
+        job = {
+            "id": job_id,
+            "func": func,
+            "args": args,
+            "kwargs": kwargs,
+            "key": key,
+            "description": description or func.__name__,
+            "state": "queued",
+            "attempts": 0,
+            "coalesced": 0,
+            "error": None,
+            "created_at": time.time(),
+            "updated_at": time.time()
+        }
+        _jobs[job_id] = job
+        if key is not None:
+            _pending_keys[key] = job_id
+
+    try:
+        _queue.put_nowait(job_id)
+    except queue.Full:
+        # Back-pressure: the writer is far behind, so write inline instead of growing without bound
+        with _lock:
+            if key is not None and _pending_keys.get(key) == job_id:
+                del _pending_keys[key]
+        _run_job(job)
+
+    return job_id
+
+
+def flush(timeout: float = SHUTDOWN_FLUSH_TIMEOUT) -> bool:
+    """
+    Wait until every queued write has been attempted.
+
+    Args:
+        timeout: Maximum seconds to wait
+
+    Returns:
+        True if the queue drained, False on timeout
+    """
+    deadline = time.time() + timeout
+
+    with _queue.all_tasks_done:
+        while _queue.unfinished_tasks:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            _queue.all_tasks_done.wait(remaining)
+
+    return True
+
+
+def get_write_status() -> Dict:
+    """
+    Return delivery status for the UI.
+
+    Returns:
+        Dict with "pending", "failed" and "done" counts and "jobs"
+        (most recent first, without the write payloads)
+    """
+    with _lock:
+        jobs = [
+            {k: v for k, v in job.items() if k not in ("func", "args", "kwargs")}
+            for job in reversed(_jobs.values())
+        ]
+
+    return {
+        "pending": sum(1 for job in jobs if job["state"] in ("queued", "running", "retrying")),
+        "failed": sum(1 for job in jobs if job["state"] == "failed"),
+        "done": sum(1 for job in jobs if job["state"] == "done"),
+        "jobs": jobs
+    }
+
+
+def _merge_analysis(old_args: tuple, new_args: tuple) -> tuple:
+    """Combine two partial save_company_analysis dicts; newer fields win."""
+    return (dict(old_args[0], **new_args[0]),)
+
+
+def queue_company_analysis(analysis_dict: Dict) -> int:
+    """Write-behind save_company_analysis; partial saves for the same company are merged."""
+    row = analysis_dict.get('linkedin_company_url') or analysis_dict.get('company_url')
+    return submit_write(
+        save_company_analysis,
+        analysis_dict,
+        key=('linkedin_company_analysis', row) if row else None,
+        merge=_merge_analysis,
+        description=f"Company analysis: {analysis_dict.get('company_name') or row or 'unknown'}"
+    )
+
+
+def _merge_linkedin_posts(old_args: tuple, new_args: tuple) -> tuple:
+    """Combine two queued post deltas for the same URL; newer copies of a post win."""
+    url, old_data = old_args
+    _, new_data = new_args
+    new_posts = new_data.get('data') or []
+    new_ids = {linkedin_post_id(post) for post in new_posts}
+    merged = new_posts + [post for post in old_data.get('data') or [] if linkedin_post_id(post) not in new_ids]
+    return (url, dict(new_data, data=merged))
+
+
+def queue_linkedin_posts(url: str, posts_data: Dict) -> int:
+    """Write-behind save_linkedin_posts_to_db; a newer fetch for the same URL is merged into a queued one."""
+    return submit_write(
+        save_linkedin_posts_to_db,
+        url,
+        posts_data,
+        key=('linkedin_posts', url),
+        merge=_merge_linkedin_posts,
+        description=f"LinkedIn posts: {url}"
+    )
+
+
+def queue_keywords(keywords_data, **kwargs) -> int:
+    """Write-behind save_keywords_to_db."""
+    return submit_write(
+        save_keywords_to_db,
+        keywords_data,
+        description=f"{len(keywords_data)} keywords",
+        **kwargs
+    )
+
+
+def queue_generated_posts(**kwargs) -> int:
+    """Write-behind save_generated_posts (same keyword arguments)."""
+    return submit_write(
+        save_generated_posts,
+        description=f"Generated posts: {kwargs.get('company_name', 'unknown')}",
+        **kwargs
+    )
+
+
+def _flush_at_exit() -> None:
+    if _queue.unfinished_tasks and not flush(SHUTDOWN_FLUSH_TIMEOUT):
+        print(f"Write-behind: {_queue.unfinished_tasks} writes still pending at shutdown")
+
+
+atexit.register(_flush_at_exit)